@@ -2,9 +2,19 @@ from flask import Flask, render_template, request
 import time
 from bs4 import BeautifulSoup
 import os
+import threading
+
+from site_bundle import SiteBundle
 
 app = Flask(__name__)
 
+SITE_DIR = "site_html"
+# Site regroupé en une seule archive (generate_html_pages.py avec une sortie .zip)
+SITE_BUNDLE = "site_html.zip"
+# (mtime, SiteBundle) de l'archive ouverte, partagée par toutes les requêtes
+_bundle = None
+_bundle_verrou = threading.Lock()
+
 @app.route('/')
 def home():
     return render_template('search.html')
@@ -43,13 +53,31 @@ def enregistrer_resultat(requete, resultat, temps):
     except Exception as e:
         print(f"Erreur enregistrement : {e}")
 
+def ouvrir_bundle():
+    """Archive du site ouverte une seule fois (rouverte seulement si le fichier a été régénéré)"""
+    global _bundle
+    mtime = os.stat(SITE_BUNDLE).st_mtime_ns
+    with _bundle_verrou:
+        if _bundle is None or _bundle[0] != mtime:
+            # L'ancienne archive n'est pas fermée ici : une autre requête peut encore la lire
+            _bundle = (mtime, SiteBundle(SITE_BUNDLE))
+        return _bundle[1]
+
+def lire_page(chemin):
+    """Contenu d'une page du site, lue dans l'archive si elle existe, sinon dans le dossier"""
+    if os.path.exists(SITE_BUNDLE):
+        bundle = ouvrir_bundle()
+        # Le générateur écrit toutes les pages à la racine de l'archive
+        nom = chemin if chemin in bundle else os.path.basename(chemin)
+        return bundle.read(nom)
+    with open(os.path.join(SITE_DIR, chemin), "r", encoding="utf-8") as f:
+        return f.read()
+
 def charger_tableau(fichier):
-    chemin = os.path.join("site_html", f"{fichier}.html")
+    chemin = f"{fichier}.html"
     try:
-        with open(chemin, "r", encoding="utf-8") as f:
-            contenu = f.read()
-            soup = BeautifulSoup(contenu, "html.parser")
-            return soup.find("table")
+        soup = BeautifulSoup(lire_page(chemin), "html.parser")
+        return soup.find("table")
     except Exception as e:
         print(f"Erreur lecture fichier {chemin} : {e}")
         return None
@@ -110,11 +138,10 @@ def traiter_R6():
 
 def traiter_R7():
     try:
-        with open("site_html/teams/equipe_Manchester_United.html", "r", encoding="utf-8") as f:
-            soup = BeautifulSoup(f.read(), "html.parser")
-            matchs = soup.find_all("div", class_="match-result")
-            victoires = [m for m in matchs if "Manchester United" in m.text and "victoire domicile" in m.text.lower()]
-            return f"{len(victoires)} victoires à domicile"
+        soup = BeautifulSoup(lire_page("teams/equipe_Manchester_United.html"), "html.parser")
+        matchs = soup.find_all("div", class_="match-result")
+        victoires = [m for m in matchs if "Manchester United" in m.text and "victoire domicile" in m.text.lower()]
+        return f"{len(victoires)} victoires à domicile"
     except:
         return "Fichier de Manchester United introuvable"
 
@@ -143,13 +170,12 @@ def traiter_R9():
 
 def traiter_R10():
     try:
-        with open("site_html/teams/equipe_Manchester_United.html", "r", encoding="utf-8") as f1, open("site_html/teams/equipe_Chelsea.html", "r", encoding="utf-8") as f2:
-            soup1 = BeautifulSoup(f1.read(), "html.parser")
-            soup2 = BeautifulSoup(f2.read(), "html.parser")
-            matchs1 = soup1.find_all("div", class_="match-result")
-            matchs2 = soup2.find_all("div", class_="match-result")
-            confrontations = [m.text.strip() for m in matchs1 + matchs2 if "Chelsea" in m.text or "Manchester United" in m.text]
-            return "<br>".join(confrontations) if confrontations else "Aucune confrontation trouvée"
+        soup1 = BeautifulSoup(lire_page("teams/equipe_Manchester_United.html"), "html.parser")
+        soup2 = BeautifulSoup(lire_page("teams/equipe_Chelsea.html"), "html.parser")
+        matchs1 = soup1.find_all("div", class_="match-result")
+        matchs2 = soup2.find_all("div", class_="match-result")
+        confrontations = [m.text.strip() for m in matchs1 + matchs2 if "Chelsea" in m.text or "Manchester United" in m.text]
+        return "<br>".join(confrontations) if confrontations else "Aucune confrontation trouvée"
     except:
         return "Pages des équipes manquantes"
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Génération en lot du site Web 1.0 pour tous les championnats et toutes les saisons
+Auteur: T. E. G. - Web Sémantique
+Usage: python batch_generate.py [--db database.sqlite] [--output web_1.0_batch] [--workers N]
+
+Chaque couple (championnat, saison) présent dans les tables League et Match est
+généré dans son propre dossier par un processus du pool. Chaque processus ouvre
+sa propre connexion SQLite en lecture seule, réutilisée pour toutes les tâches
+qu'il exécute.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Sequence, Tuple
+
+from db_access import SQLiteDataAccess, shared_data_access
+from elo_ratings import default_cache_path, load_ratings
+from generate_html_pages import SECTIONS, HTMLPageGenerator
+from match_events import extract_events
+from player_appearances import ensure_cache
+from player_similarity import PlayerSimilarity
+from site_bundle import BUNDLE_SUFFIX
+from team_attributes import TeamAttributes
+from team_styles import TeamStyles
+
+
+def list_league_seasons(db_path: str) -> List[Tuple[str, str]]:
+    """Liste tous les couples (championnat, saison) ayant au moins un match"""
+    data_access = SQLiteDataAccess(db_path, read_only=True)
+    try:
+        return [(row['name'], row['season']) for row in data_access.iter_query("""
+        SELECT DISTINCT l.name, m.season
+        FROM Match m
+        JOIN League l ON m.league_id = l.id
+        ORDER BY l.name, m.season
+        """)]
+    finally:
+        data_access.close()
+
+
+def job_output_dir(output_root: str, championship: str, season: str) -> str:
+    """Dossier de sortie d'un couple (championnat, saison)"""
+    return os.path.join(output_root, championship.replace(' ', '_'), season.replace('/', '-'))
+
+
+def generate_job(db_path: str, championship: str, season: str, output_dir: str, num_teams: int,
+                 immutable: bool = False, calendar_split: str = None, sections: Sequence[str] = SECTIONS) -> Dict:
+    """Génère le site d'un championnat pour une saison (exécuté dans un processus du pool)"""
+    start = time.perf_counter()
+    # Une connexion en lecture seule par processus, conservée d'une tâche à l'autre
+    data_access = shared_data_access(db_path, read_only=True, immutable=immutable)
+    generator = HTMLPageGenerator(db_path, championship, season, output_dir, num_teams,
+                                  read_only=True, data_access=data_access, calendar_split=calendar_split,
+                                  sections=sections)
+    # Les traces détaillées de chaque génération sont masquées en mode lot
+    with contextlib.redirect_stdout(io.StringIO()):
+        pages = generator.generate_all_pages()
+    return {
+        'championship': championship,
+        'season': season,
+        'pages': pages,
+        'seconds': time.perf_counter() - start,
+        'pid': os.getpid(),
+    }
+
+
+def generate_all(db_path: str, output_root: str, num_teams: int = 10, workers: int = None,
+                 immutable: bool = False, calendar_split: str = None, bundle: bool = False,
+                 sections: Sequence[str] = SECTIONS) -> List[Dict]:
+    """Génère tous les couples (championnat, saison) dans un pool de processus"""
+    jobs = list_league_seasons(db_path)
+    workers = workers or os.cpu_count() or 1
+
+    print("\n" + "="*60)
+    print("GÉNÉRATION EN LOT - WEB 1.0")
+    print("="*60 + "\n")
+    print(f"✓ {len(jobs)} couples (championnat, saison) à générer avec {workers} processus")
+
+    # Caches communs construits une seule fois, avant le pool (événements XML sur un pool dédié) :
+    # les tâches ne font ensuite que les lire
+    data_access = SQLiteDataAccess(db_path, read_only=True, immutable=immutable)
+    if 'elo' in sections:
+        print(f"✓ Notes Elo : {len(load_ratings(data_access, default_cache_path(db_path)))} matchs pris en compte")
+    if 'players' in sections:
+        print(f"✓ Apparitions des joueurs : {ensure_cache(data_access)}")
+    if 'players' in sections and 'similarity' in sections:
+        print(f"✓ Similarité des joueurs : {len(PlayerSimilarity.open(data_access))} joueurs indexés")
+    if 'tactics' in sections:
+        print(f"✓ Profils tactiques : {len(TeamAttributes.open(data_access))} relevés")
+    if 'events' in sections:
+        print(f"✓ Événements de match : {extract_events(data_access, workers=workers)} nouveaux matchs analysés")
+    if 'styles' in sections:
+        print(f"✓ Styles de jeu : {len(TeamStyles.open(data_access))} équipes-saisons regroupées")
+    data_access.close()
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(generate_job, db_path, championship, season,
+                        job_output_dir(output_root, championship, season) + (BUNDLE_SUFFIX if bundle else ''),
+                        num_teams, immutable, calendar_split, sections)
+            for championship, season in jobs
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"✓ {result['championship']} {result['season']} : "
+                  f"{result['pages']} pages en {result['seconds'] * 1000:.0f} ms")
+    wall_time = time.perf_counter() - start
+
+    print_summary(results, wall_time, workers)
+    return results
+
+
+def print_summary(results: List[Dict], wall_time: float, workers: int):
+    """Affiche le récapitulatif des temps par tâche"""
+    results = sorted(results, key=lambda r: (r['championship'], r['season']))
+    busy_time = sum(r['seconds'] for r in results)
+
+    print(f"\n{'='*60}")
+    print("RÉCAPITULATIF DES TEMPS")
+    print(f"{'='*60}")
+    print(f"{'Championnat':<32} {'Saison':<10} {'Pages':>5} {'Temps (ms)':>11}")
+    for r in results:
+        print(f"{r['championship']:<32} {r['season']:<10} {r['pages']:>5} {r['seconds'] * 1000:>11.0f}")
+    print(f"\nTâches : {len(results)} | Pages : {sum(r['pages'] for r in results)}")
+    print(f"Temps cumulé des tâches : {busy_time:.2f} s | Temps réel : {wall_time:.2f} s")
+    if wall_time > 0:
+        speedup = busy_time / wall_time
+        print(f"Accélération : x{speedup:.2f} pour {workers} processus "
+              f"(efficacité {speedup / workers * 100:.0f} %)")
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Génère le site Web 1.0 pour tous les championnats et saisons")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--output", default="web_1.0_batch", help="Dossier racine de sortie")
+    parser.add_argument("--num-teams", type=int, default=10, help="Nombre de pages d'équipes par saison")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument("--immutable", action="store_true",
+                        help="Ouvre la base en mode immuable (aucun verrou ; la base ne doit pas changer pendant la génération)")
+    parser.add_argument("--calendar-split", choices=["month", "stage"], default=None,
+                        help="Découpe le calendrier en pages par mois ou par journée")
+    parser.add_argument("--bundle", action="store_true",
+                        help="Écrit chaque site dans une seule archive .zip au lieu d'un dossier de pages")
+    parser.add_argument("--sections", nargs="*", choices=SECTIONS, default=SECTIONS,
+                        help="Sections d'analyse activées (par défaut : toutes ; sans valeur : aucune)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    generate_all(args.db, args.output, args.num_teams, args.workers, args.immutable, args.calendar_split, args.bundle,
+                 args.sections)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Comparaison : classement incrémental (apply/revert) vs recalcul complet de la saison
+Auteur: T. E. G. - Web Sémantique
+Usage: python benchmark_incremental_standings.py [database.sqlite] [championnat] [saison]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+from generate_html_pages import HTMLPageGenerator
+from incremental_standings import IncrementalStandings
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "database.sqlite"
+    championship = sys.argv[2] if len(sys.argv) > 2 else "England Premier League"
+    season = sys.argv[3] if len(sys.argv) > 3 else "2008/2009"
+    if not os.path.exists(db_path):
+        print(f"Erreur : Le fichier {db_path} n'existe pas.")
+        return
+
+    generator = HTMLPageGenerator(db_path, championship, season, "", read_only=True, incremental=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.connect_db()
+        league_id, _ = generator.get_league_and_country_ids()
+        matches = [dict(match) for match in generator.get_matches(league_id)]
+        generator.close_db()
+
+    print("=" * 60)
+    print(f"CLASSEMENT INCRÉMENTAL - {championship} {season}")
+    print("=" * 60)
+
+    # 1. Résultats arrivant un par un : classement publié après chaque match
+    start = time.perf_counter()
+    for i in range(1, len(matches) + 1):
+        recomputed = generator.calculate_standings(matches[:i])
+    recompute_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    incremental = IncrementalStandings()
+    for match in matches:
+        incremental.apply(match)
+        current = incremental.standings()
+    incremental_time = time.perf_counter() - start
+    assert current == recomputed, "Classements différents après la saison complète"
+
+    print(f"\nRésultats un par un ({len(matches)} matchs, classement après chaque match)")
+    print(f"  Recalcul complet : {recompute_time * 1000:>9.1f} ms")
+    print(f"  Incrémental      : {incremental_time * 1000:>9.1f} ms  (x{recompute_time / incremental_time:.0f})")
+
+    # 2. Corrections de résultats sur la saison complète
+    rng = random.Random(6253)
+    corrections = 1000
+    edited = list(matches)
+    start = time.perf_counter()
+    for _ in range(corrections):
+        i = rng.randrange(len(edited))
+        fixed = dict(edited[i], home_team_goal=rng.randint(0, 4), away_team_goal=rng.randint(0, 4))
+        incremental.correct(edited[i], fixed)
+        edited[i] = fixed
+        incremental.standings()
+    incremental_time = time.perf_counter() - start
+
+    edited = list(matches)
+    rng = random.Random(6253)
+    start = time.perf_counter()
+    for _ in range(corrections):
+        i = rng.randrange(len(edited))
+        edited[i] = dict(edited[i], home_team_goal=rng.randint(0, 4), away_team_goal=rng.randint(0, 4))
+        recomputed = generator.calculate_standings(edited)
+    recompute_time = time.perf_counter() - start
+    assert incremental.standings() == recomputed, "Classements différents après les corrections"
+
+    print(f"\nCorrections de résultats ({corrections} corrections, classement après chacune)")
+    print(f"  Recalcul complet : {recompute_time * 1000:>9.1f} ms")
+    print(f"  Incrémental      : {incremental_time * 1000:>9.1f} ms  (x{recompute_time / incremental_time:.0f})")
+    print("\n✓ Classements identiques au recalcul complet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Comparaison de l'empreinte mémoire : liste de dicts (une par ligne) vs MatchTable en colonnes
+Auteur: T. E. G. - Web Sémantique
+Usage: python benchmark_match_table.py [database.sqlite]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from match_table import MatchTable
+
+# Même requête que HTMLPageGenerator.get_matches, sans filtre : toutes les ligues et saisons
+QUERY = """
+SELECT
+    m.id,
+    m.date,
+    m.season,
+    m.stage,
+    ht.team_long_name as home_team,
+    ht.team_short_name as home_team_short,
+    at.team_long_name as away_team,
+    at.team_short_name as away_team_short,
+    m.home_team_goal,
+    m.away_team_goal,
+    m.home_team_api_id,
+    m.away_team_api_id
+FROM Match m
+JOIN Team ht ON m.home_team_api_id = ht.team_api_id
+JOIN Team at ON m.away_team_api_id = at.team_api_id
+ORDER BY m.league_id, m.season, m.date
+"""
+
+
+def measure(label: str, conn: sqlite3.Connection, build):
+    """Construit la structure et mesure le pic et le reste mémoire (tracemalloc)"""
+    cursor = conn.cursor()
+    cursor.execute(QUERY)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(cursor)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {len(result):>8} matchs | retenu : {current / 1024:>10.1f} Ko"
+          f" | pic : {peak / 1024:>10.1f} Ko | {elapsed * 1000:>8.1f} ms")
+    return result, current
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "database.sqlite"
+    if not os.path.exists(db_path):
+        print(f"Erreur : Le fichier {db_path} n'existe pas.")
+        return
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+
+    # Premier passage à blanc : les imports paresseux de NumPy ne doivent pas être comptés
+    MatchTable(conn.execute(QUERY))
+
+    print("=" * 60)
+    print("EMPREINTE MÉMOIRE DES MATCHS")
+    print("=" * 60)
+    rows, rows_bytes = measure("Liste de dicts", conn, lambda c: [dict(row) for row in c])
+    table, table_bytes = measure("MatchTable (colonnes)", conn, MatchTable)
+    conn.close()
+
+    print(f"\nColonnes typées seules : {table.nbytes() / 1024:.1f} Ko"
+          f" pour {len(table.team_api_ids)} équipes internées")
+    if table_bytes:
+        print(f"Réduction mémoire : x{rows_bytes / table_bytes:.1f}")
+
+    # Les vues de lignes doivent restituer exactement les dicts d'origine
+    assert all(row == view for row, view in zip(rows, table)), "Vues de lignes incohérentes"
+    print("✓ Vues de lignes identiques à la liste de dicts")
+
+
+if __name__ == "__main__":
+    main()
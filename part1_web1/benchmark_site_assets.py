@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Mesure du gain de la feuille de style partagée et des pages précompressées
+Auteur: T. E. G. - Web Sémantique
+Usage: python benchmark_site_assets.py [database.sqlite] [championnat] [saison]
+
+Le site est généré deux fois (feuille de style intégrée à chaque page, puis
+feuille partagée) ; on compare le volume des pages, leur volume compressé et
+le temps d'analyse de toutes les pages par BeautifulSoup.
+"""
+
+import contextlib
+import gzip
+import io
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+from generate_html_pages import HTMLPageGenerator
+
+
+def measure_site(output_dir: str, repeat: int = 7):
+    """Volume brut, volume compressé et temps d'analyse des pages HTML d'un dossier"""
+    pages = []
+    for filename in sorted(os.listdir(output_dir)):
+        if filename.endswith('.html'):
+            with open(os.path.join(output_dir, filename), 'rb') as f:
+                pages.append(f.read())
+    raw = sum(len(page) for page in pages)
+    compressed = sum(len(gzip.compress(page, compresslevel=9, mtime=0)) for page in pages)
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            BeautifulSoup(page, 'html.parser')
+        best = min(best, time.perf_counter() - start)
+    return len(pages), raw, compressed, best
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "database.sqlite"
+    championship = sys.argv[2] if len(sys.argv) > 2 else "England Premier League"
+    season = sys.argv[3] if len(sys.argv) > 3 else "2008/2009"
+    if not os.path.exists(db_path):
+        print(f"Erreur : Le fichier {db_path} n'existe pas.")
+        return
+
+    print("=" * 60)
+    print(f"FEUILLE DE STYLE PARTAGÉE - {championship} {season}")
+    print("=" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        for label, inline in (("Style intégré", True), ("Style partagé", False)):
+            output_dir = os.path.join(root, "inline" if inline else "shared")
+            generator = HTMLPageGenerator(db_path, championship, season, output_dir, 10,
+                                          read_only=True, incremental=False, inline_styles=inline)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator.generate_all_pages()
+            results[label] = measure_site(output_dir)
+
+    print(f"\n{'':<15} {'Pages':>6} {'Octets':>10} {'Octets .gz':>11} {'Analyse (ms)':>13}")
+    for label, (pages, raw, compressed, parse_time) in results.items():
+        print(f"{label:<15} {pages:>6} {raw:>10} {compressed:>11} {parse_time * 1000:>13.1f}")
+
+    _, inline_raw, inline_gz, inline_parse = results["Style intégré"]
+    _, shared_raw, shared_gz, shared_parse = results["Style partagé"]
+    print(f"\n✓ Volume des pages : {(shared_raw / inline_raw - 1) * 100:+.0f} % "
+          f"({(shared_gz / inline_raw - 1) * 100:+.0f} % avec .gz, contre {(inline_gz / inline_raw - 1) * 100:+.0f} % "
+          f"pour le style intégré compressé)")
+    print(f"✓ Temps d'analyse BeautifulSoup : {(shared_parse / inline_parse - 1) * 100:+.0f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Comparaison des temps : calcul en Python vs moteur SQL, pour toutes les ligues et saisons
+Auteur: T. E. G. - Web Sémantique
+Usage: python benchmark_sql_engine.py [database.sqlite]
+
+Attention : le moteur SQL crée ses index couvrants dans la base s'ils sont absents.
+"""
+
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import time
+
+from generate_html_pages import HTMLPageGenerator
+from sql_engine import SQLSeasonEngine
+
+
+def list_league_season_ids(conn: sqlite3.Connection):
+    """Liste des couples (league_id, nom, saison) ayant au moins un match"""
+    cursor = conn.cursor()
+    cursor.execute("""
+    SELECT DISTINCT l.id, l.name, m.season
+    FROM Match m
+    JOIN League l ON m.league_id = l.id
+    ORDER BY l.name, m.season
+    """)
+    return cursor.fetchall()
+
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "database.sqlite"
+    if not os.path.exists(db_path):
+        print(f"Erreur : Le fichier {db_path} n'existe pas.")
+        return
+
+    generator = HTMLPageGenerator(db_path, "", "", "", incremental=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.connect_db()
+    engine = SQLSeasonEngine(generator.conn)
+    engine.ensure_indexes()
+
+    print("=" * 78)
+    print("CLASSEMENT + STATISTIQUES : PYTHON vs SQL")
+    print("=" * 78)
+    print(f"{'Championnat':<28} {'Saison':<10} {'Boucles (ms)':>12} {'NumPy (ms)':>11} {'SQL (ms)':>9}  Identique")
+
+    totals = [0.0, 0.0, 0.0]
+    for league_id, name, season in list_league_season_ids(generator.conn):
+        generator.season = season
+
+        # Chemin Python : lecture de tous les matchs puis agrégation en Python
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            matches = generator.get_matches(league_id)
+        fetch_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = (generator.calculate_standings(matches), generator.calculate_statistics(matches))
+        loops_time = fetch_time + time.perf_counter() - start
+
+        start = time.perf_counter()
+        generator.calculate_season(matches)
+        numpy_time = fetch_time + time.perf_counter() - start
+
+        # Moteur SQL : agrégations exécutées par SQLite
+        start = time.perf_counter()
+        pushed = engine.calculate_season(league_id, season)
+        sql_time = time.perf_counter() - start
+
+        identical = pushed == reference
+        totals[0] += loops_time
+        totals[1] += numpy_time
+        totals[2] += sql_time
+        print(f"{name[:28]:<28} {season:<10} {loops_time * 1000:>12.1f} {numpy_time * 1000:>11.1f} "
+              f"{sql_time * 1000:>9.1f}  {'oui' if identical else 'NON'}")
+
+    print("-" * 78)
+    print(f"{'Total':<39} {totals[0] * 1000:>12.1f} {totals[1] * 1000:>11.1f} {totals[2] * 1000:>9.1f}")
+    generator.close_db()
+
+
+if __name__ == "__main__":
+    main()
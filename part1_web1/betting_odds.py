@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Analyse des cotes des bookmakers (colonnes B365H/D/A, BWH/D/A... de Match)
+Auteur: T. E. G. - Web Sémantique
+Usage: python betting_odds.py [--db database.sqlite] [--top 10]
+
+Les cotes sont chargées en tableaux colonnes (matchs × bookmakers × issues),
+une cote manquante valant NaN. Tout est vectorisé :
+- probabilités implicites 1/cote, marge du bookmaker (overround) = somme - 1 ;
+- probabilités normalisées puis moyennées sur les bookmakers (consensus) ;
+- favori du match (domicile ou extérieur) et issue pour le favori ;
+- points attendus d'une équipe : 3 × P(victoire) + P(nul), sommés par équipe.
+
+Les agrégats par (saison, équipe) sont obtenus par bincount sur des clés
+entières : toutes les saisons de tous les championnats sont traitées en un
+seul passage.
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from db_access import SQLiteDataAccess
+
+BOOKMAKERS = {
+    'B365': 'Bet365',
+    'BW': 'Bwin',
+    'IW': 'Interwetten',
+    'LB': 'Ladbrokes',
+    'PS': 'Pinnacle',
+    'WH': 'William Hill',
+    'SJ': 'Stan James',
+    'VC': 'VC Bet',
+    'GB': 'Gamebookers',
+    'BS': 'Blue Square',
+}
+
+# Issues dans l'ordre des colonnes : victoire domicile, nul, victoire extérieur
+OUTCOMES = ('H', 'D', 'A')
+
+ODDS_COLUMNS = [f'{bookmaker}{outcome}' for bookmaker in BOOKMAKERS for outcome in OUTCOMES]
+
+ODDS_QUERY = f"""
+SELECT m.home_team_api_id, m.away_team_api_id, m.home_team_goal, m.away_team_goal,
+       {', '.join(f'm.{column}' for column in ODDS_COLUMNS)}
+FROM Match m
+WHERE m.league_id = ? AND m.season = ?
+  AND m.home_team_goal IS NOT NULL AND m.away_team_goal IS NOT NULL
+ORDER BY m.date, m.id
+"""
+
+ALL_ODDS_QUERY = f"""
+SELECT l.name AS championship, m.season, m.home_team_api_id, m.away_team_api_id,
+       m.home_team_goal, m.away_team_goal, {', '.join(f'm.{column}' for column in ODDS_COLUMNS)}
+FROM Match m
+JOIN League l ON m.league_id = l.id
+WHERE m.home_team_goal IS NOT NULL AND m.away_team_goal IS NOT NULL
+ORDER BY l.name, m.season, m.date, m.id
+"""
+
+
+class OddsTable(NamedTuple):
+    """Résultats de l'analyse des cotes, sous forme de tableaux alignés"""
+    probabilities: np.ndarray       # consensus par match (n × 3, NaN sans cotes)
+    overround: np.ndarray           # marge moyenne par groupe et bookmaker (groupes × bookmakers)
+    quoted: np.ndarray              # matchs cotés par groupe et bookmaker
+    favourite_results: np.ndarray   # par groupe : favori vainqueur, nul, outsider vainqueur
+    groups: np.ndarray              # groupe de chaque couple (groupe, équipe)
+    team_ids: np.ndarray            # team_api_id de chaque couple
+    played: np.ndarray              # matchs cotés
+    points: np.ndarray              # points obtenus dans ces matchs
+    expected_points: np.ndarray     # points attendus d'après les cotes
+    favourite_played: np.ndarray    # matchs joués en favori
+    favourite_won: np.ndarray       # victoires en favori
+    underdog_played: np.ndarray     # matchs joués en outsider
+    underdog_won: np.ndarray        # victoires en outsider
+
+
+def odds_arrays(rows: Sequence[Sequence]) -> np.ndarray:
+    """Cotes (matchs × bookmakers × 3) à partir des colonnes ODDS_COLUMNS ; NaN si absente ou invalide"""
+    odds = np.array(rows, dtype=np.float64).reshape(len(rows), len(BOOKMAKERS), len(OUTCOMES))
+    # Une cote doit être > 1 et le bookmaker doit coter les trois issues
+    odds[~(odds > 1.0)] = np.nan
+    odds[np.isnan(odds).any(axis=2)] = np.nan
+    return odds
+
+
+def compute_odds(groups: np.ndarray, home_ids: np.ndarray, away_ids: np.ndarray,
+                 home_goals: np.ndarray, away_goals: np.ndarray, odds: np.ndarray) -> OddsTable:
+    """
+    Analyse vectorisée des cotes de tous les groupes en un passage
+
+    Args:
+        groups: Groupe de chaque match (0..n_groupes - 1, par exemple une saison)
+        home_ids, away_ids, home_goals, away_goals: Matchs
+        odds: Cotes (matchs × bookmakers × 3), NaN si absentes (voir odds_arrays)
+    """
+    n_groups = int(groups.max()) + 1 if len(groups) else 0
+    implied = 1.0 / odds
+    total = implied.sum(axis=2)
+    quoted_mask = ~np.isnan(total)
+
+    # Marge moyenne de chaque bookmaker dans chaque groupe
+    n_bookmakers = odds.shape[1]
+    cells = (groups[:, None] * n_bookmakers + np.arange(n_bookmakers)).ravel()
+    weights = quoted_mask.ravel()
+    quoted = np.bincount(cells, weights=weights, minlength=n_groups * n_bookmakers)
+    margins = np.bincount(cells, weights=np.where(weights, (total - 1.0).ravel(), 0.0),
+                          minlength=n_groups * n_bookmakers)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        overround = (margins / quoted).reshape(n_groups, n_bookmakers)
+        # Consensus : probabilités sans marge, moyennées sur les bookmakers disponibles
+        normalized = implied / total[:, :, None]
+        counts = quoted_mask.sum(axis=1)
+        probabilities = np.where(quoted_mask[:, :, None], normalized, 0.0).sum(axis=1) / counts[:, None]
+    has_odds = counts > 0
+
+    # Favori : l'équipe (domicile ou extérieur) la plus probable gagnante ; égalité = pas de favori
+    result = np.sign(home_goals - away_goals)
+    home_favourite = has_odds & (probabilities[:, 0] > probabilities[:, 2])
+    away_favourite = has_odds & (probabilities[:, 2] > probabilities[:, 0])
+    favourite_result = np.where(home_favourite, result, -result)
+    has_favourite = home_favourite | away_favourite
+    favourite_results = np.stack([
+        np.bincount(groups[has_favourite & (favourite_result == code)], minlength=n_groups)
+        for code in (1, 0, -1)
+    ], axis=1)
+
+    # Deux lignes par match coté (une par équipe), agrégées par clé (groupe, équipe)
+    rows = np.flatnonzero(has_odds)
+    teams = np.concatenate([home_ids[rows], away_ids[rows]])
+    row_groups = np.concatenate([groups[rows], groups[rows]])
+    team_result = np.concatenate([result[rows], -result[rows]])
+    p = probabilities[rows]
+    expected = np.concatenate([3 * p[:, 0] + p[:, 1], 3 * p[:, 2] + p[:, 1]])
+    favourite = np.concatenate([home_favourite[rows], away_favourite[rows]])
+    underdog = np.concatenate([away_favourite[rows], home_favourite[rows]])
+    won = team_result == 1
+
+    keys = row_groups * (int(teams.max()) + 1 if len(teams) else 1) + teams
+    unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    n_keys = len(unique_keys)
+
+    def total_by_key(values: np.ndarray) -> np.ndarray:
+        return np.bincount(inverse, weights=values, minlength=n_keys)
+
+    return OddsTable(
+        probabilities=np.where(has_odds[:, None], probabilities, np.nan),
+        overround=overround,
+        quoted=quoted.reshape(n_groups, n_bookmakers).astype(np.int64),
+        favourite_results=favourite_results,
+        groups=row_groups[first],
+        team_ids=teams[first],
+        played=np.bincount(inverse, minlength=n_keys),
+        points=total_by_key(np.select([team_result == 1, team_result == 0], [3, 1], 0)).astype(np.int64),
+        expected_points=total_by_key(expected),
+        favourite_played=np.bincount(inverse[favourite], minlength=n_keys),
+        favourite_won=np.bincount(inverse[favourite & won], minlength=n_keys),
+        underdog_played=np.bincount(inverse[underdog], minlength=n_keys),
+        underdog_won=np.bincount(inverse[underdog & won], minlength=n_keys),
+    )
+
+
+def team_rows(table: OddsTable) -> List[Dict]:
+    """Une ligne lisible (dict) par couple (groupe, équipe)"""
+    rows = []
+    for i in range(len(table.team_ids)):
+        rows.append({
+            'group': int(table.groups[i]),
+            'team_api_id': int(table.team_ids[i]),
+            'played': int(table.played[i]),
+            'points': int(table.points[i]),
+            'expected_points': float(table.expected_points[i]),
+            'difference': float(table.points[i] - table.expected_points[i]),
+            'favourite_played': int(table.favourite_played[i]),
+            'favourite_won': int(table.favourite_won[i]),
+            'underdog_played': int(table.underdog_played[i]),
+            'underdog_won': int(table.underdog_won[i]),
+        })
+    return rows
+
+
+def group_summary(table: OddsTable, group: int) -> Dict:
+    """Résumé d'un groupe : matchs cotés, issues pour les favoris, marge de chaque bookmaker"""
+    favourite_won, draws, underdog_won = (int(count) for count in table.favourite_results[group])
+    bookmakers = [{'bookmaker': name, 'matches': int(table.quoted[group, k]),
+                   'overround': float(table.overround[group, k])}
+                  for k, name in enumerate(BOOKMAKERS.values()) if table.quoted[group, k]]
+    played = table.played[table.groups == group]
+    return {
+        'matches': int(played.sum()) // 2,
+        'favourite_won': favourite_won,
+        'draws': draws,
+        'underdog_won': underdog_won,
+        'overround': (sum(b['overround'] * b['matches'] for b in bookmakers) /
+                      max(sum(b['matches'] for b in bookmakers), 1)),
+        'bookmakers': bookmakers,
+    }
+
+
+def load_season_odds(data_access: SQLiteDataAccess, league_id: int, season: str):
+    """Colonnes d'une saison : (home_ids, away_ids, home_goals, away_goals, cotes)"""
+    rows = [tuple(row) for row in data_access.iter_query(ODDS_QUERY, (league_id, season))]
+    columns = [np.array([row[k] for row in rows], dtype=np.int64) for k in range(4)]
+    return (*columns, odds_arrays([row[4:] for row in rows]))
+
+
+def season_odds(data_access: SQLiteDataAccess, league_id: int, season: str,
+                standings: List[Dict]) -> Optional[Dict]:
+    """
+    Analyse des cotes d'une saison
+
+    Returns:
+        {'summary': résumé de la saison, 'teams': team_api_id -> ligne de l'équipe (avec son nom),
+        dans l'ordre du classement}, ou None si aucun match de la saison n'est coté
+    """
+    home_ids, away_ids, home_goals, away_goals, odds = load_season_odds(data_access, league_id, season)
+    table = compute_odds(np.zeros(len(home_ids), dtype=np.int64), home_ids, away_ids, home_goals, away_goals, odds)
+    if not len(table.team_ids):
+        return None
+    by_team = {row['team_api_id']: row for row in team_rows(table)}
+    teams = {}
+    for team in standings:
+        row = by_team.get(team['team_api_id'])
+        if row is not None:
+            row['team'] = team['team']
+            teams[team['team_api_id']] = row
+    return {'summary': group_summary(table, 0), 'teams': teams}
+
+
+def all_odds(data_access: SQLiteDataAccess):
+    """
+    Analyse des cotes de toutes les saisons de tous les championnats (un seul passage)
+
+    Returns:
+        (résumés par (championnat, saison), lignes par (championnat, saison, équipe))
+    """
+    keys: Dict[tuple, int] = {}
+    columns = [[], [], [], [], []]
+    odds_rows = []
+    for row in data_access.iter_query(ALL_ODDS_QUERY):
+        row = tuple(row)
+        columns[0].append(keys.setdefault((row[0], row[1]), len(keys)))
+        for k in range(4):
+            columns[k + 1].append(row[2 + k])
+        odds_rows.append(row[6:])
+    if not keys:
+        return {}, []
+    table = compute_odds(*(np.array(column, dtype=np.int64) for column in columns), odds_arrays(odds_rows))
+    labels = list(keys)
+    rows = team_rows(table)
+    for row in rows:
+        row['championship'], row['season'] = labels[row.pop('group')]
+    summaries = {label: group_summary(table, group) for group, label in enumerate(labels)}
+    return summaries, rows
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Analyse des cotes des bookmakers, toutes saisons")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--top", type=int, default=10, help="Nombre d'équipes affichées par catégorie")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    start = time.perf_counter()
+    summaries, rows = all_odds(data_access)
+    elapsed = time.perf_counter() - start
+    names = {row['team_api_id']: row['team_long_name']
+             for row in data_access.iter_query("SELECT team_api_id, team_long_name FROM Team")}
+    data_access.close()
+
+    print("=" * 60)
+    print("COTES DES BOOKMAKERS - TOUTES LES SAISONS")
+    print("=" * 60)
+    print(f"\n✓ {len(summaries)} saisons, {len(rows)} couples (équipe, saison) "
+          f"traités en {elapsed * 1000:.0f} ms (lecture comprise)")
+    print(f"\n{'Championnat':<32} {'Saison':<10} {'Matchs':>6} {'Marge':>7} {'Favoris':>8}")
+    for (championship, season), summary in summaries.items():
+        decided = summary['favourite_won'] + summary['draws'] + summary['underdog_won']
+        print(f"{championship:<32} {season:<10} {summary['matches']:>6} {summary['overround'] * 100:>6.1f}% "
+              f"{summary['favourite_won'] / max(decided, 1) * 100:>7.1f}%")
+    for title, reverse in (("Au-dessus des points attendus", True), ("En dessous des points attendus", False)):
+        print(f"\n{title}")
+        for row in sorted(rows, key=lambda row: row['difference'], reverse=reverse)[:args.top]:
+            print(f"  {row['difference']:>+6.1f}  {names.get(row['team_api_id'], row['team_api_id']):<28} "
+                  f"{row['championship']} {row['season']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Écriture en flux du calendrier et découpage par mois ou par journée
+Auteur: T. E. G. - Web Sémantique
+
+Le calendrier est produit par morceaux (en-tête, paquets de lignes, pied de
+page) écrits au fur et à mesure dans le fichier : le document complet n'est
+jamais assemblé en mémoire, quelle que soit la taille de la liste de matchs
+(plusieurs saisons, tous les championnats...). Le calendrier peut aussi être
+découpé en pages par mois ou par journée, reliées par une petite page d'index,
+pour que les outils en aval (enrichissement, moteurs de recherche) n'analysent
+que la tranche dont ils ont besoin.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+# Nombre de lignes du tableau écrites par appel à write()
+CHUNK_ROWS = 256
+
+SPLITS = ('month', 'stage')
+
+MONTHS_FR = ('Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin', 'Juillet',
+             'Août', 'Septembre', 'Octobre', 'Novembre', 'Décembre')
+
+TABLE_HEAD = """
+    <table>
+        <tr>
+            <th>Date</th>
+            <th>Équipe domicile</th>
+            <th>Score</th>
+            <th>Équipe extérieure</th>
+        </tr>
+"""
+
+
+class CalendarSlice(NamedTuple):
+    """Une page du calendrier découpé : fichier, libellé et matchs couverts"""
+    filename: str
+    label: str
+    matches: List[Dict]
+
+
+def calendar_row(match: Dict) -> str:
+    """Ligne HTML d'un match du calendrier"""
+    date_obj = datetime.strptime(match['date'], '%Y-%m-%d %H:%M:%S')
+    date_formatted = date_obj.strftime('%d/%m/%Y')
+    return f"""
+        <tr>
+            <td>{date_formatted}</td>
+            <td>{match['home_team']}</td>
+            <td class="score">{match['home_team_goal']} - {match['away_team_goal']}</td>
+            <td>{match['away_team']}</td>
+        </tr>
+"""
+
+
+def calendar_chunks(header: str, heading: str, matches: Iterable[Dict], footer: str,
+                    chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """
+    Produit le calendrier par morceaux
+
+    Args:
+        header: En-tête HTML commun (generate_html_header)
+        heading: Titres de la page, placés avant le tableau
+        matches: Matchs dans l'ordre d'affichage (peut être un flux)
+        footer: Pied de page HTML commun
+        chunk_rows: Nombre de lignes regroupées par morceau
+    """
+    yield header + heading + TABLE_HEAD
+    rows = []
+    for match in matches:
+        rows.append(calendar_row(match))
+        if len(rows) >= chunk_rows:
+            yield ''.join(rows)
+            rows = []
+    if rows:
+        yield ''.join(rows)
+    yield "    </table>\n" + footer
+
+
+def write_chunks(path: str, chunks: Iterable[str]):
+    """Écrit des morceaux de HTML dans un fichier sans les concaténer"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def split_calendar(matches: Iterable[Dict], split: str) -> List[CalendarSlice]:
+    """
+    Découpe les matchs par mois ('month') ou par journée ('stage')
+
+    Les tranches sont triées (mois chronologiques, journées croissantes) et
+    chaque tranche garde l'ordre des matchs reçus.
+    """
+    if split not in SPLITS:
+        raise ValueError(f"Découpage inconnu : {split} (attendu : {', '.join(SPLITS)})")
+
+    groups: Dict[object, List[Dict]] = {}
+    for match in matches:
+        key = match['date'][:7] if split == 'month' else match['stage']
+        groups.setdefault(key, []).append(match)
+
+    slices = []
+    for key in sorted(groups):
+        if split == 'month':
+            year, month = key.split('-')
+            filename = f"calendrier_{key}.html"
+            label = f"{MONTHS_FR[int(month) - 1]} {year}"
+        else:
+            filename = f"calendrier_journee_{key:02d}.html"
+            label = f"Journée {key}"
+        slices.append(CalendarSlice(filename, label, groups[key]))
+    return slices
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Couche d'accès SQLite du générateur
+Auteur: T. E. G. - Web Sémantique
+
+- connexions URI en lecture seule (mode=ro), éventuellement immuables (immutable=1)
+- pragmas mmap_size / cache_size réglables
+- cache de requêtes préparées (cached_statements de sqlite3, requêtes en constantes)
+- lecture en flux par paquets (fetchmany) pour borner la mémoire
+- réutilisation d'une même connexion par processus entre plusieurs tâches
+"""
+
+import os
+import sqlite3
+from typing import Dict, Iterator, Optional, Sequence
+from urllib.request import pathname2url
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024     # octets projetés en mémoire
+DEFAULT_CACHE_SIZE = 64 * 1024            # Kio de cache de pages
+DEFAULT_STATEMENT_CACHE = 256             # requêtes préparées gardées par connexion
+DEFAULT_FETCH_SIZE = 2000                 # lignes lues par paquet
+
+
+class SQLiteDataAccess:
+    """Connexion SQLite réglée pour la lecture massive de la base européenne"""
+
+    def __init__(self, db_path: str, read_only: bool = True, immutable: bool = False,
+                 mmap_size: int = DEFAULT_MMAP_SIZE, cache_size: int = DEFAULT_CACHE_SIZE,
+                 statement_cache: int = DEFAULT_STATEMENT_CACHE, fetch_size: int = DEFAULT_FETCH_SIZE):
+        """
+        Args:
+            db_path: Chemin vers database.sqlite
+            read_only: Ouvre la base en lecture seule (mode=ro)
+            immutable: Suppose que le fichier ne change pas (aucun verrou, lecture seule implicite)
+            mmap_size: Taille de la projection mémoire en octets (0 = désactivée)
+            cache_size: Taille du cache de pages en Kio
+            statement_cache: Nombre de requêtes préparées conservées par la connexion
+            fetch_size: Nombre de lignes lues par appel à fetchmany
+        """
+        self.db_path = db_path
+        self.read_only = read_only or immutable
+        self.immutable = immutable
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.statement_cache = statement_cache
+        self.fetch_size = fetch_size
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connexion ouverte à la première utilisation puis réutilisée"""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            params = "mode=ro&immutable=1" if self.immutable else "mode=ro"
+            uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?{params}"
+            conn = sqlite3.connect(uri, uri=True, cached_statements=self.statement_cache)
+        else:
+            conn = sqlite3.connect(self.db_path, cached_statements=self.statement_cache)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if self.read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def iter_query(self, query: str, params: Sequence = ()) -> Iterator[sqlite3.Row]:
+        """Exécute une requête et produit les lignes par paquets de fetch_size"""
+        cursor = self.connection.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(self.fetch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def query_one(self, query: str, params: Sequence = ()) -> Optional[sqlite3.Row]:
+        """Exécute une requête et retourne la première ligne"""
+        cursor = self.connection.execute(query, params)
+        try:
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def close(self):
+        """Ferme la connexion si elle est ouverte"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __getstate__(self):
+        # Une connexion ne se transmet pas à un autre processus : elle sera rouverte
+        state = self.__dict__.copy()
+        state['_conn'] = None
+        return state
+
+
+# Connexions partagées du processus courant, réutilisées d'une tâche à l'autre
+_shared: Dict[tuple, SQLiteDataAccess] = {}
+
+
+def shared_data_access(db_path: str, **options) -> SQLiteDataAccess:
+    """Retourne la couche d'accès partagée du processus pour cette base et ces options"""
+    key = (os.path.abspath(db_path), tuple(sorted(options.items())))
+    data_access = _shared.get(key)
+    if data_access is None:
+        data_access = _shared[key] = SQLiteDataAccess(db_path, **options)
+    return data_access
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Classement Elo sur tout l'historique de la table Match
+Auteur: T. E. G. - Web Sémantique
+Usage: python elo_ratings.py [--db database.sqlite] [--cache database.sqlite.elo.npz]
+
+Tous les matchs (tous championnats, toutes saisons) sont parcourus une seule
+fois dans l'ordre chronologique (date, puis id). L'état courant tient dans un
+tableau de notes indexé directement par team_api_id ; chaque match ajoute une
+ligne à un historique en colonnes (notes avant/après des deux équipes), ce
+qui permet de retrouver la note d'une équipe à n'importe quelle date.
+
+Le résultat est mis en cache (.npz) avec la position du dernier match traité,
+l'empreinte de la base (taille, date) et une somme de contrôle du contenu des
+matchs traités (id, date, équipes, buts). Si la base n'a pas changé, le cache
+est réutilisé tel quel. Sinon, les matchs déjà traités sont relus : si leur
+somme de contrôle est inchangée, seuls les matchs ajoutés depuis sont
+appliqués ; dans tous les autres cas (score corrigé, match inséré dans le
+passé ou supprimé, paramètres différents), tout est recalculé.
+
+Formule : Elo « football » (World Football Elo) avec avantage du terrain et
+coefficient K multiplié selon l'écart de buts.
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from db_access import SQLiteDataAccess
+from page_manifest import fingerprint
+from standings_history import normalize_date
+
+DEFAULT_K = 20.0
+DEFAULT_HOME_ADVANTAGE = 65.0
+DEFAULT_INITIAL = 1500.0
+
+HISTORY_QUERY = """
+SELECT id, date, home_team_api_id, away_team_api_id, home_team_goal, away_team_goal
+FROM Match
+WHERE home_team_goal IS NOT NULL AND away_team_goal IS NOT NULL
+  AND (date > ? OR (date = ? AND id > ?))
+ORDER BY date, id
+"""
+
+PROCESSED_QUERY = """
+SELECT id, date, home_team_api_id, away_team_api_id, home_team_goal, away_team_goal
+FROM Match
+WHERE home_team_goal IS NOT NULL AND away_team_goal IS NOT NULL
+  AND (date < ? OR (date = ? AND id <= ?))
+"""
+
+CHECKSUM_MASK = 2 ** 64 - 1
+
+
+def rows_checksum(rows: Iterable[Sequence]) -> int:
+    """
+    Somme de contrôle du contenu de matchs (somme modulo 2**64 des hachés de chaque ligne)
+
+    Indépendante de l'ordre et du découpage en lots : elle se complète au fil
+    des mises à jour et se recalcule d'un seul passage sur la base.
+    """
+    total = 0
+    for row in rows:
+        digest = hashlib.blake2b(repr(tuple(row)).encode('utf-8'), digest_size=8).digest()
+        total += int.from_bytes(digest, 'little')
+    return total & CHECKSUM_MASK
+
+
+def source_fingerprint(db_path: str) -> str:
+    stat = os.stat(db_path)
+    return fingerprint(os.path.abspath(db_path), stat.st_size, stat.st_mtime_ns)
+
+
+def goal_multiplier(goal_difference: int) -> float:
+    """Multiplicateur de K selon l'écart de buts (1 ; 1,5 ; (11 + écart) / 8)"""
+    if goal_difference <= 1:
+        return 1.0
+    if goal_difference == 2:
+        return 1.5
+    return (11 + goal_difference) / 8
+
+
+class EloRatings:
+    """Notes Elo courantes et historique complet, mis à jour match par match"""
+
+    def __init__(self, k: float = DEFAULT_K, home_advantage: float = DEFAULT_HOME_ADVANTAGE,
+                 initial: float = DEFAULT_INITIAL):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        # Note courante de chaque équipe, indexée par team_api_id (agrandi au besoin)
+        self.ratings = np.full(1, initial, dtype=np.float64)
+        # Historique en colonnes : une entrée par match traité
+        self.match_ids = array('q')
+        self.dates: List[str] = []
+        self.home_ids = array('q')
+        self.away_ids = array('q')
+        self.home_before = array('d')
+        self.away_before = array('d')
+        self.home_after = array('d')
+        self.away_after = array('d')
+        # Somme de contrôle des matchs traités et empreinte de la base lors du dernier enregistrement
+        self.checksum = 0
+        self.source = ''
+        # Index par équipe (construits à la demande) : indices et dates de ses entrées
+        self._team_index: Optional[Dict[int, List[int]]] = None
+        self._team_dates: Dict[int, List[str]] = {}
+
+    @property
+    def params(self) -> Tuple[float, float, float]:
+        return self.k, self.home_advantage, self.initial
+
+    @property
+    def watermark(self) -> Tuple[str, int]:
+        """(date, id) du dernier match traité"""
+        if not self.dates:
+            return '', -1
+        return self.dates[-1], self.match_ids[-1]
+
+    def __len__(self):
+        return len(self.match_ids)
+
+    def update(self, rows: Iterable[Sequence]):
+        """
+        Applique des matchs dans l'ordre chronologique
+
+        Args:
+            rows: (id, date, home_team_api_id, away_team_api_id, home_team_goal, away_team_goal)
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        self.checksum = (self.checksum + rows_checksum(rows)) & CHECKSUM_MASK
+        max_id = max(max(row[2], row[3]) for row in rows)
+        if max_id >= len(self.ratings):
+            grown = np.full(max_id + 1, self.initial, dtype=np.float64)
+            grown[:len(self.ratings)] = self.ratings
+            self.ratings = grown
+
+        # Boucle sur une liste Python : l'accès élément par élément y est bien plus rapide
+        ratings = self.ratings.tolist()
+        k, home_advantage = self.k, self.home_advantage
+        for match_id, date, home_id, away_id, home_goal, away_goal in rows:
+            home_rating = ratings[home_id]
+            away_rating = ratings[away_id]
+            expected = 1.0 / (1.0 + 10.0 ** ((away_rating - home_rating - home_advantage) / 400.0))
+            score = 1.0 if home_goal > away_goal else 0.5 if home_goal == away_goal else 0.0
+            delta = k * goal_multiplier(abs(home_goal - away_goal)) * (score - expected)
+            ratings[home_id] = home_rating + delta
+            ratings[away_id] = away_rating - delta
+
+            self.match_ids.append(match_id)
+            self.dates.append(date)
+            self.home_ids.append(home_id)
+            self.away_ids.append(away_id)
+            self.home_before.append(home_rating)
+            self.away_before.append(away_rating)
+            self.home_after.append(home_rating + delta)
+            self.away_after.append(away_rating - delta)
+        self.ratings = np.array(ratings, dtype=np.float64)
+        self._team_index = None
+
+    # ------------------------------------------------------------------
+    # Consultation
+    # ------------------------------------------------------------------
+    def rating(self, team_api_id: int) -> float:
+        """Note courante d'une équipe (note initiale si elle n'a jamais joué)"""
+        if team_api_id < len(self.ratings):
+            return float(self.ratings[team_api_id])
+        return self.initial
+
+    def _build_team_index(self):
+        index: Dict[int, List[int]] = {}
+        dates: Dict[int, List[str]] = {}
+        for i, (date, home_id, away_id) in enumerate(zip(self.dates, self.home_ids, self.away_ids)):
+            for team_id in (home_id, away_id):
+                index.setdefault(team_id, []).append(i)
+                dates.setdefault(team_id, []).append(date)
+        self._team_index = index
+        self._team_dates = dates
+
+    def team_entries(self, team_api_id: int) -> List[int]:
+        """Indices (chronologiques) des entrées d'historique d'une équipe"""
+        if self._team_index is None:
+            self._build_team_index()
+        return self._team_index.get(team_api_id, [])
+
+    def team_dates(self, team_api_id: int) -> List[str]:
+        """Dates des entrées d'historique d'une équipe (alignées sur team_entries)"""
+        if self._team_index is None:
+            self._build_team_index()
+        return self._team_dates.get(team_api_id, [])
+
+    def rating_after(self, entry: int, team_api_id: int) -> float:
+        return self.home_after[entry] if self.home_ids[entry] == team_api_id else self.away_after[entry]
+
+    def rating_as_of(self, team_api_id: int, value) -> float:
+        """Note d'une équipe après tous ses matchs joués jusqu'à une date (incluse)"""
+        entries = self.team_entries(team_api_id)
+        position = bisect_right(self.team_dates(team_api_id), normalize_date(value))
+        if position == 0:
+            return self.initial
+        return self.rating_after(entries[position - 1], team_api_id)
+
+    def team_history(self, team_api_id: int, match_ids: Optional[Iterable[int]] = None) -> List[Dict]:
+        """Historique d'une équipe (éventuellement limité à certains matchs)"""
+        selected = set(match_ids) if match_ids is not None else None
+        history = []
+        for i in self.team_entries(team_api_id):
+            if selected is not None and self.match_ids[i] not in selected:
+                continue
+            home = self.home_ids[i] == team_api_id
+            history.append({
+                'match_id': self.match_ids[i],
+                'date': self.dates[i],
+                'opponent_api_id': self.away_ids[i] if home else self.home_ids[i],
+                'home': home,
+                'rating_before': self.home_before[i] if home else self.away_before[i],
+                'rating_after': self.home_after[i] if home else self.away_after[i],
+            })
+        return history
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def save(self, path: str):
+        """Enregistre l'état et l'historique (écriture atomique)"""
+        # Fichier temporaire propre au processus (générations parallèles)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path,
+                 params=np.array(self.params),
+                 checksum=np.array(self.checksum, dtype=np.uint64),
+                 source=np.array(self.source),
+                 ratings=self.ratings,
+                 match_ids=np.frombuffer(self.match_ids, dtype=np.int64),
+                 dates=np.array(self.dates, dtype='U19'),
+                 home_ids=np.frombuffer(self.home_ids, dtype=np.int64),
+                 away_ids=np.frombuffer(self.away_ids, dtype=np.int64),
+                 home_before=np.frombuffer(self.home_before, dtype=np.float64),
+                 away_before=np.frombuffer(self.away_before, dtype=np.float64),
+                 home_after=np.frombuffer(self.home_after, dtype=np.float64),
+                 away_after=np.frombuffer(self.away_after, dtype=np.float64))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'EloRatings':
+        with np.load(path) as data:
+            k, home_advantage, initial = data['params'].tolist()
+            elo = cls(k, home_advantage, initial)
+            elo.ratings = data['ratings']
+            elo.checksum = int(data['checksum'])
+            elo.source = str(data['source'])
+            elo.match_ids = array('q', data['match_ids'].tobytes())
+            elo.dates = data['dates'].tolist()
+            for name in ('home_ids', 'away_ids'):
+                setattr(elo, name, array('q', data[name].tobytes()))
+            for name in ('home_before', 'away_before', 'home_after', 'away_after'):
+                setattr(elo, name, array('d', data[name].tobytes()))
+        return elo
+
+
+def load_ratings(data_access: SQLiteDataAccess, cache_path: Optional[str] = None,
+                 k: float = DEFAULT_K, home_advantage: float = DEFAULT_HOME_ADVANTAGE,
+                 initial: float = DEFAULT_INITIAL) -> EloRatings:
+    """
+    Notes Elo de tout l'historique, depuis le cache si possible
+
+    Le cache est réutilisé tel quel si ses paramètres sont identiques et si la
+    base n'a pas changé (taille, date). Si elle a changé, les matchs déjà
+    traités sont relus : à somme de contrôle identique, seuls les matchs
+    postérieurs sont appliqués ; sinon tout est recalculé.
+    """
+    source = source_fingerprint(data_access.db_path)
+    elo = None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            elo = EloRatings.load(cache_path)
+        except (OSError, ValueError, KeyError):
+            elo = None
+        if elo is not None and elo.params != (k, home_advantage, initial):
+            elo = None
+        if elo is not None and elo.source == source:
+            return elo
+        if elo is not None:
+            date, match_id = elo.watermark
+            if rows_checksum(data_access.iter_query(PROCESSED_QUERY, (date, date, match_id))) != elo.checksum:
+                elo = None
+    if elo is None:
+        elo = EloRatings(k, home_advantage, initial)
+
+    date, match_id = elo.watermark
+    elo.update(tuple(row) for row in data_access.iter_query(HISTORY_QUERY, (date, date, match_id)))
+
+    if cache_path and elo.source != source:
+        elo.source = source
+        try:
+            elo.save(cache_path)
+        except OSError:
+            pass  # Cache en lecture seule : le résultat reste utilisable
+    return elo
+
+
+def season_summary(elo: EloRatings, matches: Sequence[Dict], standings: List[Dict]) -> List[Dict]:
+    """
+    Évolution Elo de chaque équipe pendant une saison (dans l'ordre du classement)
+
+    Returns:
+        Par équipe : note avant le premier match, après le dernier, évolution,
+        note maximale et historique match par match de la saison
+    """
+    names = {}
+    for match in matches:
+        names[match['home_team_api_id']] = match['home_team']
+        names[match['away_team_api_id']] = match['away_team']
+    match_ids = [match['id'] for match in matches]
+    summary = []
+    for team in standings:
+        history = elo.team_history(team['team_api_id'], match_ids)
+        for entry in history:
+            entry['opponent'] = names.get(entry['opponent_api_id'], entry['opponent_api_id'])
+        start = history[0]['rating_before'] if history else elo.initial
+        end = history[-1]['rating_after'] if history else start
+        summary.append({
+            'team': team['team'],
+            'team_api_id': team['team_api_id'],
+            'start': start,
+            'end': end,
+            'change': end - start,
+            'peak': max([start] + [entry['rating_after'] for entry in history]),
+            'history': history,
+        })
+    return summary
+
+
+def default_cache_path(db_path: str) -> str:
+    """Cache Elo placé à côté de la base"""
+    return db_path + '.elo.npz'
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Classement Elo sur tout l'historique des matchs")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--cache", default=None, help="Fichier cache (par défaut : <db>.elo.npz)")
+    parser.add_argument("--top", type=int, default=20, help="Nombre d'équipes affichées")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    cache_path = args.cache or default_cache_path(args.db)
+
+    start = time.perf_counter()
+    full = load_ratings(data_access)
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    cached = load_ratings(data_access, cache_path)
+    cached_time = time.perf_counter() - start
+    if not np.array_equal(full.ratings, cached.ratings):
+        print(f"Erreur : les notes chargées depuis {cache_path} diffèrent du calcul complet.")
+        print("Supprimez le fichier cache pour le reconstruire.")
+        data_access.close()
+        return
+
+    print("=" * 60)
+    print("CLASSEMENT ELO - TOUS LES MATCHS")
+    print("=" * 60)
+    print(f"\n✓ {len(full)} matchs traités en {full_time * 1000:.0f} ms (calcul complet)")
+    print(f"✓ Chargement depuis le cache et mise à jour : {cached_time * 1000:.0f} ms ({cache_path})")
+
+    names = {row['team_api_id']: row['team_long_name']
+             for row in data_access.iter_query("SELECT team_api_id, team_long_name FROM Team")}
+    played = {team_id for ids in (full.home_ids, full.away_ids) for team_id in ids}
+    best = sorted(played, key=lambda team_id: -full.rating(team_id))[:args.top]
+    print(f"\n{'Équipe':<32} {'Elo':>7}")
+    for team_id in best:
+        print(f"{names.get(team_id, team_id):<32} {full.rating(team_id):>7.1f}")
+    data_access.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,73 @@ Auteur: T. E. G. - Web Sémantique
 Usage: python generate_html_pages.py
 """
 
-import sqlite3
 import os
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import site_assets
+from betting_odds import season_odds
+from calendar_writer import SPLITS, CalendarSlice, calendar_chunks, split_calendar, write_chunks
+from db_access import SQLiteDataAccess
+from elo_ratings import EloRatings, default_cache_path, load_ratings, season_summary
+from head_to_head import HeadToHead
+from match_events import MINUTE_BUCKETS, MatchEvents
+from match_table import MatchTable
+from page_manifest import PageManifest, file_hash, fingerprint
+from player_appearances import PlayerAppearances
+from player_similarity import PlayerSimilarity
+from render_scheduler import STREAMED_KINDS, PageRenderScheduler, PageTask, page_chunks, page_inputs
+from season_kernel import season_standings_and_statistics
+from site_assets import AssetManifest, inline_style_block, stylesheet_link, write_stylesheet
+from site_bundle import SiteBundleWriter, is_bundle
+from sql_engine import SQLSeasonEngine
+from standings_history import StandingsHistory
+from streaks import season_streaks
+from strength_model import fit_strengths
+from team_attributes import NUMERIC_ATTRIBUTES, TeamAttributes, team_timeline
+from team_styles import TeamStyles
+
+# Modules dont dépend le rendu des pages (générateur, ordonnancement, feuille de style,
+# calendrier, archive, calculs et caches) : toute modification de l'un d'eux invalide les
+# pages générées. Les scripts annexes (benchmarks, serveurs, génération en lot) n'en font pas partie.
+RENDER_MODULES = ('generate_html_pages', 'render_scheduler', 'site_assets', 'calendar_writer', 'site_bundle',
+                  'page_manifest', 'db_access', 'match_table', 'season_kernel', 'sql_engine', 'standings_history',
+                  'head_to_head', 'elo_ratings', 'strength_model', 'streaks', 'player_appearances',
+                  'player_similarity', 'match_events', 'betting_odds', 'team_attributes', 'team_styles')
+
+# Version du code de rendu
+CODE_VERSION = fingerprint(*(file_hash(os.path.join(os.path.dirname(os.path.abspath(__file__)), f'{name}.py'))
+                             for name in RENDER_MODULES))
+
+# Nombre de buteurs affichés sur la page de statistiques
+TOP_SCORERS = 10
+
+# Attributs tactiques affichés dans la chronologie des pages d'équipes
+TIMELINE_ATTRIBUTES = ('buildUpPlaySpeed', 'buildUpPlayPassing', 'chanceCreationShooting', 'defencePressure',
+                       'defenceAggression', 'defenceTeamWidth')
+
+
+# Sections d'analyse facultatives : chacune lit des tables ou des caches supplémentaires
+# de la base et peut être désactivée (les pages concernées sont alors générées sans elle)
+#   elo        : page elo.html (notes Elo calculées sur tout l'historique de la table Match)
+#   players    : effectifs des équipes et pages des joueurs (Player, Player_Attributes, compositions)
+#   similarity : joueurs similaires sur les pages des joueurs (index memmap ; nécessite players)
+#   events     : buteurs, minutes des buts et cartons (analyse du XML de la table Match)
+#   odds       : analyse des cotes des bookmakers (colonnes de cotes de la table Match)
+#   tactics    : chronologie tactique des équipes (Team_Attributes rattachés à chaque match)
+#   styles     : styles de jeu des équipes (k-moyennes sur les Team_Attributes de toutes les saisons)
+SECTIONS = ('elo', 'players', 'similarity', 'events', 'odds', 'tactics', 'styles')
+
 
 class HTMLPageGenerator:
     """Générateur de pages HTML statiques à partir de la base de données SQLite"""
     
-    def __init__(self, db_path: str, championship: str, season: str, output_dir: str, num_teams: int = 6):
+    def __init__(self, db_path: str, championship: str, season: str, output_dir: str, num_teams: int = 6,
+                 read_only: bool = False, render_workers: int = 1, render_executor: str = 'thread',
+                 incremental: bool = True, engine: str = 'python',
+                 data_access: Optional[SQLiteDataAccess] = None, calendar_split: Optional[str] = None,
+                 inline_styles: bool = False, precompress: bool = True, verbose: bool = True,
+                 sections: Optional[Iterable[str]] = None):
         """
         Initialise le générateur
         
@@ -21,37 +79,79 @@ class HTMLPageGenerator:
             db_path: Chemin vers database.sqlite
             championship: Nom du championnat (ex: "England Premier League")
             season: Saison (ex: "2008/2009")
-            output_dir: Dossier de sortie pour les pages HTML
+            output_dir: Dossier de sortie pour les pages HTML (ou archive .zip : site en un seul fichier)
             num_teams: Nombre d'équipes à générer (par défaut: 6)
+            read_only: Ouvre la base en lecture seule (utile en génération parallèle)
+            render_workers: Nombre de threads/processus pour le rendu des pages (1 = séquentiel)
+            render_executor: 'thread' ou 'process'
+            incremental: Ne réécrit que les pages dont les entrées ont changé (manifeste)
+            engine: 'python' (noyau vectorisé) ou 'sql' (agrégations exécutées par SQLite ; les index
+                    couvrants se créent à part : python sql_engine.py --db database.sqlite)
+            data_access: Couche d'accès partagée (connexion réutilisée entre générateurs)
+            calendar_split: Découpe le calendrier en pages par mois ('month') ou par journée ('stage')
+            inline_styles: Intègre la feuille de style dans chaque page au lieu d'une feuille partagée
+            precompress: Écrit une variante .gz de chaque fichier et le manifeste assets.json
+            verbose: Affiche la progression sur la sortie standard (False : génération silencieuse)
+            sections: Sections d'analyse activées (voir SECTIONS ; None : toutes, () : aucune)
         """
+        if calendar_split is not None and calendar_split not in SPLITS:
+            raise ValueError(f"Découpage inconnu : {calendar_split} (attendu : {', '.join(SPLITS)})")
+        sections = SECTIONS if sections is None else tuple(sections)
+        unknown = [section for section in sections if section not in SECTIONS]
+        if unknown:
+            raise ValueError(f"Section inconnue : {', '.join(unknown)} (attendu : {', '.join(SECTIONS)})")
         self.db_path = db_path
         self.championship = championship
         self.season = season
         self.output_dir = output_dir
+        self.bundle = is_bundle(output_dir)
         self.num_teams = num_teams
+        self.read_only = read_only
+        self.scheduler = PageRenderScheduler(render_workers, render_executor)
+        self.incremental = incremental
+        self.engine = engine
+        self.db = data_access
+        self.owns_db = data_access is None
+        self.calendar_split = calendar_split
+        self.inline_styles = inline_styles
+        self.precompress = precompress
+        self.verbose = verbose
+        self.sections = frozenset(sections)
         self.conn = None
+    
+    def __getstate__(self):
+        # La connexion SQLite n'est pas transmise aux processus de rendu
+        state = self.__dict__.copy()
+        state['conn'] = None
+        return state
         
+    def log(self, *args):
+        """Affiche un message de progression (sauf en mode silencieux)"""
+        if self.verbose:
+            print(*args)
+
     def connect_db(self):
         """Établit la connexion à la base de données"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        print(f"✓ Connexion établie à {self.db_path}")
+        if self.owns_db:
+            self.db = SQLiteDataAccess(self.db_path, read_only=self.read_only)
+        self.conn = self.db.connection
+        self.log(f"✓ Connexion établie à {self.db_path}")
         
     def close_db(self):
-        """Ferme la connexion à la base de données"""
+        """Ferme la connexion à la base de données (une connexion partagée reste ouverte)"""
         if self.conn:
-            self.conn.close()
-            print("✓ Connexion fermée")
+            if self.owns_db:
+                self.db.close()
+                self.log("✓ Connexion fermée")
+            self.conn = None
     
     def create_output_directory(self):
         """Crée le dossier de sortie s'il n'existe pas"""
         os.makedirs(self.output_dir, exist_ok=True)
-        print(f"✓ Dossier de sortie créé/vérifié : {self.output_dir}")
+        self.log(f"✓ Dossier de sortie créé/vérifié : {self.output_dir}")
     
     def get_league_and_country_ids(self) -> Tuple[int, int]:
         """Récupère les IDs de la ligue et du pays"""
-        cursor = self.conn.cursor()
-        
         # Trouver le pays et la ligue
         query = """
         SELECT DISTINCT l.id as league_id, c.id as country_id, l.name as league_name, c.name as country_name
@@ -60,24 +160,22 @@ class HTMLPageGenerator:
         WHERE l.name = ?
         """
         
-        cursor.execute(query, (self.championship,))
-        result = cursor.fetchone()
+        result = self.db.query_one(query, (self.championship,))
         
         if not result:
             raise ValueError(f"Championnat '{self.championship}' non trouvé dans la base de données")
         
-        print(f"✓ Championnat trouvé : {result['league_name']} ({result['country_name']})")
+        self.log(f"✓ Championnat trouvé : {result['league_name']} ({result['country_name']})")
         return result['league_id'], result['country_id']
     
-    def get_matches(self, league_id: int) -> List[Dict]:
-        """Récupère tous les matchs du championnat pour la saison donnée"""
-        cursor = self.conn.cursor()
-        
+    def get_matches(self, league_id: int) -> MatchTable:
+        """Récupère tous les matchs du championnat pour la saison donnée (table en colonnes, indexée par équipe)"""
         query = """
         SELECT 
             m.id,
             m.date,
             m.season,
+            m.stage,
             ht.team_long_name as home_team,
             ht.team_short_name as home_team_short,
             at.team_long_name as away_team,
@@ -93,9 +191,9 @@ class HTMLPageGenerator:
         ORDER BY m.date
         """
         
-        cursor.execute(query, (league_id, self.season))
-        matches = [dict(row) for row in cursor.fetchall()]
-        print(f"✓ {len(matches)} matchs récupérés pour la saison {self.season}")
+        # Lecture en flux par paquets : aucune liste complète de lignes n'est matérialisée
+        matches = MatchTable(self.db.iter_query(query, (league_id, self.season)))
+        self.log(f"✓ {len(matches)} matchs récupérés pour la saison {self.season}")
         return matches
     
     def calculate_standings(self, matches: List[Dict]) -> List[Dict]:
@@ -113,6 +211,7 @@ class HTMLPageGenerator:
                 if team not in standings:
                     standings[team] = {
                         'team': team,
+                        'team_api_id': match['home_team_api_id'] if team == home_team else match['away_team_api_id'],
                         'played': 0,
                         'won': 0,
                         'drawn': 0,
@@ -166,30 +265,29 @@ class HTMLPageGenerator:
         """Retourne les noms des n meilleures équipes selon num_teams configuré"""
         return [team['team'] for team in standings[:self.num_teams]]
     
-    def get_team_matches(self, matches: List[Dict], team_name: str) -> List[Dict]:
-        """Récupère tous les matchs d'une équipe"""
-        team_matches = []
-        for match in matches:
-            if match['home_team'] == team_name or match['away_team'] == team_name:
-                team_matches.append(match)
-        return team_matches
+    def get_team_matches(self, matches: MatchTable, team_name: str) -> List[Dict]:
+        """Récupère tous les matchs d'une équipe (lecture directe dans l'index)"""
+        team_api_id = matches.team_api_id(team_name)
+        if team_api_id is None:
+            return []
+        return matches.team_matches(team_api_id)
     
-    def calculate_statistics(self, matches: List[Dict]) -> Dict:
+    def calculate_statistics(self, matches: MatchTable) -> Dict:
         """Calcule les statistiques générales de la saison"""
         total_goals = sum(m['home_team_goal'] + m['away_team_goal'] for m in matches)
         
-        # Équipe avec le plus de buts marqués
+        # Équipe avec le plus de buts marqués (via les index domicile/extérieur)
         goals_scored = {}
         goals_conceded = {}
         
-        for match in matches:
-            home = match['home_team']
-            away = match['away_team']
+        for team_name, team_api_id in matches.team_ids.items():
+            home = matches.home_matches(team_api_id)
+            away = matches.away_matches(team_api_id)
             
-            goals_scored[home] = goals_scored.get(home, 0) + match['home_team_goal']
-            goals_scored[away] = goals_scored.get(away, 0) + match['away_team_goal']
-            goals_conceded[home] = goals_conceded.get(home, 0) + match['away_team_goal']
-            goals_conceded[away] = goals_conceded.get(away, 0) + match['home_team_goal']
+            goals_scored[team_name] = (sum(m['home_team_goal'] for m in home)
+                                       + sum(m['away_team_goal'] for m in away))
+            goals_conceded[team_name] = (sum(m['away_team_goal'] for m in home)
+                                         + sum(m['home_team_goal'] for m in away))
         
         top_scorer_team = max(goals_scored.items(), key=lambda x: x[1])
         top_conceded_team = max(goals_conceded.items(), key=lambda x: x[1])
@@ -210,6 +308,31 @@ class HTMLPageGenerator:
             'highest_scoring': highest_scoring
         }
     
+    def calculate_season(self, matches: List[Dict]) -> Tuple[List[Dict], Dict]:
+        """
+        Calcule classement et statistiques en un seul passage vectorisé
+
+        Résultat identique à (calculate_standings(matches), calculate_statistics(matches)).
+        """
+        return season_standings_and_statistics(matches)
+    
+    def team_filename(self, team_name: str) -> str:
+        """Nom du fichier HTML de la page d'une équipe"""
+        return f"equipe_{team_name.replace(' ', '_')}.html"
+    
+    def player_filename(self, player_api_id: int) -> str:
+        """Nom du fichier HTML de la page d'un joueur"""
+        return f"joueur_{player_api_id}.html"
+    
+    def write_page(self, filename: str, html: str):
+        """Écrit une page HTML dans le dossier de sortie"""
+        with open(os.path.join(self.output_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+    
+    def style_block(self) -> str:
+        """Feuille de style de la page : lien vers la feuille partagée ou bloc intégré"""
+        return inline_style_block() if self.inline_styles else stylesheet_link()
+    
     def generate_html_header(self, title: str) -> str:
         """Génère l'en-tête HTML commun"""
         return f"""<!DOCTYPE html>
@@ -218,80 +341,7 @@ class HTMLPageGenerator:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title}</title>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        h1 {{
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        h2 {{
-            color: #34495e;
-            margin-top: 30px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            background-color: white;
-            margin: 20px 0;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-        th {{
-            background-color: #3498db;
-            color: white;
-            font-weight: bold;
-        }}
-        tr:hover {{
-            background-color: #f5f5f5;
-        }}
-        .nav {{
-            background-color: #34495e;
-            padding: 15px;
-            margin-bottom: 20px;
-            border-radius: 5px;
-        }}
-        .nav a {{
-            color: white;
-            text-decoration: none;
-            padding: 10px 15px;
-            margin-right: 10px;
-            display: inline-block;
-        }}
-        .nav a:hover {{
-            background-color: #2c3e50;
-            border-radius: 3px;
-        }}
-        .stat-box {{
-            background-color: white;
-            padding: 20px;
-            margin: 10px 0;
-            border-radius: 5px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .match-result {{
-            padding: 10px;
-            margin: 5px 0;
-            background-color: white;
-            border-left: 4px solid #3498db;
-        }}
-        .score {{
-            font-weight: bold;
-            font-size: 1.2em;
-            color: #e74c3c;
-        }}
-    </style>
-</head>
+{self.style_block()}</head>
 <body>
     <div class="nav">
         <a href="index.html">Accueil</a>
@@ -310,8 +360,8 @@ class HTMLPageGenerator:
 </body>
 </html>"""
     
-    def generate_index_page(self, standings: List[Dict], stats: Dict, top_teams: List[str]):
-        """Génère la page d'accueil (index.html)"""
+    def render_index_page(self, standings: List[Dict], stats: Dict, top_teams: List[str]) -> str:
+        """Construit le HTML de la page d'accueil (index.html)"""
         html = self.generate_html_header(f"{self.championship} - Saison {self.season}")
         
         html += f"""
@@ -360,7 +410,13 @@ class HTMLPageGenerator:
     <h3>Pages disponibles</h3>
     <ul>
         <li><a href="classement.html">Classement complet</a></li>
-        <li><a href="calendrier.html">Calendrier de tous les matchs</a></li>
+        <li><a href="journees.html">Classement journée par journée</a></li>
+        <li><a href="confrontations.html">Confrontations directes</a></li>
+"""
+        if 'elo' in self.sections:
+            html += """        <li><a href="elo.html">Évolution du classement Elo</a></li>
+"""
+        html += """        <li><a href="calendrier.html">Calendrier de tous les matchs</a></li>
         <li><a href="statistiques.html">Statistiques détaillées</a></li>
 """
         
@@ -372,13 +428,15 @@ class HTMLPageGenerator:
         html += "    </ul>\n"
         html += self.generate_html_footer()
         
-        with open(os.path.join(self.output_dir, 'index.html'), 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print("✓ Page générée : index.html")
+        return html
     
-    def generate_standings_page(self, standings: List[Dict]):
-        """Génère la page de classement (classement.html)"""
+    def generate_index_page(self, standings: List[Dict], stats: Dict, top_teams: List[str]):
+        """Génère la page d'accueil (index.html)"""
+        self.write_page('index.html', self.render_index_page(standings, stats, top_teams))
+        self.log("✓ Page générée : index.html")
+    
+    def render_standings_page(self, standings: List[Dict]) -> str:
+        """Construit le HTML de la page de classement (classement.html)"""
         html = self.generate_html_header(f"Classement - {self.championship} {self.season}")
         
         html += f"""
@@ -419,51 +477,80 @@ class HTMLPageGenerator:
         html += "    </table>\n"
         html += self.generate_html_footer()
         
-        with open(os.path.join(self.output_dir, 'classement.html'), 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print("✓ Page générée : classement.html")
+        return html
+    
+    def generate_standings_page(self, standings: List[Dict]):
+        """Génère la page de classement (classement.html)"""
+        self.write_page('classement.html', self.render_standings_page(standings))
+        self.log("✓ Page générée : classement.html")
+    
+    def calendar_heading(self, label: Optional[str] = None) -> str:
+        """Titres de la page de calendrier (saison complète ou tranche)"""
+        if label is None:
+            return f"""
+    <h1>Calendrier des matchs</h1>
+    <h2>{self.championship} - Saison {self.season}</h2>
+    """
+        return f"""
+    <h1>Calendrier des matchs</h1>
+    <h2>{self.championship} - Saison {self.season} - {label}</h2>
+    <p><a href="calendrier.html">Retour au calendrier de la saison</a></p>
+    """
+    
+    def calendar_chunks(self, matches: Iterable[Dict], label: Optional[str] = None):
+        """Morceaux HTML d'une page de calendrier (voir calendar_writer.calendar_chunks)"""
+        title = f"Calendrier - {self.championship} {self.season}"
+        if label is not None:
+            title += f" - {label}"
+        return calendar_chunks(self.generate_html_header(title), self.calendar_heading(label),
+                               matches, self.generate_html_footer())
+    
+    def render_calendar_page(self, matches: List[Dict], label: Optional[str] = None) -> str:
+        """Construit le HTML de la page de calendrier (calendrier.html)"""
+        return ''.join(self.calendar_chunks(matches, label))
+    
+    def write_calendar_page(self, filename: str, matches: Iterable[Dict], label: Optional[str] = None):
+        """Écrit une page de calendrier en flux, par paquets de lignes"""
+        write_chunks(os.path.join(self.output_dir, filename), self.calendar_chunks(matches, label))
     
     def generate_calendar_page(self, matches: List[Dict]):
-        """Génère la page de calendrier (calendrier.html)"""
+        """Génère la page de calendrier (calendrier.html), en flux"""
+        self.write_calendar_page('calendrier.html', matches)
+        self.log("✓ Page générée : calendrier.html")
+    
+    def render_calendar_index_page(self, slices: List[CalendarSlice]) -> str:
+        """Construit le HTML de l'index du calendrier découpé (calendrier.html)"""
+        period = "mois" if self.calendar_split == 'month' else "journée"
         html = self.generate_html_header(f"Calendrier - {self.championship} {self.season}")
         
         html += f"""
-    <h1>Calendrier des matchs</h1>
+    <h1>Calendrier par {period}</h1>
     <h2>{self.championship} - Saison {self.season}</h2>
     
     <table>
         <tr>
-            <th>Date</th>
-            <th>Équipe domicile</th>
-            <th>Score</th>
-            <th>Équipe extérieure</th>
+            <th>Période</th>
+            <th>Matchs</th>
         </tr>
 """
         
-        for match in matches:
-            date_obj = datetime.strptime(match['date'], '%Y-%m-%d %H:%M:%S')
-            date_formatted = date_obj.strftime('%d/%m/%Y')
-            
+        for calendar_slice in slices:
             html += f"""
         <tr>
-            <td>{date_formatted}</td>
-            <td>{match['home_team']}</td>
-            <td class="score">{match['home_team_goal']} - {match['away_team_goal']}</td>
-            <td>{match['away_team']}</td>
+            <td><a href="{calendar_slice.filename}">{calendar_slice.label}</a></td>
+            <td>{len(calendar_slice.matches)}</td>
         </tr>
 """
         
         html += "    </table>\n"
         html += self.generate_html_footer()
         
-        with open(os.path.join(self.output_dir, 'calendrier.html'), 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print("✓ Page générée : calendrier.html")
+        return html
     
-    def generate_statistics_page(self, stats: Dict):
-        """Génère la page de statistiques (statistiques.html)"""
+    def render_statistics_page(self, stats: Dict, strengths: Optional[Dict] = None,
+                               streaks: Optional[Dict[int, Dict]] = None, events: Optional[Dict] = None,
+                               odds: Optional[Dict] = None) -> str:
+        """Construit le HTML de la page de statistiques (statistiques.html)"""
         html = self.generate_html_header(f"Statistiques - {self.championship} {self.season}")
         
         html += f"""
@@ -504,17 +591,374 @@ class HTMLPageGenerator:
     </div>
 """
         
+        if streaks:
+            html += self.render_streaks_section(streaks)
+        
+        if events:
+            html += self.render_events_section(events)
+        
+        if odds:
+            html += self.render_odds_section(odds)
+        
+        if strengths:
+            html += self.render_strengths_section(strengths)
+        
         html += self.generate_html_footer()
         
-        with open(os.path.join(self.output_dir, 'statistiques.html'), 'w', encoding='utf-8') as f:
-            f.write(html)
+        return html
+    
+    def render_streaks_section(self, streaks: Dict[int, Dict]) -> str:
+        """Section des séries de la saison : records et tableau par équipe"""
+        records = {key: max(streaks.values(), key=lambda team: team[key])
+                   for key in ('longest_win', 'longest_unbeaten', 'longest_scoreless')}
+        html = f"""
+    <div class="stat-box">
+        <h3>Plus longues séries</h3>
+        <p><strong>De victoires :</strong> {records['longest_win']['longest_win']} match{'s' if records['longest_win']['longest_win'] > 1 else ''} ({records['longest_win']['team']})</p>
+        <p><strong>Sans défaite :</strong> {records['longest_unbeaten']['longest_unbeaten']} match{'s' if records['longest_unbeaten']['longest_unbeaten'] > 1 else ''} ({records['longest_unbeaten']['team']})</p>
+        <p><strong>Sans marquer :</strong> {records['longest_scoreless']['longest_scoreless']} match{'s' if records['longest_scoreless']['longest_scoreless'] > 1 else ''} ({records['longest_scoreless']['team']})</p>
+    </div>
+    
+    <table>
+        <tr>
+            <th>Équipe</th>
+            <th>Série de victoires</th>
+            <th>Série sans défaite</th>
+            <th>Série sans marquer</th>
+            <th>Série en cours</th>
+            <th>Forme</th>
+        </tr>
+"""
+        for team in streaks.values():
+            html += f"""
+        <tr>
+            <td>{team['team']}</td>
+            <td>{team['longest_win']}</td>
+            <td>{team['longest_unbeaten']}</td>
+            <td>{team['longest_scoreless']}</td>
+            <td>{team['current']}</td>
+            <td>{team['form']}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        return html
+    
+    def render_goal_minutes(self, minutes: List[int]) -> str:
+        """Tableau des buts par tranche de 15 minutes"""
+        html = """
+    <table>
+        <tr>
+"""
+        for bucket in MINUTE_BUCKETS:
+            html += f"            <th>{bucket}'</th>\n"
+        html += """        </tr>
+        <tr>
+"""
+        for goals in minutes:
+            html += f"            <td>{goals}</td>\n"
+        html += """        </tr>
+    </table>
+"""
+        return html
+    
+    def render_events_section(self, events: Dict) -> str:
+        """Sections issues des événements de match : buteurs, minutes des buts, cartons"""
+        html = """
+    <h3>Meilleurs buteurs</h3>
+    <table>
+        <tr>
+            <th>Rang</th>
+            <th>Joueur</th>
+            <th>Équipe</th>
+            <th>Buts</th>
+        </tr>
+"""
+        for rank, scorer in enumerate(events['scorers'], 1):
+            html += f"""
+        <tr>
+            <td>{rank}</td>
+            <td>{scorer['player_name']}</td>
+            <td>{scorer['team']}</td>
+            <td>{scorer['goals']}</td>
+        </tr>
+"""
+        html += """    </table>
+    
+    <h3>Buts par tranche de 15 minutes</h3>
+"""
+        html += self.render_goal_minutes(events['minutes'])
+        html += """
+    <h3>Cartons</h3>
+    <table>
+        <tr>
+            <th>Équipe</th>
+            <th>Cartons jaunes</th>
+            <th>Cartons rouges</th>
+        </tr>
+"""
+        for team in events['teams'].values():
+            html += f"""
+        <tr>
+            <td>{team['team']}</td>
+            <td>{team['yellow']}</td>
+            <td>{team['red']}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        return html
+    
+    def render_odds_section(self, odds: Dict) -> str:
+        """Section des cotes des bookmakers : favoris, marges et points attendus par équipe"""
+        summary = odds['summary']
+        decided = max(summary['favourite_won'] + summary['draws'] + summary['underdog_won'], 1)
+        html = f"""
+    <div class="stat-box">
+        <h3>Cotes des bookmakers</h3>
+        <p><strong>Matchs cotés :</strong> {summary['matches']}</p>
+        <p><strong>Marge moyenne des bookmakers :</strong> {summary['overround'] * 100:.1f} %</p>
+        <p><strong>Favori vainqueur :</strong> {summary['favourite_won']} ({summary['favourite_won'] / decided * 100:.0f} %)</p>
+        <p><strong>Match nul :</strong> {summary['draws']} ({summary['draws'] / decided * 100:.0f} %)</p>
+        <p><strong>Outsider vainqueur :</strong> {summary['underdog_won']} ({summary['underdog_won'] / decided * 100:.0f} %)</p>
+    </div>
+    
+    <table>
+        <tr>
+            <th>Bookmaker</th>
+            <th>Matchs cotés</th>
+            <th>Marge moyenne</th>
+        </tr>
+"""
+        for bookmaker in summary['bookmakers']:
+            html += f"""
+        <tr>
+            <td>{bookmaker['bookmaker']}</td>
+            <td>{bookmaker['matches']}</td>
+            <td>{bookmaker['overround'] * 100:.1f} %</td>
+        </tr>
+"""
+        html += """    </table>
+    
+    <p>Points attendus : 3 × probabilité de victoire + probabilité de nul, d'après la moyenne des cotes sans marge.</p>
+    <table>
+        <tr>
+            <th>Équipe</th>
+            <th>Pts</th>
+            <th>Points attendus</th>
+            <th>Écart</th>
+            <th>Gagnés en favori</th>
+            <th>Gagnés en outsider</th>
+        </tr>
+"""
+        for team in odds['teams'].values():
+            html += f"""
+        <tr>
+            <td>{team['team']}</td>
+            <td>{team['points']}</td>
+            <td>{team['expected_points']:.1f}</td>
+            <td>{team['difference']:+.1f}</td>
+            <td>{team['favourite_won']} / {team['favourite_played']}</td>
+            <td>{team['underdog_won']} / {team['underdog_played']}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        return html
+    
+    def render_strengths_section(self, strengths: Dict) -> str:
+        """Section des forces attaque/défense ajustées (modèle de Poisson, Dixon-Coles)"""
+        html = f"""
+    <div class="stat-box">
+        <h3>Modèle de forces (Poisson, Dixon-Coles)</h3>
+        <p><strong>Buts attendus entre deux équipes moyennes :</strong> {strengths['home_goals_rate']:.2f} - {strengths['away_goals_rate']:.2f}</p>
+        <p><strong>Avantage du terrain :</strong> × {strengths['home_advantage']:.2f}</p>
+        <p><strong>Dépendance des scores faibles (rho) :</strong> {strengths['rho']:+.3f}</p>
+    </div>
+    
+    <p>Attaque : multiplicateur des buts marqués ; défense : multiplicateur des buts encaissés (plus petit = meilleur).</p>
+    <table>
+        <tr>
+            <th>Rang</th>
+            <th>Équipe</th>
+            <th>Attaque</th>
+            <th>Défense</th>
+            <th>Force</th>
+        </tr>
+"""
+        for rank, team in enumerate(strengths['teams'], 1):
+            html += f"""
+        <tr>
+            <td>{rank}</td>
+            <td>{team['team']}</td>
+            <td>{team['attack']:.2f}</td>
+            <td>{team['defence']:.2f}</td>
+            <td><strong>{team['rating']:+.2f}</strong></td>
+        </tr>
+"""
+        html += "    </table>\n"
+        return html
+    
+    def generate_statistics_page(self, stats: Dict, strengths: Optional[Dict] = None,
+                                 streaks: Optional[Dict[int, Dict]] = None, events: Optional[Dict] = None,
+                                 odds: Optional[Dict] = None):
+        """Génère la page de statistiques (statistiques.html)"""
+        self.write_page('statistiques.html', self.render_statistics_page(stats, strengths, streaks, events, odds))
+        self.log("✓ Page générée : statistiques.html")
+    
+    def render_matchday_standings_page(self, history: StandingsHistory) -> str:
+        """Construit le HTML du classement journée par journée (journees.html)"""
+        html = self.generate_html_header(f"Classement par journée - {self.championship} {self.season}")
         
-        print("✓ Page générée : statistiques.html")
+        html += f"""
+    <h1>Classement par journée</h1>
+    <h2>{self.championship} - Saison {self.season}</h2>
+"""
+        
+        for snapshot, stage in enumerate(history.snapshots.tolist()):
+            html += f"""
+    <h3>Après la journée {stage}</h3>
+    <table>
+        <tr>
+            <th>Pos</th>
+            <th>Équipe</th>
+            <th>Pts</th>
+            <th>J</th>
+            <th>Diff</th>
+        </tr>
+"""
+            for team in history.standings_at(snapshot):
+                html += f"""
+        <tr>
+            <td>{team['position']}</td>
+            <td>{team['team']}</td>
+            <td><strong>{team['points']}</strong></td>
+            <td>{team['played']}</td>
+            <td>{team['goal_difference']:+d}</td>
+        </tr>
+"""
+            html += "    </table>\n"
+        
+        html += self.generate_html_footer()
+        
+        return html
     
-    def generate_team_page(self, team_name: str, team_matches: List[Dict], standings: List[Dict]):
-        """Génère une page pour une équipe spécifique"""
+    def render_head_to_head_page(self, head_to_head: HeadToHead, standings: List[Dict]) -> str:
+        """Construit le HTML de la matrice des confrontations directes (confrontations.html)"""
+        html = self.generate_html_header(f"Confrontations directes - {self.championship} {self.season}")
+        
+        html += f"""
+    <h1>Confrontations directes</h1>
+    <h2>{self.championship} - Saison {self.season}</h2>
+    <p>Ligne : équipe à domicile ; colonne : équipe à l'extérieur. Équipes dans l'ordre du classement.</p>
+    
+    <table>
+        <tr>
+            <th>Domicile / Extérieur</th>
+"""
+        order = [head_to_head.index(team['team_api_id']) for team in standings]
+        for team in standings:
+            html += f"            <th>{team['team']}</th>\n"
+        html += "        </tr>\n"
+        
+        for team, home_index in zip(standings, order):
+            html += f"""
+        <tr>
+            <td><strong>{team['team']}</strong></td>
+"""
+            for away_index in order:
+                if away_index == home_index:
+                    cell = "-"
+                else:
+                    cell = "<br>".join(f"{match['home_team_goal']} - {match['away_team_goal']}"
+                                       for match in head_to_head.home_results(home_index, away_index))
+                html += f"            <td>{cell}</td>\n"
+            html += "        </tr>\n"
+        
+        html += "    </table>\n"
+        html += self.generate_html_footer()
+        
+        return html
+    
+    def render_elo_page(self, summary: List[Dict]) -> str:
+        """Construit le HTML de l'évolution des notes Elo pendant la saison (elo.html)"""
+        html = self.generate_html_header(f"Classement Elo - {self.championship} {self.season}")
+        
+        html += f"""
+    <h1>Évolution du classement Elo</h1>
+    <h2>{self.championship} - Saison {self.season}</h2>
+    <p>Notes Elo calculées sur tout l'historique des matchs (tous championnats), dans l'ordre du classement.</p>
+    
+    <table>
+        <tr>
+            <th>Équipe</th>
+            <th>Elo début</th>
+            <th>Elo fin</th>
+            <th>Évolution</th>
+            <th>Maximum</th>
+        </tr>
+"""
+        for team in summary:
+            html += f"""
+        <tr>
+            <td>{team['team']}</td>
+            <td>{team['start']:.0f}</td>
+            <td><strong>{team['end']:.0f}</strong></td>
+            <td>{team['change']:+.0f}</td>
+            <td>{team['peak']:.0f}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        
+        for team in summary:
+            html += f"""
+    <h3>{team['team']}</h3>
+    <table>
+        <tr>
+            <th>Date</th>
+            <th>Adversaire</th>
+            <th>Lieu</th>
+            <th>Elo avant</th>
+            <th>Elo après</th>
+        </tr>
+"""
+            for entry in team['history']:
+                html += f"""
+        <tr>
+            <td>{entry['date'][:10]}</td>
+            <td>{entry['opponent']}</td>
+            <td>{'Domicile' if entry['home'] else 'Extérieur'}</td>
+            <td>{entry['rating_before']:.0f}</td>
+            <td>{entry['rating_after']:.0f}</td>
+        </tr>
+"""
+            html += "    </table>\n"
+        
+        html += self.generate_html_footer()
+        
+        return html
+    
+    def generate_elo_page(self, summary: List[Dict]):
+        """Génère l'évolution des notes Elo pendant la saison (elo.html)"""
+        self.write_page('elo.html', self.render_elo_page(summary))
+        self.log("✓ Page générée : elo.html")
+    
+    def generate_head_to_head_page(self, head_to_head: HeadToHead, standings: List[Dict]):
+        """Génère la matrice des confrontations directes (confrontations.html)"""
+        self.write_page('confrontations.html', self.render_head_to_head_page(head_to_head, standings))
+        self.log("✓ Page générée : confrontations.html")
+    
+    def generate_matchday_standings_page(self, history: StandingsHistory):
+        """Génère le classement journée par journée (journees.html)"""
+        self.write_page('journees.html', self.render_matchday_standings_page(history))
+        self.log("✓ Page générée : journees.html")
+    
+    def render_team_page(self, team_name: str, team_matches: List[Dict], standings: List[Dict],
+                         trajectory: Optional[List[Tuple]] = None, streaks: Optional[Dict] = None,
+                         squad: Optional[List[Dict]] = None, events: Optional[Dict] = None,
+                         odds: Optional[Dict] = None, tactics: Optional[List[Dict]] = None,
+                         style: Optional[Dict] = None) -> str:
+        """Construit le HTML de la page d'une équipe spécifique"""
         # Trouver les stats de l'équipe
         team_stats = next((t for t in standings if t['team'] == team_name), None)
+        team_api_id = team_stats['team_api_id']
         
         html = self.generate_html_header(f"{team_name} - {self.championship} {self.season}")
         
@@ -534,7 +978,52 @@ class HTMLPageGenerator:
         <p><strong>Buts contre :</strong> {team_stats['goals_against']}</p>
         <p><strong>Différence de buts :</strong> {team_stats['goal_difference']:+d}</p>
     </div>
-    
+"""
+        
+        if streaks:
+            html += f"""
+    <div class="stat-box">
+        <h3>Séries et forme</h3>
+        <p><strong>Plus longue série de victoires :</strong> {streaks['longest_win']} match{'s' if streaks['longest_win'] > 1 else ''}</p>
+        <p><strong>Plus longue série sans défaite :</strong> {streaks['longest_unbeaten']} match{'s' if streaks['longest_unbeaten'] > 1 else ''}</p>
+        <p><strong>Plus longue série sans marquer :</strong> {streaks['longest_scoreless']} match{'s' if streaks['longest_scoreless'] > 1 else ''}</p>
+        <p><strong>Série en cours :</strong> {streaks['current']}</p>
+        <p><strong>Forme (derniers matchs) :</strong> {streaks['form']}</p>
+    </div>
+"""
+        
+        if events:
+            html += f"""
+    <div class="stat-box">
+        <h3>Discipline</h3>
+        <p><strong>Cartons jaunes :</strong> {events['yellow']}</p>
+        <p><strong>Cartons rouges :</strong> {events['red']}</p>
+    </div>
+"""
+        
+        if odds:
+            html += f"""
+    <div class="stat-box">
+        <h3>Cotes des bookmakers</h3>
+        <p><strong>Matchs cotés :</strong> {odds['played']}</p>
+        <p><strong>Nombre de points attendus :</strong> {odds['expected_points']:.1f}</p>
+        <p><strong>Écart avec le total obtenu :</strong> {odds['difference']:+.1f}</p>
+        <p><strong>Matchs gagnés en favori :</strong> {odds['favourite_won']} / {odds['favourite_played']}</p>
+        <p><strong>Matchs gagnés en outsider :</strong> {odds['underdog_won']} / {odds['underdog_played']}</p>
+    </div>
+"""
+        
+        if style:
+            html += f"""
+    <div class="stat-box">
+        <h3>Style de jeu</h3>
+        <p><strong>Groupe :</strong> {style['cluster']} sur {style['clusters']}</p>
+        <p><strong>Caractéristiques (écart à la moyenne) :</strong> {style['traits']}</p>
+        <p><strong>Équipes-saisons du groupe :</strong> {style['size']}</p>
+    </div>
+"""
+        
+        html += """
     <h3>Tous les matchs</h3>
 """
         
@@ -542,7 +1031,7 @@ class HTMLPageGenerator:
             date_obj = datetime.strptime(match['date'], '%Y-%m-%d %H:%M:%S')
             date_formatted = date_obj.strftime('%d/%m/%Y')
             
-            is_home = match['home_team'] == team_name
+            is_home = match['home_team_api_id'] == team_api_id
             
             if is_home:
                 opponent = match['away_team']
@@ -582,69 +1071,603 @@ class HTMLPageGenerator:
     </div>
 """
         
+        if trajectory:
+            html += self.render_position_evolution(trajectory)
+        
+        if tactics:
+            html += self.render_tactical_timeline(tactics)
+        
+        if style and style['similar']:
+            html += self.render_similar_styles(style['similar'])
+        
+        if events:
+            html += self.render_team_scorers(events, squad or ())
+        
+        if squad:
+            html += self.render_squad(squad)
+        
         html += self.generate_html_footer()
         
-        filename = f"equipe_{team_name.replace(' ', '_')}.html"
-        with open(os.path.join(self.output_dir, filename), 'w', encoding='utf-8') as f:
-            f.write(html)
+        return html
+    
+    def render_position_evolution(self, trajectory: List[Tuple]) -> str:
+        """Construit la section « Évolution au classement » d'une page d'équipe"""
+        html = """
+    <h3>Évolution au classement</h3>
+    <table>
+        <tr>
+            <th>Date</th>
+            <th>Position</th>
+            <th>Pts</th>
+        </tr>
+"""
+        for match_date, position, points in trajectory:
+            date_formatted = datetime.strptime(match_date, '%Y-%m-%d %H:%M:%S').strftime('%d/%m/%Y')
+            html += f"""
+        <tr>
+            <td>{date_formatted}</td>
+            <td>{position}</td>
+            <td>{points}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        return html
+    
+    def render_tactical_timeline(self, tactics: List[Dict]) -> str:
+        """Construit la section « Profil tactique » : relevés Team_Attributes successifs et bilan sous chacun"""
+        html = """
+    <h3>Profil tactique</h3>
+    <table>
+        <tr>
+            <th>Relevé</th>
+            <th>Matchs</th>
+            <th>Bilan</th>
+            <th>Pts/match</th>
+"""
+        for name in TIMELINE_ATTRIBUTES:
+            html += f"            <th>{NUMERIC_ATTRIBUTES[name]}</th>\n"
+        html += """            <th>Organisation</th>
+        </tr>
+"""
+        for period in tactics:
+            profile = period['profile']
+            html += f"""
+        <tr>
+            <td>{profile['date'][:10]}{' *' if period['anticipated'] else ''}</td>
+            <td>{period['first_date'][:10]} - {period['last_date'][:10]} ({period['played']})</td>
+            <td>{period['won']} V, {period['drawn']} N, {period['lost']} D</td>
+            <td>{period['points'] / period['played']:.2f}</td>
+"""
+            for name in TIMELINE_ATTRIBUTES:
+                html += f"            <td>{'-' if profile[name] is None else profile[name]}</td>\n"
+            html += f"""            <td>{profile['buildUpPlayPositioningClass'] or '-'} / {profile['defenceDefenderLineClass'] or '-'}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        if any(period['anticipated'] for period in tactics):
+            html += "    <p>* Relevé postérieur aux matchs : premier relevé disponible pour l'équipe.</p>\n"
+        return html
+    
+    def render_similar_styles(self, similar: List[Dict]) -> str:
+        """Construit la section « Styles comparables » (autres équipes-saisons, tous championnats)"""
+        html = """
+    <h3>Styles comparables</h3>
+    <table>
+        <tr>
+            <th>Équipe</th>
+            <th>Saison</th>
+            <th>Championnat</th>
+            <th>Groupe</th>
+            <th>Distance</th>
+        </tr>
+"""
+        for team in similar:
+            html += f"""
+        <tr>
+            <td>{team['team']}</td>
+            <td>{team['season']}</td>
+            <td>{team['championship']}</td>
+            <td>{team['cluster']}</td>
+            <td>{team['distance']:.2f}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        return html
+    
+    def render_team_scorers(self, events: Dict, squad: Iterable[Dict] = ()) -> str:
+        """Construit les sections « Buteurs » et minutes des buts d'une page d'équipe"""
+        # Seuls les joueurs de l'effectif ont une page
+        linked = {member['player_api_id'] for member in squad}
+        html = """
+    <h3>Buteurs</h3>
+    <table>
+        <tr>
+            <th>Joueur</th>
+            <th>Buts</th>
+        </tr>
+"""
+        for scorer in events['scorers']:
+            name = scorer['player_name']
+            if scorer['player_api_id'] in linked:
+                name = f'<a href="{self.player_filename(scorer["player_api_id"])}">{name}</a>'
+            html += f"""
+        <tr>
+            <td>{name}</td>
+            <td>{scorer['goals']}</td>
+        </tr>
+"""
+        html += """    </table>
+    
+    <h3>Minutes des buts marqués</h3>
+"""
+        html += self.render_goal_minutes(events['minutes'])
+        return html
+    
+    def render_squad(self, squad: List[Dict]) -> str:
+        """Construit la section « Effectif » d'une page d'équipe (joueurs alignés dans la saison)"""
+        html = """
+    <h3>Effectif</h3>
+    <table>
+        <tr>
+            <th>Joueur</th>
+            <th>Matchs</th>
+            <th>Premier match</th>
+            <th>Dernier match</th>
+        </tr>
+"""
+        for member in squad:
+            html += f"""
+        <tr>
+            <td><a href="{self.player_filename(member['player_api_id'])}">{member['player_name']}</a></td>
+            <td>{member['appearances']}</td>
+            <td>{member['first_date'][:10]}</td>
+            <td>{member['last_date'][:10]}</td>
+        </tr>
+"""
+        html += "    </table>\n"
+        return html
+    
+    def generate_team_page(self, team_name: str, team_matches: List[Dict], standings: List[Dict],
+                           trajectory: Optional[List[Tuple]] = None, streaks: Optional[Dict] = None,
+                           squad: Optional[List[Dict]] = None, events: Optional[Dict] = None,
+                           odds: Optional[Dict] = None, tactics: Optional[List[Dict]] = None,
+                           style: Optional[Dict] = None):
+        """Génère une page pour une équipe spécifique"""
+        filename = self.team_filename(team_name)
+        self.write_page(filename, self.render_team_page(team_name, team_matches, standings, trajectory, streaks,
+                                                        squad, events, odds, tactics, style))
+        self.log(f"✓ Page générée : {filename}")
+    
+    def render_player_page(self, player: Dict) -> str:
+        """Construit le HTML de la page d'un joueur (matchs de la saison et parcours)"""
+        html = self.generate_html_header(f"{player['player_name']} - {self.championship} {self.season}")
+        
+        html += f"""
+    <h1>{player['player_name']}</h1>
+    <h2>{self.championship} - Saison {self.season}</h2>
+    
+    <div class="stat-box">
+        <h3>Fiche du joueur</h3>
+        <p><strong>Équipe(s) :</strong> {', '.join(player['teams'])}</p>
+        <p><strong>Matchs de la saison :</strong> {len(player['matches'])}</p>
+"""
+        if player['birthday']:
+            html += f"        <p><strong>Date de naissance :</strong> {player['birthday'][:10]}</p>\n"
+        if player['height']:
+            html += f"        <p><strong>Taille :</strong> {player['height']:.0f} cm</p>\n"
+        html += """    </div>
+    
+    <h3>Matchs de la saison</h3>
+    <table>
+        <tr>
+            <th>Date</th>
+            <th>Domicile</th>
+            <th>Score</th>
+            <th>Extérieur</th>
+        </tr>
+"""
+        for match in player['matches']:
+            html += f"""
+        <tr>
+            <td>{match['date'][:10]}</td>
+            <td>{match['home_team']}</td>
+            <td>{match['home_team_goal']} - {match['away_team_goal']}</td>
+            <td>{match['away_team']}</td>
+        </tr>
+"""
+        html += """    </table>
+    
+    <h3>Parcours</h3>
+    <table>
+        <tr>
+            <th>Saison</th>
+            <th>Équipe</th>
+            <th>Matchs</th>
+        </tr>
+"""
+        for season in player['career']:
+            html += f"""
+        <tr>
+            <td>{season['season']}</td>
+            <td>{season['team']}</td>
+            <td>{season['appearances']}</td>
+        </tr>
+"""
+        html += "    </table>\n"
         
-        print(f"✓ Page générée : {filename}")
+        if player['similar']:
+            html += """
+    <h3>Joueurs similaires</h3>
+    <p>Similarité cosinus des attributs du dernier relevé (Player_Attributes), centrés-réduits.</p>
+    <table>
+        <tr>
+            <th>Joueur</th>
+            <th>Similarité</th>
+        </tr>
+"""
+            for neighbour in player['similar']:
+                html += f"""
+        <tr>
+            <td>{neighbour['player_name']}</td>
+            <td>{neighbour['score']:.3f}</td>
+        </tr>
+"""
+            html += "    </table>\n"
+        html += self.generate_html_footer()
+        
+        return html
+    
+    def generate_player_page(self, player: Dict):
+        """Génère la page d'un joueur"""
+        filename = self.player_filename(player['player_api_id'])
+        self.write_page(filename, self.render_player_page(player))
+        self.log(f"✓ Page générée : {filename}")
     
-    def generate_all_pages(self):
-        """Génère toutes les pages HTML"""
-        print("\n" + "="*60)
-        print("GÉNÉRATION DES PAGES HTML - WEB 1.0")
-        print("="*60 + "\n")
+    def page_tasks(self, top_teams: List[str], calendar_slices: Optional[List[CalendarSlice]] = None,
+                   player_pages: Iterable[str] = ()) -> List[PageTask]:
+        """Liste des pages de la saison, dans l'ordre de la génération séquentielle"""
+        tasks = [
+            PageTask('index.html', 'index'),
+            PageTask('classement.html', 'standings'),
+            PageTask('calendrier.html', 'calendar_index' if calendar_slices else 'calendar'),
+        ]
+        for calendar_slice in calendar_slices or ():
+            tasks.append(PageTask(calendar_slice.filename, 'calendar_slice'))
+        tasks += [
+            PageTask('statistiques.html', 'statistics'),
+            PageTask('journees.html', 'matchdays'),
+            PageTask('confrontations.html', 'head_to_head'),
+        ]
+        if 'elo' in self.sections:
+            tasks.append(PageTask('elo.html', 'elo'))
+        for team_name in top_teams:
+            tasks.append(PageTask(self.team_filename(team_name), 'team', team_name))
+        for filename in player_pages:
+            tasks.append(PageTask(filename, 'player'))
+        return tasks
+    
+    def player_pages(self, context: Dict, teams: List[str]) -> List[str]:
+        """Pages des joueurs alignés par les équipes données (sans doublon, dans l'ordre des effectifs)"""
+        filenames = {}
+        for team_name in teams:
+            for member in context['squads'].get(context['matches'].team_api_id(team_name), ()):
+                filenames.setdefault(self.player_filename(member['player_api_id']))
+        return list(filenames)
+    
+    def write_bundle(self, context: Dict, tasks: List[PageTask]) -> List[str]:
+        """Écrit toutes les pages (et la feuille de style) dans une seule archive zip"""
+        streamed = [task for task in tasks if task.kind in STREAMED_KINDS]
+        rendered = [task for task in tasks if task.kind not in STREAMED_KINDS]
+        with SiteBundleWriter(self.output_dir) as bundle:
+            for filename, html in self.scheduler.render(self, context, rendered):
+                bundle.write(filename, html)
+                self.log(f"✓ Page générée : {filename}")
+            for task in streamed:
+                bundle.write_chunks(task.filename, page_chunks(self, context, task))
+                self.log(f"✓ Page générée : {task.filename}")
+            if not self.inline_styles:
+                bundle.write(site_assets.STYLESHEET_NAME, site_assets.STYLESHEET)
+        return bundle.names
+    
+    def compute_season(self, league_id: int, matches: MatchTable) -> Tuple[List[Dict], Dict]:
+        """Classement et statistiques de la saison avec le moteur choisi"""
+        if self.engine == 'sql':
+            return SQLSeasonEngine(self.conn).calculate_season(league_id, self.season)
+        return self.calculate_season(matches)
+    
+    def load_elo(self) -> EloRatings:
+        """Notes Elo de tout l'historique (cache à côté de la base, mis à jour avec les nouveaux matchs)"""
+        elo = load_ratings(self.db, default_cache_path(self.db_path))
+        self.log(f"✓ Notes Elo : {len(elo)} matchs pris en compte")
+        return elo
+    
+    def load_appearances(self) -> PlayerAppearances:
+        """Table des apparitions des joueurs (base cache construite une fois à côté de la base)"""
+        appearances = PlayerAppearances.open(self.db)
+        self.log(f"✓ Apparitions des joueurs : {appearances.cache_path}")
+        return appearances
+    
+    def load_similarity(self) -> PlayerSimilarity:
+        """Index de similarité des joueurs (cache memmap construit une fois à côté de la base)"""
+        similarity = PlayerSimilarity.open(self.db)
+        self.log(f"✓ Similarité des joueurs : {len(similarity)} joueurs indexés")
+        return similarity
+    
+    def load_team_attributes(self) -> TeamAttributes:
+        """Relevés tactiques rattachés à tous les matchs (jointure as-of calculée une fois et mise en cache)"""
+        attributes = TeamAttributes.open(self.db)
+        self.log(f"✓ Profils tactiques : {len(attributes)} relevés")
+        return attributes
+    
+    def load_team_styles(self) -> TeamStyles:
+        """Groupes de styles de toutes les équipes-saisons (recalculés seulement si Team_Attributes change)"""
+        styles = TeamStyles.open(self.db)
+        self.log(f"✓ Styles de jeu : {len(styles)} équipes-saisons, {len(styles.centroids)} groupes")
+        return styles
+    
+    def season_styles(self, styles: TeamStyles, standings: List[Dict]) -> Dict[int, Dict]:
+        """Groupe de style et styles comparables de chaque équipe de la saison"""
+        season_styles = {}
+        for team in standings:
+            style = styles.style(team['team_api_id'], self.season)
+            if style is not None:
+                style['clusters'] = len(styles.centroids)
+                style['similar'] = styles.similar(team['team_api_id'], self.season)
+                season_styles[team['team_api_id']] = style
+        return season_styles
+    
+    def load_events(self) -> MatchEvents:
+        """
+        Événements de match (cache à côté de la base, complété avec les matchs pas encore analysés)
+
+        L'analyse reste dans ce processus : l'extraction parallèle d'une base entière se fait en
+        amont (batch_generate.py ou python match_events.py --workers N).
+        """
+        events = MatchEvents.open(self.db, workers=1)
+        self.log(f"✓ Événements de match : {events.cache_path}")
+        return events
+    
+    def season_events(self, events: MatchEvents, league_id: int, standings: List[Dict],
+                      appearances: Optional[PlayerAppearances]) -> Dict:
+        """Buteurs, minutes des buts et cartons de la saison, pour le championnat et pour chaque équipe"""
+        team_names = {team['team_api_id']: team['team'] for team in standings}
+        scorers = events.scorers(league_id, self.season)
+        for scorer in scorers:
+            info = appearances.player(scorer['player_api_id']) if appearances else None
+            scorer['player_name'] = info['player_name'] if info else f"Joueur {scorer['player_api_id']}"
+            scorer['team'] = team_names.get(scorer['team_api_id'], scorer['team_api_id'])
+        minutes = events.goal_minutes(league_id, self.season)
+        cards = events.cards(league_id, self.season)
+        teams = {}
+        for team in standings:
+            team_cards = cards.get(team['team_api_id'], {'yellow': 0, 'red': 0})
+            teams[team['team_api_id']] = {
+                'team': team['team'],
+                'scorers': [scorer for scorer in scorers if scorer['team_api_id'] == team['team_api_id']],
+                'minutes': minutes.get(team['team_api_id'], [0] * len(MINUTE_BUCKETS)),
+                'yellow': team_cards['yellow'],
+                'red': team_cards['red'],
+            }
+        return {'scorers': scorers[:TOP_SCORERS], 'minutes': minutes[0], 'teams': teams}
+    
+    def season_odds(self, league_id: int, standings: List[Dict]) -> Optional[Dict]:
+        """Analyse des cotes des bookmakers de la saison (None si aucun match n'est coté)"""
+        odds = season_odds(self.db, league_id, self.season, standings)
+        self.log(f"✓ Cotes des bookmakers : {odds['summary']['matches'] if odds else 0} matchs cotés")
+        return odds
+    
+    def season_players(self, appearances: PlayerAppearances, similarity: Optional[PlayerSimilarity],
+                       squads: Dict[int, List[Dict]], matches: MatchTable, standings: List[Dict]) -> Dict[str, Dict]:
+        """Données des pages joueurs (nom de fichier -> fiche, matchs de la saison et parcours)"""
+        matches_by_id = {match['id']: match for match in matches}
+        team_names = {team['team_api_id']: team['team'] for team in standings}
+        players = {}
+        for team_api_id, squad in squads.items():
+            for member in squad:
+                filename = self.player_filename(member['player_api_id'])
+                if filename in players:
+                    players[filename]['teams'].append(team_names[team_api_id])
+                    continue
+                info = appearances.player(member['player_api_id']) or {}
+                players[filename] = {
+                    'player_api_id': member['player_api_id'],
+                    'player_name': member['player_name'],
+                    'birthday': info.get('birthday'),
+                    'height': info.get('height'),
+                    'teams': [team_names[team_api_id]],
+                    'matches': [dict(matches_by_id[match_id])
+                                for match_id in appearances.match_ids(member['player_api_id'], self.season)
+                                if match_id in matches_by_id],
+                    'career': appearances.career(member['player_api_id']),
+                }
+        
+        # Joueurs similaires : une seule recherche vectorisée pour tous les joueurs de la saison
+        neighbours = (similarity.most_similar_batch(player['player_api_id'] for player in players.values())
+                      if similarity else {})
+        names = {}
+        for player in players.values():
+            player['similar'] = neighbours.get(player['player_api_id'], [])
+            for neighbour in player['similar']:
+                if neighbour['player_api_id'] not in names:
+                    info = appearances.player(neighbour['player_api_id'])
+                    names[neighbour['player_api_id']] = (info['player_name'] if info
+                                                         else f"Joueur {neighbour['player_api_id']}")
+                neighbour['player_name'] = names[neighbour['player_api_id']]
+        return players
+    
+    def build_context(self, matches: MatchTable, standings: List[Dict], stats: Dict, elo: Optional[EloRatings],
+                      appearances: Optional[PlayerAppearances], similarity: Optional[PlayerSimilarity],
+                      events: Optional[Dict], odds: Optional[Dict], attributes: Optional[TeamAttributes],
+                      styles: Optional[TeamStyles]) -> Dict:
+        """
+        Contexte partagé par toutes les pages de la saison (données calculées une seule fois)
+
+        Les données d'une section désactivée (cache absent : None) restent vides.
+        """
+        context = {
+            'matches': matches,
+            'standings': standings,
+            'stats': stats,
+            'top_teams': self.get_top_teams(standings),
+            'history': StandingsHistory(matches),
+            'matchday_history': StandingsHistory(matches, key='stage'),
+            'head_to_head': HeadToHead(matches),
+            'elo': season_summary(elo, matches, standings) if elo is not None else [],
+            'strengths': fit_strengths(matches),
+            'streaks': season_streaks(matches, standings),
+            'squads': ({team['team_api_id']: appearances.squad(team['team_api_id'], self.season)
+                        for team in standings} if appearances else {}),
+            'events': events,
+            'odds': odds,
+            'tactics': ({team['team_api_id']: team_timeline(attributes, team['team_api_id'],
+                                                            self.get_team_matches(matches, team['team']))
+                         for team in standings} if attributes is not None else {}),
+            'styles': self.season_styles(styles, standings) if styles is not None else {},
+        }
+        context['players'] = (self.season_players(appearances, similarity, context['squads'], matches, standings)
+                              if appearances else {})
+        if self.calendar_split:
+            context['calendar_slices'] = {s.filename: s for s in split_calendar(matches, self.calendar_split)}
+        return context
+    
+    def source_fingerprint(self) -> str:
+        """Empreinte de la source : base de données (taille, date), paramètres et version du code"""
+        stat = os.stat(self.db_path)
+        return fingerprint(CODE_VERSION, os.path.abspath(self.db_path), stat.st_size, stat.st_mtime_ns,
+                           self.championship, self.season, self.num_teams, self.calendar_split,
+                           self.inline_styles, self.precompress, sorted(self.sections))
+    
+    def season_context(self, league_id: int, matches: MatchTable, standings: List[Dict], stats: Dict) -> Dict:
+        """
+        Contexte de la saison avec les sections d'analyse activées
+
+        Les caches ouverts pour le calcul (apparitions, événements) sont refermés
+        avant le retour, y compris en cas d'erreur.
+        """
+        appearances = self.load_appearances() if 'players' in self.sections else None
+        similarity = self.load_similarity() if appearances and 'similarity' in self.sections else None
+        try:
+            events = None
+            if 'events' in self.sections:
+                match_events = self.load_events()
+                try:
+                    events = self.season_events(match_events, league_id, standings, appearances)
+                finally:
+                    match_events.close()
+            odds = self.season_odds(league_id, standings) if 'odds' in self.sections else None
+            elo = self.load_elo() if 'elo' in self.sections else None
+            return self.build_context(matches, standings, stats, elo, appearances,
+                                      similarity, events, odds,
+                                      self.load_team_attributes() if 'tactics' in self.sections else None,
+                                      self.load_team_styles() if 'styles' in self.sections else None)
+        finally:
+            if appearances is not None:
+                appearances.close()
+    
+    def generate_all_pages(self) -> int:
+        """Génère toutes les pages HTML et retourne le nombre de pages écrites"""
+        self.log("\n" + "="*60)
+        self.log("GÉNÉRATION DES PAGES HTML - WEB 1.0")
+        self.log("="*60 + "\n")
+        
+        # Aucune entrée modifiée depuis la dernière génération : rien à réécrire
+        manifest = PageManifest(self.output_dir) if self.incremental and not self.bundle else None
+        source = self.source_fingerprint() if manifest else None
+        if manifest and manifest.up_to_date(source):
+            self.log(f"✓ Aucune modification depuis la dernière génération : {self.output_dir} est à jour")
+            return 0
         
         # Connexion et préparation
         self.connect_db()
-        self.create_output_directory()
+        if not self.bundle:
+            self.create_output_directory()
         
         # Récupération des données
         league_id, country_id = self.get_league_and_country_ids()
         matches = self.get_matches(league_id)
         
         if not matches:
-            print("Aucun match trouvé pour ce championnat et cette saison")
+            self.log("Aucun match trouvé pour ce championnat et cette saison")
             self.close_db()
-            return
+            return 0
         
         # Calculs
-        standings = self.calculate_standings(matches)
-        stats = self.calculate_statistics(matches)
-        top_teams = self.get_top_teams(standings)
+        standings, stats = self.compute_season(league_id, matches)
+        context = self.season_context(league_id, matches, standings, stats)
+        top_teams = context['top_teams']
+        calendar_slices = context.get('calendar_slices')
         
-        print(f"\n{'='*60}")
-        print("GÉNÉRATION DES PAGES")
-        print(f"{'='*60}\n")
+        self.log(f"\n{'='*60}")
+        self.log("GÉNÉRATION DES PAGES")
+        self.log(f"{'='*60}\n")
         
-        # Génération des pages
-        self.generate_index_page(standings, stats, top_teams)
-        self.generate_standings_page(standings)
-        self.generate_calendar_page(matches)
-        self.generate_statistics_page(stats)
+        # Génération des pages : chaque page est une tâche indépendante
+        tasks = self.page_tasks(top_teams, list(calendar_slices.values()) if calendar_slices else None,
+                                self.player_pages(context, top_teams))
+        inputs = {}
+        if manifest:
+            inputs = {task.filename: fingerprint(CODE_VERSION, self.championship, self.season, self.inline_styles,
+                                                 sorted(self.sections), page_inputs(self, context, task))
+                      for task in tasks}
+            stale_tasks = [task for task in tasks if not manifest.is_current(task.filename, inputs[task.filename])]
+        else:
+            stale_tasks = tasks
         
-        # Pages des équipes sélectionnées
-        for team_name in top_teams:
-            team_matches = self.get_team_matches(matches, team_name)
-            self.generate_team_page(team_name, team_matches, standings)
+        if self.bundle:
+            rewritten = self.write_bundle(context, tasks)
+            self.close_db()
+            self.log(f"\n✓ {len(rewritten)} fichiers écrits dans l'archive : {self.output_dir}")
+            return len(rewritten)
+        
+        rewritten = []
+        for filename in self.scheduler.run(self, context, stale_tasks):
+            if manifest:
+                manifest.record(filename, inputs[filename])
+            rewritten.append(filename)
+            self.log(f"✓ Page générée : {filename}")
+        
+        # Ressources partagées : feuille de style unique, variantes .gz et manifeste des tailles
+        published = [task.filename for task in tasks]
+        if not self.inline_styles:
+            write_stylesheet(self.output_dir)
+            published.append(site_assets.STYLESHEET_NAME)
+        if self.precompress:
+            assets = AssetManifest(self.output_dir)
+            assets.compress(rewritten)
+            assets.save(published)
+            totals = assets.totals()
+            self.log(f"✓ {site_assets.ASSET_MANIFEST_NAME} : {totals['bytes'] / 1024:.0f} Ko, "
+                  f"{totals['gzip_bytes'] / 1024:.0f} Ko compressés (.gz)")
+        
+        if manifest:
+            manifest.save(source, [task.filename for task in tasks])
+            self.log(f"\n✓ {len(rewritten)} page(s) réécrite(s), {len(tasks) - len(rewritten)} inchangée(s)")
         
         self.close_db()
         
-        total_pages = 4 + len(top_teams)
-        print(f"\n{'='*60}")
-        print("✓ GÉNÉRATION TERMINÉE AVEC SUCCÈS")
-        print(f"{'='*60}")
-        print(f"\n{total_pages} pages HTML ont été générées dans : {self.output_dir}")
-        print("Pages générées :")
-        print("  1. index.html")
-        print("  2. classement.html")
-        print("  3. calendrier.html")
-        print("  4. statistiques.html")
-        print(f"  5-{total_pages}. Pages des {len(top_teams)} meilleures équipes :")
-        for i, team in enumerate(top_teams, 5):
-            print(f"      {i}. equipe_{team.replace(' ', '_')}.html")
-        print(f"\nPour visualiser : ouvrez {os.path.join(self.output_dir, 'index.html')} dans un navigateur")
+        total_pages = len(tasks)
+        self.log(f"\n{'='*60}")
+        self.log("✓ GÉNÉRATION TERMINÉE AVEC SUCCÈS")
+        self.log(f"{'='*60}")
+        self.log(f"\n{total_pages} pages HTML ont été générées dans : {self.output_dir}")
+        self.log("Pages générées :")
+        self.log("  1. index.html")
+        self.log("  2. classement.html")
+        if calendar_slices:
+            self.log(f"  3. calendrier.html (index) et {len(calendar_slices)} pages calendrier_*.html")
+        else:
+            self.log("  3. calendrier.html")
+        self.log("  4. statistiques.html")
+        self.log("  5. journees.html")
+        self.log("  6. confrontations.html")
+        self.log("  7. elo.html" if 'elo' in self.sections else "  7. elo.html : section Elo désactivée")
+        self.log(f"  8-{7 + len(top_teams)}. Pages des {len(top_teams)} meilleures équipes :")
+        for i, team in enumerate(top_teams, 8):
+            self.log(f"      {i}. equipe_{team.replace(' ', '_')}.html")
+        player_count = sum(task.kind == 'player' for task in tasks)
+        self.log(f"  {8 + len(top_teams)}. Pages des {player_count} joueurs de ces équipes : joueur_*.html")
+        self.log(f"\nPour visualiser : ouvrez {os.path.join(self.output_dir, 'index.html')} dans un navigateur")
+        return len(rewritten)
 
 
 def main():
@@ -655,6 +1678,10 @@ def main():
     SEASON = "2008/2009"  # Saison à générer
     OUTPUT_DIR = "web_1.0_output"  # Dossier de sortie
     NUM_TEAMS = 10  # Nombre d'équipes à générer (modifiable : 4, 6, 8, 10, etc.)
+    RENDER_WORKERS = 4  # Threads de rendu des pages (1 = génération séquentielle)
+    CALENDAR_SPLIT = None  # Découpage du calendrier : None (une page), 'month' ou 'stage'
+    ANALYSES = None  # Sections d'analyse activées : None (toutes, voir SECTIONS) ou un tuple, par ex. ()
+    # Pour écrire tout le site dans une seule archive : OUTPUT_DIR = "web_1.0_output.zip"
     
     # Vérifier que la base de données existe
     if not os.path.exists(DB_PATH):
@@ -663,7 +1690,8 @@ def main():
         return
     
     # Génération
-    generator = HTMLPageGenerator(DB_PATH, CHAMPIONSHIP, SEASON, OUTPUT_DIR, NUM_TEAMS)
+    generator = HTMLPageGenerator(DB_PATH, CHAMPIONSHIP, SEASON, OUTPUT_DIR, NUM_TEAMS,
+                                  render_workers=RENDER_WORKERS, calendar_split=CALENDAR_SPLIT, sections=ANALYSES)
     generator.generate_all_pages()
 
 
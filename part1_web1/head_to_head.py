@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Confrontations directes : matrice équipe × équipe calculée une fois par saison
+Auteur: T. E. G. - Web Sémantique
+
+Les bilans de chaque paire d'équipes (matchs, victoires, nuls, buts) sont
+stockés dans des matrices NumPy indexées par équipe, et les matchs de chaque
+paire (domicile, extérieur) sont regroupés par un tri unique (table d'offsets,
+format CSR). Une confrontation se lit donc en temps constant, sans parcourir
+le calendrier ni les pages d'équipes.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from season_kernel import index_teams, match_arrays, team_names
+
+
+class HeadToHead:
+    """Matrice des confrontations directes d'une saison (ou de plusieurs)"""
+
+    def __init__(self, matches: Sequence[Dict]):
+        """
+        Args:
+            matches: Matchs de la saison (liste de dicts ou MatchTable)
+        """
+        home_ids, away_ids, home_goals, away_goals = match_arrays(matches)
+        team_ids, first_seen, home_idx, away_idx = index_teams(home_ids, away_ids)
+        self.team_ids = team_ids
+        self.team_names = team_names(matches, first_seen)
+        self._team_index = {team_id: i for i, team_id in enumerate(team_ids.tolist())}
+        n_teams = len(team_ids)
+
+        # Bilans du point de vue de l'équipe en ligne contre l'équipe en colonne
+        shape = (n_teams, n_teams)
+        self.played = np.zeros(shape, dtype=np.int32)
+        self.won = np.zeros(shape, dtype=np.int32)
+        self.drawn = np.zeros(shape, dtype=np.int32)
+        self.goals_for = np.zeros(shape, dtype=np.int32)
+        for row, column, goals_for, goals_against in ((home_idx, away_idx, home_goals, away_goals),
+                                                      (away_idx, home_idx, away_goals, home_goals)):
+            np.add.at(self.played, (row, column), 1)
+            np.add.at(self.won, (row, column), goals_for > goals_against)
+            np.add.at(self.drawn, (row, column), goals_for == goals_against)
+            np.add.at(self.goals_for, (row, column), goals_for)
+        self.lost = self.played - self.won - self.drawn
+        self.goals_against = self.goals_for.T
+
+        # Matchs de chaque paire ordonnée (domicile, extérieur), dans l'ordre reçu
+        pair = home_idx * n_teams + away_idx
+        self._order = np.argsort(pair, kind='stable')
+        self._offsets = np.searchsorted(pair[self._order], np.arange(n_teams * n_teams + 1))
+        self._n_teams = n_teams
+        self.home_goals = home_goals
+        self.away_goals = away_goals
+        self.dates = [match['date'] for match in matches]
+
+    def index(self, team_api_id: int) -> int:
+        """Indice d'une équipe dans les matrices (KeyError si elle n'a pas joué)"""
+        return self._team_index[team_api_id]
+
+    def record(self, team_api_id: int, opponent_api_id: int) -> Dict:
+        """Bilan d'une équipe contre un adversaire (toutes rencontres confondues)"""
+        i, j = self.index(team_api_id), self.index(opponent_api_id)
+        return {
+            'played': int(self.played[i, j]),
+            'won': int(self.won[i, j]),
+            'drawn': int(self.drawn[i, j]),
+            'lost': int(self.lost[i, j]),
+            'goals_for': int(self.goals_for[i, j]),
+            'goals_against': int(self.goals_against[i, j]),
+        }
+
+    def home_results(self, home_index: int, away_index: int) -> List[Dict]:
+        """Matchs joués par l'équipe home_index à domicile contre away_index"""
+        pair = home_index * self._n_teams + away_index
+        results = []
+        for k in self._order[self._offsets[pair]:self._offsets[pair + 1]].tolist():
+            results.append({
+                'date': self.dates[k],
+                'home_team_api_id': int(self.team_ids[home_index]),
+                'away_team_api_id': int(self.team_ids[away_index]),
+                'home_team_goal': int(self.home_goals[k]),
+                'away_team_goal': int(self.away_goals[k]),
+            })
+        return results
+
+    def confrontations(self, team_api_id: int, opponent_api_id: int) -> List[Dict]:
+        """Tous les matchs entre deux équipes (les deux terrains), triés par date"""
+        i, j = self.index(team_api_id), self.index(opponent_api_id)
+        return sorted(self.home_results(i, j) + self.home_results(j, i), key=lambda match: match['date'])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Classement incrémental : application et annulation de résultats sans recalcul complet
+Auteur: T. E. G. - Web Sémantique
+
+Le classement est maintenu trié par les critères de calculate_standings
+(points, différence de buts, buts marqués, puis ordre d'apparition) dans une
+liste de clés ordonnée : chaque apply/revert retire et réinsère les clés des
+deux équipes du match par recherche dichotomique (bisect). Corrections,
+résultats tardifs ou scénarios « et si » ne demandent donc pas de reconstruire
+tout le classement.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+
+class IncrementalStandings:
+    """Classement d'une saison mis à jour match par match"""
+
+    def __init__(self, matches: Iterable[Dict] = ()):
+        self.rows: Dict[int, Dict] = {}          # team_api_id -> ligne du classement
+        self._appearance: Dict[int, int] = {}    # team_api_id -> ordre de première apparition
+        self._keys: List[Tuple] = []             # clés de tri, dans l'ordre du classement
+        for match in matches:
+            self.apply(match)
+
+    def _key(self, team_api_id: int) -> Tuple:
+        row = self.rows[team_api_id]
+        return (-row['points'], -row['goal_difference'], -row['goals_for'],
+                self._appearance[team_api_id], team_api_id)
+
+    def _remove(self, team_api_id: int):
+        key = self._key(team_api_id)
+        del self._keys[bisect_left(self._keys, key)]
+
+    def _update(self, team_api_id: int, team_name: str, goals_for: int, goals_against: int, sign: int):
+        """Ajoute (sign=1) ou retire (sign=-1) un match du point de vue d'une équipe"""
+        row = self.rows.get(team_api_id)
+        if row is None:
+            if sign < 0:
+                raise ValueError(f"Impossible d'annuler un match de l'équipe {team_name} : aucun match appliqué")
+            self._appearance.setdefault(team_api_id, len(self._appearance))
+            row = self.rows[team_api_id] = {
+                'team': team_name,
+                'team_api_id': team_api_id,
+                'played': 0,
+                'won': 0,
+                'drawn': 0,
+                'lost': 0,
+                'goals_for': 0,
+                'goals_against': 0,
+                'goal_difference': 0,
+                'points': 0
+            }
+        else:
+            self._remove(team_api_id)
+
+        row['played'] += sign
+        row['goals_for'] += sign * goals_for
+        row['goals_against'] += sign * goals_against
+        row['goal_difference'] = row['goals_for'] - row['goals_against']
+        if goals_for > goals_against:
+            row['won'] += sign
+            row['points'] += 3 * sign
+        elif goals_for < goals_against:
+            row['lost'] += sign
+        else:
+            row['drawn'] += sign
+            row['points'] += sign
+
+        if row['played'] == 0:
+            # Plus aucun match : l'équipe sort du classement (elle garde son ordre d'apparition)
+            del self.rows[team_api_id]
+        else:
+            insort(self._keys, self._key(team_api_id))
+
+    def apply(self, match: Dict):
+        """Ajoute le résultat d'un match au classement"""
+        self._update(match['home_team_api_id'], match['home_team'],
+                     match['home_team_goal'], match['away_team_goal'], 1)
+        self._update(match['away_team_api_id'], match['away_team'],
+                     match['away_team_goal'], match['home_team_goal'], 1)
+
+    def revert(self, match: Dict):
+        """Retire le résultat d'un match précédemment appliqué"""
+        self._update(match['home_team_api_id'], match['home_team'],
+                     match['home_team_goal'], match['away_team_goal'], -1)
+        self._update(match['away_team_api_id'], match['away_team'],
+                     match['away_team_goal'], match['home_team_goal'], -1)
+
+    def correct(self, old_match: Dict, new_match: Dict):
+        """Remplace un résultat par un autre (correction ou scénario « et si »)"""
+        self.revert(old_match)
+        self.apply(new_match)
+
+    def position(self, team_api_id: int) -> int:
+        """Position actuelle d'une équipe (0 si elle n'a joué aucun match)"""
+        if team_api_id not in self.rows:
+            return 0
+        return bisect_left(self._keys, self._key(team_api_id)) + 1
+
+    def standings(self) -> List[Dict]:
+        """Classement courant (même format que calculate_standings)"""
+        standings = []
+        for position, key in enumerate(self._keys, 1):
+            row = dict(self.rows[key[-1]])
+            row['position'] = position
+            standings.append(row)
+        return standings
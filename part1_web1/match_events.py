@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Événements de match (buts, cartons, tirs cadrés, possession) extraits du XML
+Auteur: T. E. G. - Web Sémantique
+Usage: python match_events.py [--db database.sqlite] [--workers 4]
+
+Les colonnes goal, card, shoton et possession de la table Match contiennent
+des documents XML (une balise <value> par événement). Ils sont analysés en
+flux (lxml.etree.iterparse, chaque <value> libéré après lecture) par lots de
+matchs répartis sur un pool de processus, puis rangés dans des tables
+normalisées d'une base cache (<db>.events.sqlite).
+
+Chaque match traité est noté dans la table match du cache avec un haché de
+ses colonnes XML, et le cache garde l'empreinte de la base (taille, date) de
+la dernière extraction complète. Si la base n'a pas changé, rien n'est relu.
+Sinon, les colonnes XML sont hachées (sans être analysées) : seuls les matchs
+nouveaux ou modifiés sont analysés à nouveau, et les événements des matchs
+supprimés sont retirés du cache ; un traitement interrompu reprend là où il
+s'est arrêté. Sans changement, le cache n'est pas ouvert en écriture et aucun
+processus n'est lancé. Les événements sont identifiés par (match,
+rang dans le XML) et insérés avec INSERT OR IGNORE, ce qui rend l'extraction
+idempotente même si deux générations la lancent en même temps.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from lxml import etree
+
+from db_access import SQLiteDataAccess
+from page_manifest import fingerprint
+
+EVENT_COLUMNS = ('goal', 'card', 'shoton', 'possession')
+
+# Matchs analysés par tâche du pool
+BATCH_MATCHES = 1000
+
+# Identifiants passés par requête (limite historique de SQLite : 999 paramètres)
+MAX_PARAMETERS = 500
+
+# Commentaires de la colonne goal qui ne sont pas des buts (refusé, penalty manqué...)
+NOT_GOALS = ('dg', 'npm', 'psm', 'rp')
+OWN_GOAL = 'o'
+
+# Tranches de 15 minutes (les arrêts de jeu comptent dans la tranche qui se termine)
+MINUTE_BUCKETS = ('1-15', '16-30', '31-45', '46-60', '61-75', '76-90')
+
+# Version du schéma du cache (PRAGMA user_version) : un cache plus ancien est reconstruit
+CACHE_VERSION = 2
+
+XML_QUERY = f"SELECT id, {', '.join(EVENT_COLUMNS)} FROM Match ORDER BY id"
+
+MATCH_QUERY = f"""
+SELECT id, league_id, season, {', '.join(EVENT_COLUMNS)}
+FROM Match
+WHERE id IN ({{placeholders}})
+ORDER BY id
+"""
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS match (
+    match_id INTEGER PRIMARY KEY,
+    league_id INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    xml_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS goal (
+    match_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    team_api_id INTEGER,
+    player_api_id INTEGER,
+    assist_api_id INTEGER,
+    elapsed INTEGER,
+    elapsed_plus INTEGER,
+    comment TEXT,
+    PRIMARY KEY (match_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS card (
+    match_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    team_api_id INTEGER,
+    player_api_id INTEGER,
+    elapsed INTEGER,
+    card_type TEXT,
+    PRIMARY KEY (match_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS shoton (
+    match_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    team_api_id INTEGER,
+    player_api_id INTEGER,
+    elapsed INTEGER,
+    PRIMARY KEY (match_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS possession (
+    match_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    elapsed INTEGER,
+    home_possession INTEGER,
+    away_possession INTEGER,
+    PRIMARY KEY (match_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS match_league_season ON match (league_id, season);
+CREATE INDEX IF NOT EXISTS goal_team ON goal (team_api_id, match_id);
+CREATE INDEX IF NOT EXISTS card_team ON card (team_api_id, match_id);
+"""
+
+INSERTS = {
+    'match': "INSERT OR IGNORE INTO match VALUES (?, ?, ?, ?)",
+    'goal': "INSERT OR IGNORE INTO goal VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    'card': "INSERT OR IGNORE INTO card VALUES (?, ?, ?, ?, ?, ?)",
+    'shoton': "INSERT OR IGNORE INTO shoton VALUES (?, ?, ?, ?, ?)",
+    'possession': "INSERT OR IGNORE INTO possession VALUES (?, ?, ?, ?, ?)",
+}
+
+COUNTED_GOALS = f"COALESCE(g.comment, '') NOT IN ({', '.join(repr(c) for c in NOT_GOALS)})"
+
+SCORERS_QUERY = f"""
+SELECT g.player_api_id, g.team_api_id, COUNT(*) AS goals
+FROM goal g JOIN match m ON m.match_id = g.match_id
+WHERE m.league_id = ? AND m.season = ? AND g.player_api_id IS NOT NULL
+  AND {COUNTED_GOALS} AND COALESCE(g.comment, '') != '{OWN_GOAL}'
+GROUP BY g.player_api_id, g.team_api_id
+ORDER BY goals DESC, g.player_api_id
+"""
+
+GOAL_MINUTES_QUERY = f"""
+SELECT g.team_api_id, MAX(0, MIN(5, (g.elapsed - 1) / 15)) AS bucket, COUNT(*) AS goals
+FROM goal g JOIN match m ON m.match_id = g.match_id
+WHERE m.league_id = ? AND m.season = ? AND g.elapsed IS NOT NULL AND {COUNTED_GOALS}
+GROUP BY g.team_api_id, bucket
+"""
+
+CARDS_QUERY = """
+SELECT c.team_api_id,
+       SUM(c.card_type = 'y') AS yellow,
+       SUM(c.card_type IN ('r', 'y2')) AS red
+FROM card c JOIN match m ON m.match_id = c.match_id
+WHERE m.league_id = ? AND m.season = ?
+GROUP BY c.team_api_id
+"""
+
+
+def default_cache_path(db_path: str) -> str:
+    """Base cache placée à côté de la base source"""
+    return db_path + '.events.sqlite'
+
+
+def source_fingerprint(db_path: str) -> str:
+    stat = os.stat(db_path)
+    return fingerprint(os.path.abspath(db_path), stat.st_size, stat.st_mtime_ns)
+
+
+def xml_hash(columns: Sequence[Optional[str]]) -> str:
+    """Haché des colonnes XML d'un match (détecte un match modifié depuis son analyse)"""
+    return hashlib.blake2b(repr(tuple(columns)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_values(xml: str) -> Iterator[Dict[str, str]]:
+    """Champs (balise -> texte) de chaque <value> de premier niveau d'un document, lus en flux"""
+    depth = 0
+    fields: Dict[str, str] = {}
+    for event, element in etree.iterparse(io.BytesIO(xml.encode('utf-8')), events=('start', 'end'),
+                                          recover=True):
+        if event == 'start':
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 2:
+            # Champ direct d'un <value> (les sous-balises, comme <stats>, sont ignorées)
+            fields[element.tag] = (element.text or '').strip()
+        elif depth == 1 and element.tag == 'value':
+            yield fields
+            fields = {}
+            element.clear()
+
+
+def parse_match(match_id: int, columns: Sequence[Optional[str]]) -> Dict[str, List[Tuple]]:
+    """Lignes des tables d'événements pour un match"""
+    goal_xml, card_xml, shoton_xml, possession_xml = columns
+    rows: Dict[str, List[Tuple]] = {'goal': [], 'card': [], 'shoton': [], 'possession': []}
+    if goal_xml:
+        for seq, value in enumerate(iter_values(goal_xml)):
+            rows['goal'].append((match_id, seq, _int(value.get('team')), _int(value.get('player1')),
+                                 _int(value.get('player2')), _int(value.get('elapsed')),
+                                 _int(value.get('elapsed_plus')), value.get('comment')))
+    if card_xml:
+        for seq, value in enumerate(iter_values(card_xml)):
+            rows['card'].append((match_id, seq, _int(value.get('team')), _int(value.get('player1')),
+                                 _int(value.get('elapsed')), value.get('card_type') or value.get('comment')))
+    if shoton_xml:
+        for seq, value in enumerate(iter_values(shoton_xml)):
+            rows['shoton'].append((match_id, seq, _int(value.get('team')), _int(value.get('player1')),
+                                   _int(value.get('elapsed'))))
+    if possession_xml:
+        for seq, value in enumerate(iter_values(possession_xml)):
+            rows['possession'].append((match_id, seq, _int(value.get('elapsed')), _int(value.get('homepos')),
+                                       _int(value.get('awaypos'))))
+    return rows
+
+
+def parse_batch(matches: List[Tuple]) -> Dict[str, List[Tuple]]:
+    """Analyse un lot de matchs (exécuté dans un processus du pool)"""
+    rows: Dict[str, List[Tuple]] = {'match': [], 'goal': [], 'card': [], 'shoton': [], 'possession': []}
+    for match_id, league_id, season, *columns in matches:
+        for table, table_rows in parse_match(match_id, columns).items():
+            rows[table].extend(table_rows)
+        rows['match'].append((match_id, league_id, season, xml_hash(columns)))
+    return rows
+
+
+def connect_cache(cache_path: str) -> sqlite3.Connection:
+    cache = sqlite3.connect(cache_path, timeout=600)
+    cache.execute("PRAGMA journal_mode = WAL")
+    if cache.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+        with cache:
+            for table in ('meta', 'match') + EVENT_COLUMNS:
+                cache.execute(f"DROP TABLE IF EXISTS {table}")
+        cache.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+    cache.executescript(CACHE_SCHEMA)
+    return cache
+
+
+def read_cache(cache_path: str, query: str):
+    """Lignes d'une requête sur le cache (lecture seule) ; None si le cache est absent ou d'une autre version"""
+    if not os.path.exists(cache_path):
+        return None
+    cache = SQLiteDataAccess(cache_path, read_only=True)
+    try:
+        if cache.query_one("PRAGMA user_version")[0] != CACHE_VERSION:
+            return None
+        return [tuple(row) for row in cache.iter_query(query)]
+    except sqlite3.OperationalError:
+        return None  # Cache créé mais pas encore initialisé
+    finally:
+        cache.close()
+
+
+def cached_source(cache_path: str) -> Optional[str]:
+    """Empreinte de la base lors de la dernière extraction complète"""
+    rows = read_cache(cache_path, "SELECT value FROM meta WHERE key = 'source'")
+    return rows[0][0] if rows else None
+
+
+def processed_hashes(cache_path: str) -> Dict[int, str]:
+    """Haché XML de chaque match déjà rangé dans le cache"""
+    return dict(read_cache(cache_path, "SELECT match_id, xml_hash FROM match") or ())
+
+
+def changed_matches(data_access: SQLiteDataAccess, processed: Dict[int, str]) -> Tuple[List[int], List[int]]:
+    """(matchs nouveaux ou modifiés, matchs supprimés de la base) par comparaison des hachés XML"""
+    pending = []
+    current = set()
+    for row in data_access.iter_query(XML_QUERY):
+        current.add(row[0])
+        if processed.get(row[0]) != xml_hash(tuple(row)[1:]):
+            pending.append(row[0])
+    return pending, [match_id for match_id in processed if match_id not in current]
+
+
+def pending_batches(data_access: SQLiteDataAccess, match_ids: Sequence[int], batch_size: int) -> Iterator[List[Tuple]]:
+    """Lots de matchs à traiter : le XML n'est lu que pour ces identifiants"""
+    for start in range(0, len(match_ids), batch_size):
+        batch = []
+        chunk = match_ids[start:start + batch_size]
+        for offset in range(0, len(chunk), MAX_PARAMETERS):
+            ids = chunk[offset:offset + MAX_PARAMETERS]
+            query = MATCH_QUERY.format(placeholders=', '.join('?' * len(ids)))
+            batch.extend(tuple(row) for row in data_access.iter_query(query, ids))
+        yield batch
+
+
+def extract_events(data_access: SQLiteDataAccess, cache_path: Optional[str] = None,
+                   workers: Optional[int] = None, batch_size: int = BATCH_MATCHES) -> int:
+    """
+    Analyse les matchs nouveaux ou modifiés et range leurs événements dans le cache
+
+    Les événements des matchs supprimés de la base sont retirés du cache.
+
+    Returns:
+        Nombre de matchs traités lors de cet appel
+    """
+    cache_path = cache_path or default_cache_path(data_access.db_path)
+    source = source_fingerprint(data_access.db_path)
+    if cached_source(cache_path) == source:
+        return 0
+    pending, removed = changed_matches(data_access, processed_hashes(cache_path))
+    # Pas plus de processus que de lots à analyser
+    workers = min(max(1, workers or os.cpu_count() or 1), -(-len(pending) // batch_size))
+    cache = connect_cache(cache_path)
+    count = 0
+
+    def delete(match_ids: List[Tuple[int]]):
+        for table in ('match',) + EVENT_COLUMNS:
+            cache.executemany(f"DELETE FROM {table} WHERE match_id = ?", match_ids)
+
+    def store(rows: Dict[str, List[Tuple]]):
+        # Un lot par transaction : un arrêt en cours de route ne perd que le lot courant.
+        # Les événements d'un match modifié sont remplacés en entier
+        with cache:
+            delete([row[:1] for row in rows['match']])
+            for table in ('goal', 'card', 'shoton', 'possession', 'match'):
+                cache.executemany(INSERTS[table], rows[table])
+
+    try:
+        with cache:
+            delete([(match_id,) for match_id in removed])
+        batches = pending_batches(data_access, pending, batch_size)
+        if workers <= 1:
+            for batch in batches:
+                store(parse_batch(batch))
+                count += len(batch)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Au plus deux lots en attente par processus : la mémoire reste bornée
+                in_flight = []
+                for batch in batches:
+                    in_flight.append((len(batch), pool.submit(parse_batch, batch)))
+                    if len(in_flight) >= 2 * workers:
+                        size, future = in_flight.pop(0)
+                        store(future.result())
+                        count += size
+                for size, future in in_flight:
+                    store(future.result())
+                    count += size
+        with cache:
+            cache.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (source,))
+    finally:
+        # Retour au journal classique si aucune autre connexion n'est ouverte : les lectures
+        # en lecture seule ne laissent alors pas de fichiers -wal/-shm à côté du cache
+        try:
+            cache.execute("PRAGMA busy_timeout = 0")
+            cache.execute("PRAGMA journal_mode = DELETE")
+        except sqlite3.OperationalError:
+            pass
+        cache.close()
+    return count
+
+
+class MatchEvents:
+    """Lectures agrégées dans la base cache des événements"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.db = SQLiteDataAccess(cache_path, read_only=True)
+
+    @classmethod
+    def open(cls, data_access: SQLiteDataAccess, cache_path: Optional[str] = None,
+             workers: Optional[int] = None) -> 'MatchEvents':
+        """Ouvre le cache de la base après l'avoir mis à jour (matchs nouveaux, modifiés ou supprimés)"""
+        cache_path = cache_path or default_cache_path(data_access.db_path)
+        extract_events(data_access, cache_path, workers)
+        return cls(cache_path)
+
+    def scorers(self, league_id: int, season: str) -> List[Dict]:
+        """Buteurs d'une saison (hors buts contre son camp), du meilleur au moins bon"""
+        return [dict(row) for row in self.db.iter_query(SCORERS_QUERY, (league_id, season))]
+
+    def goal_minutes(self, league_id: int, season: str) -> Dict[int, List[int]]:
+        """Buts par tranche de 15 minutes : team_api_id -> 6 compteurs (clé 0 : toutes équipes)"""
+        minutes = {0: [0] * len(MINUTE_BUCKETS)}
+        for row in self.db.iter_query(GOAL_MINUTES_QUERY, (league_id, season)):
+            minutes.setdefault(row['team_api_id'], [0] * len(MINUTE_BUCKETS))[row['bucket']] += row['goals']
+            minutes[0][row['bucket']] += row['goals']
+        return minutes
+
+    def cards(self, league_id: int, season: str) -> Dict[int, Dict]:
+        """Cartons jaunes et rouges par équipe"""
+        return {row['team_api_id']: {'yellow': row['yellow'], 'red': row['red']}
+                for row in self.db.iter_query(CARDS_QUERY, (league_id, season))}
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Extraction des événements XML de la table Match")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--cache", default=None, help="Base cache (par défaut : <db>.events.sqlite)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_MATCHES, help="Matchs analysés par tâche")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    cache_path = args.cache or default_cache_path(args.db)
+
+    print("=" * 60)
+    print("ÉVÉNEMENTS DE MATCH (XML)")
+    print("=" * 60)
+    start = time.perf_counter()
+    count = extract_events(data_access, cache_path, args.workers, args.batch_size)
+    print(f"\n✓ {count} nouveaux matchs analysés en {time.perf_counter() - start:.2f} s ({cache_path})")
+
+    cache = sqlite3.connect(cache_path)
+    for table in ('match', 'goal', 'card', 'shoton', 'possession'):
+        print(f"  {table:<12} {cache.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]:>9} lignes")
+    cache.close()
+    data_access.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Table de matchs en colonnes (MatchTable) avec équipes internées
+Auteur: T. E. G. - Web Sémantique
+
+Au lieu d'un dict par match portant les noms longs et courts des équipes, chaque
+équipe, date et saison est internée une seule fois et les matchs sont stockés
+dans des tableaux NumPy typés (une colonne par champ). Des vues de lignes
+(MatchRow) exposent l'interface dict utilisée par les méthodes generate_*.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+# Champs exposés par une ligne, dans l'ordre de la requête de get_matches
+MATCH_FIELDS = (
+    'id', 'date', 'season', 'stage',
+    'home_team', 'home_team_short', 'away_team', 'away_team_short',
+    'home_team_goal', 'away_team_goal',
+    'home_team_api_id', 'away_team_api_id',
+)
+
+
+class MatchRow(Mapping):
+    """Vue en lecture seule sur une ligne de MatchTable (se comporte comme un dict)"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'MatchTable', index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key):
+        table = self._table
+        i = self._index
+        if key == 'id':
+            return int(table.ids[i])
+        if key == 'date':
+            return table.date_values[table.date_codes[i]]
+        if key == 'season':
+            return table.season_values[table.season_codes[i]]
+        if key == 'stage':
+            return int(table.stages[i])
+        if key == 'home_team':
+            return table.team_names[table.home_codes[i]]
+        if key == 'home_team_short':
+            return table.team_short_names[table.home_codes[i]]
+        if key == 'away_team':
+            return table.team_names[table.away_codes[i]]
+        if key == 'away_team_short':
+            return table.team_short_names[table.away_codes[i]]
+        if key == 'home_team_goal':
+            return int(table.home_goals[i])
+        if key == 'away_team_goal':
+            return int(table.away_goals[i])
+        if key == 'home_team_api_id':
+            return table.team_api_ids[table.home_codes[i]]
+        if key == 'away_team_api_id':
+            return table.team_api_ids[table.away_codes[i]]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(MATCH_FIELDS)
+
+    def __len__(self):
+        return len(MATCH_FIELDS)
+
+    @property
+    def index(self) -> int:
+        """Position de la ligne dans la table"""
+        return self._index
+
+    def __repr__(self):
+        return f"MatchRow({dict(self)!r})"
+
+
+class MatchTable:
+    """
+    Matchs d'une ou plusieurs saisons stockés en colonnes typées
+
+    Colonnes (une valeur par match) :
+        ids:           identifiant du match (int64)
+        date_codes:    indice dans date_values (int32)
+        season_codes:  indice dans season_values (int16)
+        stages:        journée du match (int16)
+        home_codes:    indice interne de l'équipe à domicile (int32)
+        away_codes:    indice interne de l'équipe à l'extérieur (int32)
+        home_goals, away_goals: buts (int16)
+
+    Équipes internées (une valeur par équipe, indexées par code) :
+        team_api_ids, team_names, team_short_names
+
+    La table offre des index par équipe
+    (team_matches, home_matches, away_matches, team_ids...).
+    """
+
+    def __init__(self, rows: Iterable[Mapping] = ()):
+        team_codes: Dict[int, int] = {}
+        date_codes: Dict[str, int] = {}
+        season_codes: Dict[str, int] = {}
+        self.team_api_ids: List[int] = []
+        self.team_names: List[str] = []
+        self.team_short_names: List[str] = []
+        self.date_values: List[str] = []
+        self.season_values: List[str] = []
+
+        ids, dates, seasons, stages, homes, aways, home_goals, away_goals = [], [], [], [], [], [], [], []
+
+        def intern_team(api_id, name, short_name):
+            code = team_codes.get(api_id)
+            if code is None:
+                code = team_codes[api_id] = len(self.team_api_ids)
+                self.team_api_ids.append(api_id)
+                self.team_names.append(name)
+                self.team_short_names.append(short_name)
+            return code
+
+        def intern(values: Dict[str, int], table: List[str], value: str) -> int:
+            code = values.get(value)
+            if code is None:
+                code = values[value] = len(table)
+                table.append(value)
+            return code
+
+        for row in rows:
+            ids.append(row['id'])
+            dates.append(intern(date_codes, self.date_values, row['date']))
+            seasons.append(intern(season_codes, self.season_values, row['season']))
+            stages.append(row['stage'])
+            homes.append(intern_team(row['home_team_api_id'], row['home_team'], row['home_team_short']))
+            aways.append(intern_team(row['away_team_api_id'], row['away_team'], row['away_team_short']))
+            home_goals.append(row['home_team_goal'])
+            away_goals.append(row['away_team_goal'])
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.date_codes = np.array(dates, dtype=np.int32)
+        self.season_codes = np.array(seasons, dtype=np.int16)
+        self.stages = np.array(stages, dtype=np.int16)
+        self.home_codes = np.array(homes, dtype=np.int32)
+        self.away_codes = np.array(aways, dtype=np.int32)
+        self.home_goals = np.array(home_goals, dtype=np.int16)
+        self.away_goals = np.array(away_goals, dtype=np.int16)
+
+        self.team_ids: Dict[str, int] = {}
+        for name, api_id in zip(self.team_names, self.team_api_ids):
+            self.team_ids.setdefault(name, api_id)
+        self._team_codes = team_codes
+        self._build_team_index()
+
+    def _build_team_index(self):
+        """Construit les positions des matchs de chaque équipe (domicile, extérieur, tous)"""
+        n_teams = len(self.team_api_ids)
+
+        def group(codes: np.ndarray) -> List[np.ndarray]:
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(n_teams + 1))
+            return [order[bounds[c]:bounds[c + 1]] for c in range(n_teams)]
+
+        self._home_rows = group(self.home_codes)
+        self._away_rows = group(self.away_codes)
+        self._team_rows = [np.union1d(home, away) for home, away in zip(self._home_rows, self._away_rows)]
+
+    # ------------------------------------------------------------------
+    # Accès séquentiel (compatible avec une liste de dicts)
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MatchRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("indice de match hors limites")
+        return MatchRow(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield MatchRow(self, i)
+
+    def rows(self, positions: Iterable[int]) -> List[MatchRow]:
+        """Vues de lignes pour une liste de positions"""
+        return [MatchRow(self, int(i)) for i in positions]
+
+    # ------------------------------------------------------------------
+    # Index par équipe
+    # ------------------------------------------------------------------
+    def team_code(self, team_api_id: int) -> Optional[int]:
+        """Code interne d'une équipe à partir de son team_api_id"""
+        return self._team_codes.get(team_api_id)
+
+    def team_api_id(self, team_name: str) -> Optional[int]:
+        """Retourne le team_api_id d'une équipe à partir de son nom long"""
+        return self.team_ids.get(team_name)
+
+    def team_matches(self, team_api_id: int) -> List[MatchRow]:
+        """Tous les matchs d'une équipe (domicile et extérieur)"""
+        code = self.team_code(team_api_id)
+        return [] if code is None else self.rows(self._team_rows[code])
+
+    def home_matches(self, team_api_id: int) -> List[MatchRow]:
+        """Matchs joués à domicile par une équipe"""
+        code = self.team_code(team_api_id)
+        return [] if code is None else self.rows(self._home_rows[code])
+
+    def away_matches(self, team_api_id: int) -> List[MatchRow]:
+        """Matchs joués à l'extérieur par une équipe"""
+        code = self.team_code(team_api_id)
+        return [] if code is None else self.rows(self._away_rows[code])
+
+    @property
+    def by_team(self) -> Dict[int, List[MatchRow]]:
+        return {api_id: self.team_matches(api_id) for api_id in self.team_api_ids}
+
+    @property
+    def home_by_team(self) -> Dict[int, List[MatchRow]]:
+        return {api_id: self.home_matches(api_id) for api_id in self.team_api_ids
+                if len(self._home_rows[self._team_codes[api_id]])}
+
+    @property
+    def away_by_team(self) -> Dict[int, List[MatchRow]]:
+        return {api_id: self.away_matches(api_id) for api_id in self.team_api_ids
+                if len(self._away_rows[self._team_codes[api_id]])}
+
+    # ------------------------------------------------------------------
+    # Colonnes pour le noyau vectorisé
+    # ------------------------------------------------------------------
+    def kernel_arrays(self):
+        """Retourne (home_ids, away_ids, home_goals, away_goals) sans parcourir les lignes"""
+        api_ids = np.array(self.team_api_ids, dtype=np.int64)
+        return (api_ids[self.home_codes], api_ids[self.away_codes],
+                self.home_goals.astype(np.int64), self.away_goals.astype(np.int64))
+
+    def nbytes(self) -> int:
+        """Taille approximative des colonnes typées (en octets)"""
+        return sum(column.nbytes for column in (
+            self.ids, self.date_codes, self.season_codes, self.stages, self.home_codes,
+            self.away_codes, self.home_goals, self.away_goals))
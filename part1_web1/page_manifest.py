@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Manifeste de génération : empreintes des entrées et hachés du contenu de chaque page
+Auteur: T. E. G. - Web Sémantique
+
+Le manifeste (.manifest.json dans le dossier de sortie) permet de ne réécrire
+que les pages dont les entrées ont changé. Les pages inchangées gardent leur
+date de modification, ce qui évite à l'enrichissement RDFa et au crawler de
+tout retraiter.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+MANIFEST_NAME = '.manifest.json'
+
+
+def fingerprint(*parts) -> str:
+    """Empreinte SHA-256 d'une structure de données (dicts, listes, vues de lignes...)"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=dict)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    """Haché SHA-256 du contenu d'un fichier"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PageManifest:
+    """Empreintes des entrées et des sorties des pages d'un dossier de sortie"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.source: Optional[str] = None
+        self.pages: Dict[str, Dict] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.source = data.get('source')
+            self.pages = data.get('pages', {})
+        except (OSError, ValueError):
+            pass
+
+    def _output_unchanged(self, filename: str, entry: Dict) -> bool:
+        """Vérifie que le fichier de sortie est toujours celui enregistré"""
+        try:
+            stat = os.stat(os.path.join(self.output_dir, filename))
+        except OSError:
+            return False
+        if stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns'):
+            return True
+        # Date modifiée (copie, checkout...) : on compare le contenu
+        if file_hash(os.path.join(self.output_dir, filename)) == entry.get('output'):
+            entry['size'], entry['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+            return True
+        return False
+
+    def up_to_date(self, source: str) -> bool:
+        """Vrai si la source n'a pas changé et que toutes les pages sont intactes"""
+        return (self.source == source and bool(self.pages)
+                and all(self._output_unchanged(name, entry) for name, entry in self.pages.items()))
+
+    def is_current(self, filename: str, input_fingerprint: str) -> bool:
+        """Vrai si la page a été générée avec les mêmes entrées et n'a pas été modifiée"""
+        entry = self.pages.get(filename)
+        return (entry is not None and entry.get('input') == input_fingerprint
+                and self._output_unchanged(filename, entry))
+
+    def record(self, filename: str, input_fingerprint: str):
+        """Enregistre l'empreinte d'entrée et le haché du contenu d'une page écrite"""
+        path = os.path.join(self.output_dir, filename)
+        stat = os.stat(path)
+        self.pages[filename] = {
+            'input': input_fingerprint,
+            'output': file_hash(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+
+    def save(self, source: str, filenames):
+        """Écrit le manifeste (seules les pages de la génération courante sont conservées)"""
+        self.source = source
+        self.pages = {name: self.pages[name] for name in filenames if name in self.pages}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': self.source, 'pages': self.pages}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Table des apparitions des joueurs (compositions d'équipe de la table Match)
+Auteur: T. E. G. - Web Sémantique
+Usage: python player_appearances.py [--db database.sqlite] [--cache database.sqlite.players.sqlite]
+
+La table Match stocke les compositions sur 22 colonnes (home_player_1..11,
+away_player_1..11, avec leurs coordonnées X/Y sur le terrain). Elles sont
+dépivotées une seule fois dans une base cache étroite : une ligne par
+(match, équipe, joueur). La lecture de Match se fait en flux et les lignes
+sont insérées par lots ; les index (équipe, saison) et (joueur, date) sont
+créés après le chargement. Effectifs et parcours des joueurs sont ensuite
+des lectures indexées.
+
+Le cache porte l'empreinte de la base source (chemin, taille, date) : il est
+reconstruit automatiquement si la base change. La construction se fait dans
+un fichier temporaire renommé à la fin (générations parallèles possibles).
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from db_access import SQLiteDataAccess
+from page_manifest import fingerprint
+
+LINEUP_SIZE = 11
+SIDES = ('home', 'away')
+
+# Lignes insérées par appel à executemany
+BATCH_ROWS = 50_000
+
+LINEUP_QUERY = f"""
+SELECT id, league_id, season, date, home_team_api_id, away_team_api_id,
+       {', '.join(f'{side}_player_{i}' for side in SIDES for i in range(1, LINEUP_SIZE + 1))},
+       {', '.join(f'{side}_player_X{i}' for side in SIDES for i in range(1, LINEUP_SIZE + 1))},
+       {', '.join(f'{side}_player_Y{i}' for side in SIDES for i in range(1, LINEUP_SIZE + 1))}
+FROM Match
+"""
+
+CACHE_SCHEMA = """
+CREATE TABLE appearance (
+    match_id INTEGER NOT NULL,
+    league_id INTEGER NOT NULL,
+    season TEXT NOT NULL,
+    date TEXT NOT NULL,
+    team_api_id INTEGER NOT NULL,
+    player_api_id INTEGER NOT NULL,
+    home INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    x INTEGER,
+    y INTEGER,
+    PRIMARY KEY (match_id, team_api_id, player_api_id)
+) WITHOUT ROWID;
+CREATE TABLE player (
+    player_api_id INTEGER PRIMARY KEY,
+    player_name TEXT,
+    birthday TEXT,
+    height REAL,
+    weight REAL
+);
+CREATE TABLE team (
+    team_api_id INTEGER PRIMARY KEY,
+    team_long_name TEXT
+);
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+CACHE_INDEXES = """
+CREATE INDEX appearance_team_season ON appearance (team_api_id, season, player_api_id);
+CREATE INDEX appearance_player_date ON appearance (player_api_id, date);
+"""
+
+SQUAD_QUERY = """
+SELECT a.player_api_id, COALESCE(p.player_name, 'Joueur ' || a.player_api_id) AS player_name,
+       COUNT(*) AS appearances, MIN(a.date) AS first_date, MAX(a.date) AS last_date
+FROM appearance a
+LEFT JOIN player p ON p.player_api_id = a.player_api_id
+WHERE a.team_api_id = ? AND a.season = ?
+GROUP BY a.player_api_id
+ORDER BY appearances DESC, player_name
+"""
+
+PLAYER_QUERY = """
+SELECT player_api_id, player_name, birthday, height, weight FROM player WHERE player_api_id = ?
+"""
+
+CAREER_QUERY = """
+SELECT a.season, a.team_api_id, COALESCE(t.team_long_name, a.team_api_id) AS team,
+       COUNT(*) AS appearances
+FROM appearance a
+LEFT JOIN team t ON t.team_api_id = a.team_api_id
+WHERE a.player_api_id = ?
+GROUP BY a.season, a.team_api_id
+ORDER BY MIN(a.date)
+"""
+
+PLAYER_MATCHES_QUERY = """
+SELECT match_id FROM appearance WHERE player_api_id = ? AND season = ? ORDER BY date
+"""
+
+
+def default_cache_path(db_path: str) -> str:
+    """Base cache placée à côté de la base source"""
+    return db_path + '.players.sqlite'
+
+
+def source_fingerprint(db_path: str) -> str:
+    stat = os.stat(db_path)
+    return fingerprint(os.path.abspath(db_path), stat.st_size, stat.st_mtime_ns)
+
+
+def unpivot(rows: Iterator[sqlite3.Row]) -> Iterator[Tuple]:
+    """Une ligne d'apparition par joueur renseigné de chaque composition"""
+    n_players = 2 * LINEUP_SIZE
+    for row in rows:
+        match_id, league_id, season, date = row[0], row[1], row[2], row[3]
+        team_ids = (row[4], row[5])
+        for k in range(n_players):
+            player_api_id = row[6 + k]
+            if player_api_id is None:
+                continue
+            side = k // LINEUP_SIZE
+            yield (match_id, league_id, season, date, team_ids[side], player_api_id,
+                   1 - side, k % LINEUP_SIZE + 1, row[6 + n_players + k], row[6 + 2 * n_players + k])
+
+
+def build_cache(data_access: SQLiteDataAccess, cache_path: str) -> int:
+    """
+    Dépivote les compositions de Match dans une nouvelle base cache
+
+    Returns:
+        Nombre d'apparitions écrites
+    """
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    cache = sqlite3.connect(tmp_path)
+    try:
+        cache.execute("PRAGMA journal_mode = OFF")
+        cache.execute("PRAGMA synchronous = OFF")
+        cache.executescript(CACHE_SCHEMA)
+
+        count = 0
+        appearances = unpivot(data_access.iter_query(LINEUP_QUERY))
+        insert = "INSERT OR IGNORE INTO appearance VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        batch = []
+        for appearance in appearances:
+            batch.append(appearance)
+            if len(batch) >= BATCH_ROWS:
+                cache.executemany(insert, batch)
+                count += len(batch)
+                batch = []
+        cache.executemany(insert, batch)
+        count += len(batch)
+
+        cache.executemany("INSERT INTO player VALUES (?, ?, ?, ?, ?)",
+                          (tuple(row) for row in data_access.iter_query(
+                              "SELECT player_api_id, player_name, birthday, height, weight FROM Player")))
+        cache.executemany("INSERT OR IGNORE INTO team VALUES (?, ?)",
+                          (tuple(row) for row in data_access.iter_query(
+                              "SELECT team_api_id, team_long_name FROM Team")))
+        cache.executescript(CACHE_INDEXES)
+        cache.execute("INSERT INTO meta VALUES ('source', ?)", (source_fingerprint(data_access.db_path),))
+        cache.commit()
+    except BaseException:
+        cache.close()
+        os.remove(tmp_path)
+        raise
+    cache.close()
+    os.replace(tmp_path, cache_path)
+    return count
+
+
+def cache_is_current(cache_path: str, db_path: str) -> bool:
+    """Vrai si le cache existe et a été construit à partir de la base dans son état actuel"""
+    if not os.path.exists(cache_path):
+        return False
+    try:
+        cache = sqlite3.connect(f"file:{cache_path}?mode=ro", uri=True)
+        try:
+            row = cache.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        finally:
+            cache.close()
+    except sqlite3.DatabaseError:
+        return False
+    return row is not None and row[0] == source_fingerprint(db_path)
+
+
+def ensure_cache(data_access: SQLiteDataAccess, cache_path: Optional[str] = None) -> str:
+    """Construit le cache s'il est absent ou périmé ; retourne son chemin"""
+    cache_path = cache_path or default_cache_path(data_access.db_path)
+    if not cache_is_current(cache_path, data_access.db_path):
+        build_cache(data_access, cache_path)
+    return cache_path
+
+
+class PlayerAppearances:
+    """Lectures indexées dans la base cache des apparitions"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.db = SQLiteDataAccess(cache_path, read_only=True)
+
+    @classmethod
+    def open(cls, data_access: SQLiteDataAccess, cache_path: Optional[str] = None) -> 'PlayerAppearances':
+        """Ouvre le cache de la base, après l'avoir (re)construit si nécessaire"""
+        return cls(ensure_cache(data_access, cache_path))
+
+    def squad(self, team_api_id: int, season: str) -> List[Dict]:
+        """Joueurs utilisés par une équipe pendant une saison (les plus utilisés d'abord)"""
+        return [dict(row) for row in self.db.iter_query(SQUAD_QUERY, (team_api_id, season))]
+
+    def player(self, player_api_id: int) -> Optional[Dict]:
+        """Fiche d'un joueur (None s'il est absent de la table Player)"""
+        row = self.db.query_one(PLAYER_QUERY, (player_api_id,))
+        return dict(row) if row else None
+
+    def career(self, player_api_id: int) -> List[Dict]:
+        """Apparitions d'un joueur par saison et par équipe, dans l'ordre chronologique"""
+        return [dict(row) for row in self.db.iter_query(CAREER_QUERY, (player_api_id,))]
+
+    def match_ids(self, player_api_id: int, season: str) -> List[int]:
+        """Matchs d'une saison dans lesquels le joueur a été aligné"""
+        return [row['match_id'] for row in self.db.iter_query(PLAYER_MATCHES_QUERY, (player_api_id, season))]
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Table des apparitions des joueurs (compositions de Match)")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--cache", default=None, help="Base cache (par défaut : <db>.players.sqlite)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    cache_path = args.cache or default_cache_path(args.db)
+
+    print("=" * 60)
+    print("TABLE DES APPARITIONS DES JOUEURS")
+    print("=" * 60)
+    start = time.perf_counter()
+    count = build_cache(data_access, cache_path)
+    print(f"\n✓ {count} apparitions écrites dans {cache_path} en {time.perf_counter() - start:.2f} s")
+
+    appearances = PlayerAppearances(cache_path)
+    team = data_access.query_one("SELECT home_team_api_id AS team_api_id, season FROM Match LIMIT 1")
+    if team:
+        start = time.perf_counter()
+        squad = appearances.squad(team['team_api_id'], team['season'])
+        print(f"✓ Effectif de l'équipe {team['team_api_id']} ({team['season']}) : {len(squad)} joueurs, "
+              f"lu en {(time.perf_counter() - start) * 1000:.1f} ms")
+    appearances.close()
+    data_access.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Recherche de joueurs similaires (attributs de la table Player_Attributes)
+Auteur: T. E. G. - Web Sémantique
+Usage: python player_similarity.py [--db database.sqlite] [--player 30001] [--k 10] [--metric cosine]
+
+Pour chaque joueur, le dernier relevé de Player_Attributes donne un vecteur
+de 35 attributs numériques. Les attributs sont centrés-réduits (valeurs
+manquantes remplacées par la moyenne) puis la matrice joueurs × attributs
+(float32) est enregistrée dans un cache .npy ouvert en projection mémoire
+(memmap) : seules les pages lues sont chargées. Une recherche est un produit
+matrice-vecteur suivi d'une sélection partielle (argpartition) des k
+meilleurs, en similarité cosinus ou en distance euclidienne.
+
+Le cache porte l'empreinte de la base (chemin, taille, date) et n'est
+reconstruit que si elle change.
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from db_access import SQLiteDataAccess
+from page_manifest import fingerprint
+
+ATTRIBUTES = (
+    'overall_rating', 'potential', 'crossing', 'finishing', 'heading_accuracy', 'short_passing', 'volleys',
+    'dribbling', 'curve', 'free_kick_accuracy', 'long_passing', 'ball_control', 'acceleration', 'sprint_speed',
+    'agility', 'reactions', 'balance', 'shot_power', 'jumping', 'stamina', 'strength', 'long_shots',
+    'aggression', 'interceptions', 'positioning', 'vision', 'penalties', 'marking', 'standing_tackle',
+    'sliding_tackle', 'gk_diving', 'gk_handling', 'gk_kicking', 'gk_positioning', 'gk_reflexes',
+)
+
+METRICS = ('cosine', 'euclidean')
+
+SNAPSHOT_QUERY = f"""
+SELECT player_api_id, {', '.join(ATTRIBUTES)}
+FROM Player_Attributes
+ORDER BY player_api_id, date, id
+"""
+
+# Requêtes traitées par bloc dans most_similar_batch (bloc × joueurs scores en mémoire)
+QUERY_BLOCK = 256
+
+
+def default_cache_dir(db_path: str) -> str:
+    """Dossier cache placé à côté de la base"""
+    return db_path + '.similarity'
+
+
+def source_fingerprint(db_path: str) -> str:
+    stat = os.stat(db_path)
+    return fingerprint(os.path.abspath(db_path), stat.st_size, stat.st_mtime_ns, ATTRIBUTES)
+
+
+def latest_snapshots(data_access: SQLiteDataAccess):
+    """(player_api_id triés, matrice float64 des attributs du dernier relevé, NaN si manquant)"""
+    latest: Dict[int, tuple] = {}
+    for row in data_access.iter_query(SNAPSHOT_QUERY):
+        # Relevés triés par date : le dernier lu est le plus récent
+        latest[row[0]] = tuple(row)[1:]
+    ids = np.array(sorted(latest), dtype=np.int64)
+    values = np.array([latest[player_api_id] for player_api_id in ids.tolist()], dtype=np.float64)
+    return ids, values.reshape(len(ids), len(ATTRIBUTES))
+
+
+def normalize(values: np.ndarray) -> np.ndarray:
+    """Attributs centrés-réduits ; une valeur manquante vaut la moyenne (0)"""
+    mean = np.nanmean(values, axis=0) if len(values) else np.zeros(values.shape[1])
+    std = np.nanstd(values, axis=0) if len(values) else np.ones(values.shape[1])
+    mean = np.nan_to_num(mean)
+    std = np.where(np.nan_to_num(std) > 0, np.nan_to_num(std), 1.0)
+    return np.nan_to_num((values - mean) / std).astype(np.float32)
+
+
+def _save_array(path: str, array: np.ndarray):
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def build_cache(data_access: SQLiteDataAccess, cache_dir: str) -> int:
+    """Construit le cache (identifiants, matrice normalisée, normes) ; retourne le nombre de joueurs"""
+    os.makedirs(cache_dir, exist_ok=True)
+    ids, values = latest_snapshots(data_access)
+    matrix = normalize(values)
+    _save_array(os.path.join(cache_dir, 'ids.npy'), ids)
+    _save_array(os.path.join(cache_dir, 'matrix.npy'), matrix)
+    _save_array(os.path.join(cache_dir, 'norms.npy'), np.linalg.norm(matrix, axis=1).astype(np.float32))
+    # Écrit en dernier : un cache sans meta.json à jour est considéré comme absent
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'source': source_fingerprint(data_access.db_path), 'players': len(ids)}, f)
+    os.replace(tmp_path, meta_path)
+    return len(ids)
+
+
+def cache_is_current(cache_dir: str, db_path: str) -> bool:
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), encoding='utf-8') as f:
+            return json.load(f).get('source') == source_fingerprint(db_path)
+    except (OSError, ValueError):
+        return False
+
+
+class PlayerSimilarity:
+    """Index de similarité des joueurs, lu en projection mémoire"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.ids = np.load(os.path.join(cache_dir, 'ids.npy'))
+        self.matrix = np.load(os.path.join(cache_dir, 'matrix.npy'), mmap_mode='r')
+        self.norms = np.load(os.path.join(cache_dir, 'norms.npy'))
+
+    @classmethod
+    def open(cls, data_access: SQLiteDataAccess, cache_dir: Optional[str] = None) -> 'PlayerSimilarity':
+        """Ouvre le cache de la base, après l'avoir (re)construit si nécessaire"""
+        cache_dir = cache_dir or default_cache_dir(data_access.db_path)
+        if not cache_is_current(cache_dir, data_access.db_path):
+            build_cache(data_access, cache_dir)
+        return cls(cache_dir)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, player_api_id: int) -> Optional[int]:
+        """Ligne d'un joueur dans la matrice (None s'il n'a aucun relevé)"""
+        position = int(np.searchsorted(self.ids, player_api_id))
+        if position < len(self.ids) and self.ids[position] == player_api_id:
+            return position
+        return None
+
+    def scores(self, rows: np.ndarray, metric: str = 'cosine') -> np.ndarray:
+        """Scores (plus grand = plus proche) des joueurs demandés contre tous les joueurs"""
+        if metric not in METRICS:
+            raise ValueError(f"Métrique inconnue : {metric} (attendu : {', '.join(METRICS)})")
+        queries = np.asarray(self.matrix[rows])
+        dot = queries @ np.asarray(self.matrix).T
+        query_norms = self.norms[rows][:, None]
+        if metric == 'cosine':
+            return dot / np.maximum(query_norms * self.norms[None, :], 1e-12)
+        # Distance euclidienne, négative pour que le plus grand score soit le plus proche
+        return -np.sqrt(np.maximum(query_norms ** 2 + self.norms[None, :] ** 2 - 2 * dot, 0.0))
+
+    def most_similar_batch(self, player_api_ids: Iterable[int], k: int = 5,
+                           metric: str = 'cosine') -> Dict[int, List[Dict]]:
+        """
+        k joueurs les plus proches de chaque joueur demandé (lui-même exclu)
+
+        Returns:
+            player_api_id -> [{'player_api_id', 'score'}] du plus proche au moins proche ;
+            score = similarité cosinus, ou distance euclidienne (attributs centrés-réduits)
+        """
+        wanted = [(player_api_id, self.row(player_api_id)) for player_api_id in player_api_ids]
+        wanted = [(player_api_id, row) for player_api_id, row in wanted if row is not None]
+        results = {}
+        k = min(k, len(self.ids) - 1)
+        if k <= 0:
+            return results
+        for start in range(0, len(wanted), QUERY_BLOCK):
+            block = wanted[start:start + QUERY_BLOCK]
+            rows = np.array([row for _, row in block])
+            scores = self.scores(rows, metric)
+            scores[np.arange(len(rows)), rows] = -np.inf
+            # Sélection partielle des k meilleurs puis tri de ces seuls k
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for (player_api_id, _), neighbours, values in zip(block, top.tolist(), top_scores.tolist()):
+                results[player_api_id] = [{'player_api_id': int(self.ids[neighbour]),
+                                           'score': float(value if metric == 'cosine' else -value)}
+                                          for neighbour, value in zip(neighbours, values)]
+        return results
+
+    def most_similar(self, player_api_id: int, k: int = 5, metric: str = 'cosine') -> List[Dict]:
+        """k joueurs les plus proches d'un joueur ([] s'il n'a aucun relevé)"""
+        return self.most_similar_batch([player_api_id], k, metric).get(player_api_id, [])
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Joueurs les plus similaires (Player_Attributes)")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--cache", default=None, help="Dossier cache (par défaut : <db>.similarity)")
+    parser.add_argument("--player", type=int, default=None, help="player_api_id (par défaut : le premier)")
+    parser.add_argument("--k", type=int, default=10, help="Nombre de joueurs similaires")
+    parser.add_argument("--metric", choices=METRICS, default="cosine", help="Similarité cosinus ou distance euclidienne")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    cache_dir = args.cache or default_cache_dir(args.db)
+
+    print("=" * 60)
+    print("JOUEURS SIMILAIRES")
+    print("=" * 60)
+    start = time.perf_counter()
+    similarity = PlayerSimilarity.open(data_access, cache_dir)
+    print(f"\n✓ {len(similarity)} joueurs indexés ({cache_dir}) en {time.perf_counter() - start:.2f} s")
+    if not len(similarity):
+        return
+
+    player_api_id = args.player if args.player is not None else int(similarity.ids[0])
+    start = time.perf_counter()
+    neighbours = similarity.most_similar(player_api_id, args.k, args.metric)
+    print(f"✓ Requête en {(time.perf_counter() - start) * 1000:.2f} ms\n")
+
+    names = {row['player_api_id']: row['player_name']
+             for row in data_access.iter_query("SELECT player_api_id, player_name FROM Player")}
+    print(f"Joueurs les plus proches de {names.get(player_api_id, player_api_id)} ({args.metric}) :")
+    for neighbour in neighbours:
+        print(f"  {names.get(neighbour['player_api_id'], neighbour['player_api_id']):<32} {neighbour['score']:>8.3f}")
+    data_access.close()
+
+
+if __name__ == "__main__":
+    main()
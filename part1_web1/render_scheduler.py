@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Ordonnanceur de rendu des pages HTML d'une saison
+Auteur: T. E. G. - Web Sémantique
+
+Une fois le classement et les statistiques calculés, chaque page (index,
+classement, calendrier et ses tranches, statistiques, journées,
+confrontations, Elo, pages d'équipes et de joueurs) est une tâche
+indépendante : elle est rendue puis écrite par un pool de threads ou de
+processus. Les fonctions de rendu sont celles du générateur, le contenu des
+fichiers est donc identique octet pour octet à la génération séquentielle.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from calendar_writer import write_chunks
+
+EXECUTORS = ('thread', 'process')
+
+# Pages écrites en flux, par morceaux (calendrier complet et tranches)
+STREAMED_KINDS = ('calendar', 'calendar_slice')
+
+
+class PageTask(NamedTuple):
+    """Une page à générer : nom de fichier, type de page et équipe éventuelle"""
+    filename: str
+    kind: str
+    team_name: Optional[str] = None
+
+
+def team_trajectory(context: Dict, team_name: str):
+    """Trajectoire d'une équipe au classement (date, position, points) après chacun de ses matchs"""
+    team_api_id = context['matches'].team_api_id(team_name)
+    return context['history'].trajectory(team_api_id)
+
+
+def team_streaks(context: Dict, team_name: str) -> Optional[Dict]:
+    """Séries et forme d'une équipe sur la saison"""
+    return context['streaks'].get(context['matches'].team_api_id(team_name))
+
+
+def team_squad(context: Dict, team_name: str) -> Optional[List[Dict]]:
+    """Joueurs alignés par une équipe pendant la saison"""
+    return context['squads'].get(context['matches'].team_api_id(team_name))
+
+
+def team_events(context: Dict, team_name: str) -> Optional[Dict]:
+    """Buteurs, minutes des buts et cartons d'une équipe sur la saison"""
+    if not context['events']:
+        return None
+    return context['events']['teams'].get(context['matches'].team_api_id(team_name))
+
+
+def team_odds(context: Dict, team_name: str) -> Optional[Dict]:
+    """Points attendus d'après les cotes et résultats en favori / outsider d'une équipe"""
+    if not context['odds']:
+        return None
+    return context['odds']['teams'].get(context['matches'].team_api_id(team_name))
+
+
+def team_tactics(context: Dict, team_name: str) -> Optional[List[Dict]]:
+    """Profils tactiques successifs d'une équipe pendant la saison, avec ses résultats"""
+    return context['tactics'].get(context['matches'].team_api_id(team_name))
+
+
+def team_style(context: Dict, team_name: str) -> Optional[Dict]:
+    """Groupe de style d'une équipe et équipes-saisons au style le plus proche"""
+    return context['styles'].get(context['matches'].team_api_id(team_name))
+
+
+def render_html(generator, context: Dict, task: PageTask) -> str:
+    """Construit le HTML d'une page à partir du contexte partagé de la saison"""
+    standings = context['standings']
+    stats = context['stats']
+    if task.kind == 'index':
+        return generator.render_index_page(standings, stats, context['top_teams'])
+    if task.kind == 'standings':
+        return generator.render_standings_page(standings)
+    if task.kind == 'calendar':
+        return generator.render_calendar_page(context['matches'])
+    if task.kind == 'calendar_index':
+        return generator.render_calendar_index_page(list(context['calendar_slices'].values()))
+    if task.kind == 'calendar_slice':
+        calendar_slice = context['calendar_slices'][task.filename]
+        return generator.render_calendar_page(calendar_slice.matches, calendar_slice.label)
+    if task.kind == 'statistics':
+        return generator.render_statistics_page(stats, context['strengths'], context['streaks'], context['events'],
+                                                context['odds'])
+    if task.kind == 'matchdays':
+        return generator.render_matchday_standings_page(context['matchday_history'])
+    if task.kind == 'head_to_head':
+        return generator.render_head_to_head_page(context['head_to_head'], standings)
+    if task.kind == 'elo':
+        return generator.render_elo_page(context['elo'])
+    if task.kind == 'team':
+        team_matches = generator.get_team_matches(context['matches'], task.team_name)
+        return generator.render_team_page(task.team_name, team_matches, standings,
+                                          team_trajectory(context, task.team_name),
+                                          team_streaks(context, task.team_name),
+                                          team_squad(context, task.team_name),
+                                          team_events(context, task.team_name),
+                                          team_odds(context, task.team_name),
+                                          team_tactics(context, task.team_name),
+                                          team_style(context, task.team_name))
+    if task.kind == 'player':
+        return generator.render_player_page(context['players'][task.filename])
+    raise ValueError(f"Type de page inconnu : {task.kind}")
+
+
+def page_chunks(generator, context: Dict, task: PageTask):
+    """Morceaux HTML d'une page écrite en flux (voir STREAMED_KINDS)"""
+    if task.kind == 'calendar':
+        return generator.calendar_chunks(context['matches'])
+    if task.kind == 'calendar_slice':
+        calendar_slice = context['calendar_slices'][task.filename]
+        return generator.calendar_chunks(calendar_slice.matches, calendar_slice.label)
+    raise ValueError(f"Page non écrite en flux : {task.kind}")
+
+
+def render_page(generator, context: Dict, task: PageTask) -> str:
+    """Rend et écrit une page à partir du contexte partagé de la saison"""
+    if task.kind in STREAMED_KINDS:
+        # Calendrier écrit en flux, sans assembler la page complète en mémoire
+        write_chunks(os.path.join(generator.output_dir, task.filename), page_chunks(generator, context, task))
+    else:
+        generator.write_page(task.filename, render_html(generator, context, task))
+    return task.filename
+
+
+def page_inputs(generator, context: Dict, task: PageTask):
+    """Données dont dépend le contenu d'une page (utilisées pour son empreinte)"""
+    standings = context['standings']
+    stats = context['stats']
+    if task.kind == 'index':
+        return standings[:generator.num_teams], stats, context['top_teams']
+    if task.kind == 'standings':
+        return standings
+    if task.kind == 'calendar':
+        return list(context['matches'])
+    if task.kind == 'calendar_index':
+        return [(s.filename, s.label, len(s.matches)) for s in context['calendar_slices'].values()]
+    if task.kind == 'calendar_slice':
+        calendar_slice = context['calendar_slices'][task.filename]
+        return calendar_slice.label, calendar_slice.matches
+    if task.kind == 'statistics':
+        return stats, context['strengths'], context['streaks'], context['events'], context['odds']
+    if task.kind == 'matchdays':
+        history = context['matchday_history']
+        return [history.standings_at(snapshot) for snapshot in range(len(history.snapshots))]
+    if task.kind == 'head_to_head':
+        head_to_head = context['head_to_head']
+        return [[team['team'], [head_to_head.home_results(head_to_head.index(team['team_api_id']),
+                                                          head_to_head.index(opponent['team_api_id']))
+                                for opponent in standings]]
+                for team in standings]
+    if task.kind == 'elo':
+        return context['elo']
+    if task.kind == 'team':
+        team_stats = next((t for t in standings if t['team'] == task.team_name), None)
+        return (task.team_name, team_stats, generator.get_team_matches(context['matches'], task.team_name),
+                team_trajectory(context, task.team_name), team_streaks(context, task.team_name),
+                team_squad(context, task.team_name), team_events(context, task.team_name),
+                team_odds(context, task.team_name), team_tactics(context, task.team_name),
+                team_style(context, task.team_name))
+    if task.kind == 'player':
+        return context['players'][task.filename]
+    raise ValueError(f"Type de page inconnu : {task.kind}")
+
+
+# Contexte d'un processus du pool, transmis une seule fois par l'initialiseur
+_worker_generator = None
+_worker_context = None
+
+
+def _init_worker(generator, context: Dict):
+    global _worker_generator, _worker_context
+    _worker_generator = generator
+    _worker_context = context
+
+
+def _render_in_worker(task: PageTask) -> str:
+    return render_page(_worker_generator, _worker_context, task)
+
+
+def _render_html_in_worker(task: PageTask) -> Tuple[str, str]:
+    return task.filename, render_html(_worker_generator, _worker_context, task)
+
+
+class PageRenderScheduler:
+    """Répartit les tâches de rendu sur un pool de threads ou de processus"""
+
+    def __init__(self, workers: int = 1, executor: str = 'thread'):
+        """
+        Args:
+            workers: Nombre de threads/processus (1 = rendu séquentiel)
+            executor: 'thread' ou 'process'
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Exécuteur inconnu : {executor} (attendu : {', '.join(EXECUTORS)})")
+        self.workers = max(1, workers)
+        self.executor = executor
+
+    def run(self, generator, context: Dict, tasks: List[PageTask]):
+        """Exécute les tâches et produit les noms de fichiers écrits, dans l'ordre des tâches"""
+        if self.workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield render_page(generator, context, task)
+            return
+
+        if self.executor == 'thread':
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                yield from pool.map(lambda task: render_page(generator, context, task), tasks)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(generator, context)) as pool:
+                yield from pool.map(_render_in_worker, tasks)
+
+    def render(self, generator, context: Dict, tasks: List[PageTask]) -> Iterator[Tuple[str, str]]:
+        """Rend les pages sans les écrire et produit (nom de fichier, HTML), dans l'ordre des tâches"""
+        if self.workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield task.filename, render_html(generator, context, task)
+            return
+
+        if self.executor == 'thread':
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                yield from pool.map(lambda task: (task.filename, render_html(generator, context, task)), tasks)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(generator, context)) as pool:
+                yield from pool.map(_render_html_in_worker, tasks)
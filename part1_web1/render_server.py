@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Serveur de rendu à la demande des pages du site Web 1.0
+Auteur: T. E. G. - Web Sémantique
+Usage: python render_server.py [--db database.sqlite] [--port 5001] [--cache-size 512]
+
+Au lieu de prégénérer une page par équipe, saison et championnat, le serveur
+garde en mémoire les données calculées de chaque saison consultée (matchs
+indexés, classement, statistiques, historiques) et ne rend une page que
+lorsqu'elle est demandée. Les pages rendues sont conservées dans un cache LRU
+borné ; les compteurs de succès/échecs sont exposés sur /_stats.
+
+Les confrontations directes de deux équipes (team_api_id) sont servies en JSON
+sur /api/<championnat>/<saison>/confrontations/<équipe>/<adversaire>.
+
+URL d'une page : /<championnat>/<saison>/<fichier>, par exemple
+/England_Premier_League/2008-2009/classement.html (mêmes noms de dossiers que
+batch_generate.py).
+"""
+
+import argparse
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional, Sequence, Tuple
+
+from flask import Flask, Response, abort, jsonify
+
+from batch_generate import list_league_seasons
+from generate_html_pages import SECTIONS, HTMLPageGenerator
+from render_scheduler import PageTask, render_html
+from site_assets import STYLESHEET, STYLESHEET_NAME
+
+
+class LRUCache:
+    """Cache LRU borné et partagé entre threads, avec compteurs de succès/échecs"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable):
+        """Valeur en cache (None si absente) ; met à jour les compteurs"""
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable):
+        """Valeur en cache sans mise à jour de l'ordre ni des compteurs"""
+        with self._lock:
+            return self._items.get(key)
+
+    def put(self, key: Hashable, value):
+        """Ajoute une valeur et évince la moins récemment utilisée si le cache est plein"""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        """Compteurs du cache"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'size': len(self._items),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / requests, 4) if requests else None,
+            }
+
+
+class SeasonState(NamedTuple):
+    """Données d'une saison gardées en mémoire : générateur, contexte et pages disponibles"""
+    generator: HTMLPageGenerator
+    context: Dict
+    tasks: Dict[str, PageTask]
+
+
+# Marqueur mis en cache pour une saison sans match (évite de la recharger à chaque requête)
+EMPTY_SEASON = object()
+
+
+def championship_slug(championship: str) -> str:
+    return championship.replace(' ', '_')
+
+
+def season_slug(season: str) -> str:
+    return season.replace('/', '-')
+
+
+class OnDemandRenderer:
+    """Rend les pages d'une saison à la demande, avec un cache des saisons et un cache des pages"""
+
+    def __init__(self, db_path: str, page_cache_size: int = 512, season_cache_size: int = 8,
+                 num_teams: int = 10, engine: str = 'python', calendar_split: Optional[str] = None,
+                 sections: Sequence[str] = SECTIONS):
+        """
+        Args:
+            db_path: Chemin vers database.sqlite
+            page_cache_size: Nombre maximal de pages rendues gardées en mémoire
+            season_cache_size: Nombre maximal de saisons (données calculées) gardées en mémoire
+            num_teams: Nombre d'équipes mises en avant sur l'accueil (toutes ont leur page)
+            engine: 'python' ou 'sql' (voir HTMLPageGenerator)
+            calendar_split: Découpage du calendrier (None, 'month' ou 'stage')
+            sections: Sections d'analyse activées (voir generate_html_pages.SECTIONS)
+        """
+        self.db_path = db_path
+        self.num_teams = num_teams
+        self.engine = engine
+        self.calendar_split = calendar_split
+        self.sections = tuple(sections)
+        self.pages = LRUCache(page_cache_size)
+        self.seasons = LRUCache(season_cache_size)
+        self._load_lock = threading.Lock()
+        self.available = {(championship_slug(championship), season_slug(season)): (championship, season)
+                          for championship, season in list_league_seasons(db_path)}
+
+    def load_season(self, championship: str, season: str) -> Optional[SeasonState]:
+        """Calcule (une seule fois) les données d'une saison ; None si la saison n'a aucun match"""
+        state = self.seasons.get((championship, season))
+        if state is not None:
+            return None if state is EMPTY_SEASON else state
+        with self._load_lock:
+            # Une autre requête a pu charger la saison pendant l'attente du verrou
+            state = self.seasons.peek((championship, season))
+            if state is not None:
+                return None if state is EMPTY_SEASON else state
+            # Connexion ouverte le temps du chargement (les requêtes arrivent sur plusieurs threads)
+            generator = HTMLPageGenerator(self.db_path, championship, season, '', self.num_teams,
+                                          read_only=True, incremental=False, engine=self.engine,
+                                          calendar_split=self.calendar_split, verbose=False,
+                                          sections=self.sections)
+            generator.connect_db()
+            try:
+                league_id, _ = generator.get_league_and_country_ids()
+                matches = generator.get_matches(league_id)
+                if not matches:
+                    self.seasons.put((championship, season), EMPTY_SEASON)
+                    return None
+                standings, stats = generator.compute_season(league_id, matches)
+                context = generator.season_context(league_id, matches, standings, stats)
+            finally:
+                generator.close_db()
+            slices = list(context['calendar_slices'].values()) if 'calendar_slices' in context else None
+            # Toutes les équipes du classement ont leur page, pas seulement celles de l'accueil
+            all_teams = [team['team'] for team in standings]
+            tasks = {task.filename: task
+                     for task in generator.page_tasks(all_teams, slices, generator.player_pages(context, all_teams))}
+            state = SeasonState(generator, context, tasks)
+            self.seasons.put((championship, season), state)
+            return state
+
+    def render(self, championship_key: str, season_key: str, filename: str) -> Optional[Tuple[str, bool]]:
+        """(HTML, trouvé en cache) d'une page ; None si la page n'existe pas"""
+        key = (championship_key, season_key, filename)
+        html = self.pages.get(key)
+        if html is not None:
+            return html, True
+        if key[:2] not in self.available:
+            return None
+        state = self.load_season(*self.available[key[:2]])
+        task = state.tasks.get(filename) if state else None
+        if task is None:
+            return None
+        html = render_html(state.generator, state.context, task)
+        self.pages.put(key, html)
+        return html, False
+
+    def head_to_head(self, championship_key: str, season_key: str,
+                     team_api_id: int, opponent_api_id: int) -> Optional[Dict]:
+        """Bilan et matchs de deux équipes (lecture directe dans la matrice de la saison)"""
+        if (championship_key, season_key) not in self.available:
+            return None
+        state = self.load_season(*self.available[(championship_key, season_key)])
+        if state is None:
+            return None
+        matrix = state.context['head_to_head']
+        try:
+            return {
+                'record': matrix.record(team_api_id, opponent_api_id),
+                'matches': matrix.confrontations(team_api_id, opponent_api_id),
+            }
+        except KeyError:
+            return None
+
+    def stats(self) -> Dict:
+        return {'pages': self.pages.stats(), 'seasons': self.seasons.stats()}
+
+
+def create_app(renderer: OnDemandRenderer) -> Flask:
+    """Application Flask servant les pages rendues à la demande"""
+    app = Flask(__name__)
+
+    @app.route('/')
+    def home():
+        links = "\n".join(
+            f'        <li><a href="/{championship_key}/{season_key}/index.html">{championship} {season}</a></li>'
+            for (championship_key, season_key), (championship, season) in sorted(renderer.available.items()))
+        return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <title>Championnats et saisons</title>
+    <link rel="stylesheet" href="/{STYLESHEET_NAME}">
+</head>
+<body>
+    <h1>Championnats et saisons</h1>
+    <ul>
+{links}
+    </ul>
+</body>
+</html>"""
+
+    @app.route(f'/{STYLESHEET_NAME}')
+    @app.route(f'/<championship_key>/<season_key>/{STYLESHEET_NAME}')
+    def stylesheet(championship_key=None, season_key=None):
+        # Nom de fichier dérivé du contenu : cache navigateur sans expiration
+        response = Response(STYLESHEET, mimetype='text/css')
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+    @app.route('/<championship_key>/<season_key>/')
+    @app.route('/<championship_key>/<season_key>/<filename>')
+    def page(championship_key, season_key, filename='index.html'):
+        result = renderer.render(championship_key, season_key, filename)
+        if result is None:
+            abort(404)
+        html, cached = result
+        response = Response(html, mimetype='text/html')
+        response.headers['X-Cache'] = 'HIT' if cached else 'MISS'
+        return response
+
+    @app.route('/api/<championship_key>/<season_key>/confrontations/<int:team_api_id>/<int:opponent_api_id>')
+    def head_to_head(championship_key, season_key, team_api_id, opponent_api_id):
+        result = renderer.head_to_head(championship_key, season_key, team_api_id, opponent_api_id)
+        if result is None:
+            abort(404)
+        return jsonify(result)
+
+    @app.route('/_stats')
+    def stats():
+        return jsonify(renderer.stats())
+
+    return app
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Serveur de rendu à la demande des pages Web 1.0")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute")
+    parser.add_argument("--port", type=int, default=5001, help="Port d'écoute")
+    parser.add_argument("--cache-size", type=int, default=512, help="Nombre maximal de pages rendues en cache")
+    parser.add_argument("--season-cache-size", type=int, default=8,
+                        help="Nombre maximal de saisons gardées en mémoire")
+    parser.add_argument("--num-teams", type=int, default=10, help="Nombre d'équipes mises en avant sur l'accueil")
+    parser.add_argument("--engine", choices=["python", "sql"], default="python", help="Moteur de calcul")
+    parser.add_argument("--calendar-split", choices=["month", "stage"], default=None,
+                        help="Découpe le calendrier en pages par mois ou par journée")
+    parser.add_argument("--sections", nargs="*", choices=SECTIONS, default=SECTIONS,
+                        help="Sections d'analyse activées (par défaut : toutes ; sans valeur : aucune)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    renderer = OnDemandRenderer(args.db, args.cache_size, args.season_cache_size, args.num_teams,
+                                args.engine, args.calendar_split, args.sections)
+    print(f"✓ {len(renderer.available)} couples (championnat, saison) disponibles")
+    print(f"Serveur de rendu lancé sur http://{args.host}:{args.port}")
+    create_app(renderer).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Noyau d'agrégation vectorisé (NumPy) pour le classement et les statistiques d'une saison
+Auteur: T. E. G. - Web Sémantique
+
+Remplace les boucles Python de calculate_standings / calculate_statistics par un
+seul passage sur des tableaux d'entiers (bincount + lexsort). Le résultat est
+strictement identique à celui des fonctions d'origine, y compris l'ordre des
+équipes à égalité et le choix du premier match en cas d'ex aequo.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from match_table import MatchTable
+
+# Matchs joués de tous les championnats, groupés par (championnat, saison) dans
+# l'ordre chronologique (traitements en lot sur toute la base)
+ALL_MATCHES_QUERY = """
+SELECT l.name AS championship, m.season, m.home_team_api_id, m.away_team_api_id,
+       m.home_team_goal, m.away_team_goal
+FROM Match m
+JOIN League l ON m.league_id = l.id
+WHERE m.home_team_goal IS NOT NULL AND m.away_team_goal IS NOT NULL
+ORDER BY l.name, m.season, m.date, m.id
+"""
+
+
+def match_arrays(matches: Sequence[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Convertit une liste de matchs en tableaux (home_ids, away_ids, home_goals, away_goals)"""
+    if isinstance(matches, MatchTable):
+        return matches.kernel_arrays()
+    n = len(matches)
+    home_ids = np.fromiter((m['home_team_api_id'] for m in matches), dtype=np.int64, count=n)
+    away_ids = np.fromiter((m['away_team_api_id'] for m in matches), dtype=np.int64, count=n)
+    home_goals = np.fromiter((m['home_team_goal'] for m in matches), dtype=np.int64, count=n)
+    away_goals = np.fromiter((m['away_team_goal'] for m in matches), dtype=np.int64, count=n)
+    return home_ids, away_ids, home_goals, away_goals
+
+
+def index_teams(home_ids: np.ndarray, away_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Numérote les équipes dans l'ordre de leur première apparition
+
+    L'ordre est celui du dict de calculate_standings : domicile puis extérieur,
+    match par match.
+
+    Returns:
+        (team_ids, first_seen, home_idx, away_idx) où first_seen est la position
+        (2 * match + côté) de la première apparition de chaque équipe.
+    """
+    n_matches = len(home_ids)
+    interleaved = np.empty(2 * n_matches, dtype=np.int64)
+    interleaved[0::2] = home_ids
+    interleaved[1::2] = away_ids
+    unique_ids, first_seen, inverse = np.unique(interleaved, return_index=True, return_inverse=True)
+    appearance = np.argsort(first_seen, kind='stable')
+    rank_of_unique = np.empty_like(appearance)
+    rank_of_unique[appearance] = np.arange(len(appearance))
+    team_index = rank_of_unique[inverse]
+    return unique_ids[appearance], first_seen[appearance], team_index[0::2], team_index[1::2]
+
+
+def team_names(matches: Sequence[Dict], first_seen: np.ndarray) -> List[str]:
+    """Nom de chaque équipe : celui du match où elle apparaît pour la première fois"""
+    names = []
+    for position in first_seen.tolist():
+        match = matches[position // 2]
+        names.append(match['home_team'] if position % 2 == 0 else match['away_team'])
+    return names
+
+
+def aggregate_season(home_ids: np.ndarray, away_ids: np.ndarray,
+                     home_goals: np.ndarray, away_goals: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Agrège une saison en un seul passage vectorisé
+
+    Les équipes sont numérotées dans l'ordre de leur première apparition
+    (domicile puis extérieur, match par match), comme le dict de calculate_standings.
+
+    Returns:
+        Dict de tableaux par équipe (team_ids, played, won, drawn, lost, goals_for,
+        goals_against, goal_difference, points, ranking) et d'indices de matchs
+        (biggest_win, highest_scoring) ainsi que les agrégats de saison.
+    """
+    n_matches = len(home_ids)
+    if n_matches == 0:
+        raise ValueError("Aucun match à agréger")
+
+    team_ids, first_seen, home_idx, away_idx = index_teams(home_ids, away_ids)
+    n_teams = len(team_ids)
+
+    def per_team(index: np.ndarray, weights=None) -> np.ndarray:
+        counts = np.bincount(index, weights=weights, minlength=n_teams)
+        return counts.astype(np.int64)
+
+    home_win = home_goals > away_goals
+    away_win = home_goals < away_goals
+    draw = ~(home_win | away_win)
+
+    played = per_team(home_idx) + per_team(away_idx)
+    won = per_team(home_idx[home_win]) + per_team(away_idx[away_win])
+    lost = per_team(home_idx[away_win]) + per_team(away_idx[home_win])
+    drawn = per_team(home_idx[draw]) + per_team(away_idx[draw])
+    goals_for = per_team(home_idx, home_goals) + per_team(away_idx, away_goals)
+    goals_against = per_team(home_idx, away_goals) + per_team(away_idx, home_goals)
+    goal_difference = goals_for - goals_against
+    points = 3 * won + drawn
+
+    # Tri : points, différence de buts, buts marqués (décroissants), puis ordre
+    # d'apparition pour reproduire la stabilité de sorted(..., reverse=True)
+    ranking = np.lexsort((np.arange(n_teams), -goals_for, -goal_difference, -points))
+
+    match_goals = home_goals + away_goals
+    return {
+        'team_ids': team_ids,
+        'first_seen': first_seen,
+        'played': played,
+        'won': won,
+        'drawn': drawn,
+        'lost': lost,
+        'goals_for': goals_for,
+        'goals_against': goals_against,
+        'goal_difference': goal_difference,
+        'points': points,
+        'ranking': ranking,
+        'total_goals': int(match_goals.sum()),
+        'top_scorer': int(np.argmax(goals_for)),
+        'top_conceded': int(np.argmax(goals_against)),
+        'biggest_win': int(np.argmax(np.abs(home_goals - away_goals))),
+        'highest_scoring': int(np.argmax(match_goals)),
+    }
+
+
+def season_standings_and_statistics(matches: Sequence[Dict]) -> Tuple[List[Dict], Dict]:
+    """
+    Calcule le classement et les statistiques de la saison en un seul passage
+
+    Returns:
+        (standings, stats) au même format que calculate_standings et calculate_statistics
+    """
+    agg = aggregate_season(*match_arrays(matches))
+
+    names = team_names(matches, agg['first_seen'])
+
+    columns = ('played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against',
+               'goal_difference', 'points')
+    values = {column: agg[column].tolist() for column in columns}
+    team_ids = agg['team_ids'].tolist()
+
+    standings = []
+    for position, i in enumerate(agg['ranking'].tolist(), 1):
+        row = {'team': names[i], 'team_api_id': team_ids[i]}
+        for column in columns:
+            row[column] = values[column][i]
+        row['position'] = position
+        standings.append(row)
+
+    total_goals = agg['total_goals']
+    stats = {
+        'total_matches': len(matches),
+        'total_goals': total_goals,
+        'avg_goals_per_match': round(total_goals / len(matches), 2),
+        'top_scorer_team': (names[agg['top_scorer']], values['goals_for'][agg['top_scorer']]),
+        'top_conceded_team': (names[agg['top_conceded']], values['goals_against'][agg['top_conceded']]),
+        'biggest_win': matches[agg['biggest_win']],
+        'highest_scoring': matches[agg['highest_scoring']],
+    }
+    return standings, stats
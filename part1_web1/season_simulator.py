@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Simulation Monte Carlo de la fin d'une saison
+Auteur: T. E. G. - Web Sémantique
+Usage: python season_simulator.py [--db database.sqlite] [--date 2009-01-01] [--simulations 1000000]
+
+Les matchs joués jusqu'à la date choisie fixent le classement de départ ; les
+matchs restants sont simulés avec un modèle de Poisson (attaque et défense de
+chaque équipe estimées sur les matchs joués, avantage du terrain). Chaque lot
+simule des milliers de fins de saison à la fois sous forme de tableaux NumPy
+(lots × matchs), et les lots sont répartis sur un pool de processus. Le
+classement final de chaque simulation applique les critères de
+calculate_standings : points, différence de buts, buts marqués, puis ordre
+d'apparition des équipes.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from season_kernel import index_teams, match_arrays, team_names
+from standings_history import normalize_date
+
+# Nombre de saisons simulées par lot vectorisé
+BATCH_SIZE = 10_000
+
+# Poids (en matchs) de la moyenne du championnat dans l'estimation des forces
+PRIOR_MATCHES = 2.0
+
+
+class SeasonModel(NamedTuple):
+    """Situation de départ et matchs restants, sous forme de tableaux"""
+    team_ids: np.ndarray         # team_api_id par équipe (ordre d'apparition)
+    team_names: List[str]
+    points: np.ndarray           # totaux des matchs joués, par équipe
+    goal_difference: np.ndarray
+    goals_for: np.ndarray
+    played: np.ndarray
+    home_idx: np.ndarray         # matchs restants : indices des équipes
+    away_idx: np.ndarray
+    home_rate: np.ndarray        # matchs restants : buts attendus (loi de Poisson)
+    away_rate: np.ndarray
+
+
+def build_model(matches: Sequence[Dict], as_of) -> SeasonModel:
+    """
+    Sépare les matchs joués (date <= as_of) des matchs restants et estime le modèle
+
+    Les forces d'attaque et de défense sont les moyennes de buts marqués et
+    encaissés (à domicile et à l'extérieur séparément), rapportées à la moyenne
+    du championnat et lissées par PRIOR_MATCHES matchs « moyens ».
+    """
+    home_ids, away_ids, home_goals, away_goals = match_arrays(matches)
+    team_ids, first_seen, home_idx, away_idx = index_teams(home_ids, away_ids)
+    n_teams = len(team_ids)
+    cutoff = normalize_date(as_of)
+    played = np.array([match['date'] <= cutoff for match in matches], dtype=bool)
+
+    def per_team(index, weights=None):
+        return np.bincount(index, weights=weights, minlength=n_teams)
+
+    hi, ai, hg, ag = home_idx[played], away_idx[played], home_goals[played], away_goals[played]
+    points = per_team(hi, 3 * (hg > ag) + (hg == ag)) + per_team(ai, 3 * (ag > hg) + (hg == ag))
+    goals_for = per_team(hi, hg) + per_team(ai, ag)
+    goals_against = per_team(hi, ag) + per_team(ai, hg)
+
+    # Moyennes du championnat (1,5 / 1,1 but par match si aucun match n'est joué)
+    home_avg = hg.mean() if len(hg) else 1.5
+    away_avg = ag.mean() if len(ag) else 1.1
+    home_played, away_played = per_team(hi), per_team(ai)
+    prior = PRIOR_MATCHES
+    home_attack = (per_team(hi, hg) + prior * home_avg) / ((home_played + prior) * home_avg)
+    home_defense = (per_team(hi, ag) + prior * away_avg) / ((home_played + prior) * away_avg)
+    away_attack = (per_team(ai, ag) + prior * away_avg) / ((away_played + prior) * away_avg)
+    away_defense = (per_team(ai, hg) + prior * home_avg) / ((away_played + prior) * home_avg)
+
+    rh, ra = home_idx[~played], away_idx[~played]
+    return SeasonModel(
+        team_ids=team_ids,
+        team_names=team_names(matches, first_seen),
+        points=points.astype(np.int64),
+        goal_difference=(goals_for - goals_against).astype(np.int64),
+        goals_for=goals_for.astype(np.int64),
+        played=(home_played + away_played).astype(np.int64),
+        home_idx=rh,
+        away_idx=ra,
+        home_rate=home_avg * home_attack[rh] * away_defense[ra],
+        away_rate=away_avg * away_attack[ra] * home_defense[rh],
+    )
+
+
+def final_positions(model: SeasonModel, home_goals: np.ndarray, away_goals: np.ndarray) -> np.ndarray:
+    """
+    Positions finales (1 = premier) pour un lot de fins de saison
+
+    Args:
+        home_goals, away_goals: Buts des matchs restants, forme (lot, matchs restants)
+
+    Returns:
+        Tableau (lot, équipes) des positions finales
+    """
+    n_teams = len(model.team_ids)
+    batch = home_goals.shape[0]
+    # Matrices d'incidence match -> équipe : les totaux par équipe deviennent des
+    # produits matriciels (float32 : valeurs entières petites, calcul exact)
+    home_onehot = np.zeros((len(model.home_idx), n_teams), dtype=np.float32)
+    home_onehot[np.arange(len(model.home_idx)), model.home_idx] = 1
+    away_onehot = np.zeros((len(model.away_idx), n_teams), dtype=np.float32)
+    away_onehot[np.arange(len(model.away_idx)), model.away_idx] = 1
+
+    home_goals = home_goals.astype(np.float32)
+    away_goals = away_goals.astype(np.float32)
+    home_points = np.where(home_goals > away_goals, np.float32(3), (home_goals == away_goals).astype(np.float32))
+    away_points = np.where(home_goals < away_goals, np.float32(3), (home_goals == away_goals).astype(np.float32))
+    points = model.points + home_points @ home_onehot + away_points @ away_onehot
+    goals_for = model.goals_for + home_goals @ home_onehot + away_goals @ away_onehot
+    goal_difference = model.goal_difference + (home_goals - away_goals) @ (home_onehot - away_onehot)
+
+    # Clé de tri unique (points, différence, buts marqués) ; le tri stable sur les
+    # équipes rangées par ordre d'apparition départage les égalités parfaites
+    points = points.astype(np.int64)
+    goal_difference = goal_difference.astype(np.int64)
+    goals_for = goals_for.astype(np.int64)
+    gd_offset = int(np.abs(goal_difference).max()) + 1
+    gf_base = int(goals_for.max()) + 1
+    key = (points * (2 * gd_offset + 1) + goal_difference + gd_offset) * gf_base + goals_for
+    ranking = np.argsort(-key, axis=1, kind='stable')
+    positions = np.empty((batch, n_teams), dtype=np.int64)
+    np.put_along_axis(positions, ranking, np.broadcast_to(np.arange(1, n_teams + 1), (batch, n_teams)), axis=1)
+    return positions
+
+
+def poisson_cdf(rates: np.ndarray, tolerance: float = 1e-7) -> np.ndarray:
+    """
+    Fonctions de répartition de Poisson, une colonne par nombre de buts (0, 1, 2...)
+
+    Les colonnes s'arrêtent dès que la masse restante de chaque match est
+    inférieure à tolerance (scores plus élevés tronqués).
+    """
+    columns = []
+    pmf = np.exp(-rates)
+    cdf = pmf.copy()
+    k = 0
+    while True:
+        columns.append(cdf.copy())
+        if not len(rates) or (1 - cdf).max() < tolerance:
+            break
+        k += 1
+        pmf = pmf * rates / k
+        cdf += pmf
+    return np.array(columns, dtype=np.float64)
+
+
+def poisson_goals(rng: np.random.Generator, cdf: np.ndarray, batch: int) -> np.ndarray:
+    """
+    Tirage des buts par inversion de la fonction de répartition
+
+    Un seul tirage uniforme (float32) par score puis une comparaison par colonne
+    de la table : environ deux fois plus rapide que rng.poisson pour des taux de
+    l'ordre de 1.
+    """
+    uniforms = rng.random((batch, cdf.shape[1]), dtype=np.float32)
+    goals = np.zeros((batch, cdf.shape[1]), dtype=np.int8)
+    for column in cdf[:-1].astype(np.float32):
+        goals += uniforms > column
+    return goals
+
+
+def simulate_batches(model: SeasonModel, n_simulations: int, seed, batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """Simule n_simulations fins de saison par lots ; retourne les comptes (équipe, position)"""
+    rng = np.random.default_rng(seed)
+    n_teams = len(model.team_ids)
+    counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    team_offsets = np.arange(n_teams) * n_teams
+    home_cdf, away_cdf = poisson_cdf(model.home_rate), poisson_cdf(model.away_rate)
+    remaining = n_simulations
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        home_goals = poisson_goals(rng, home_cdf, batch)
+        away_goals = poisson_goals(rng, away_cdf, batch)
+        positions = final_positions(model, home_goals, away_goals)
+        counts += np.bincount((team_offsets + positions - 1).ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+        remaining -= batch
+    return counts
+
+
+def simulate_season(matches: Sequence[Dict], as_of, n_simulations: int = 100_000,
+                    workers: Optional[int] = None, seed: int = 6253, batch_size: int = BATCH_SIZE,
+                    top_n: int = 4, relegated: int = 3) -> List[Dict]:
+    """
+    Probabilités de fin de saison pour chaque équipe
+
+    Args:
+        matches: Tous les matchs de la saison (joués et à venir), liste de dicts ou MatchTable
+        as_of: Date de la situation de départ (chaîne 'AAAA-MM-JJ' ou date)
+        n_simulations: Nombre de fins de saison simulées
+        workers: Nombre de processus (par défaut : nombre de cœurs)
+        seed: Graine ; chaque processus reçoit un flux indépendant (SeedSequence.spawn)
+        top_n: Nombre de places qualificatives comptées dans p_top_n
+        relegated: Nombre de places de relégation
+
+    Returns:
+        Une ligne par équipe, triée par position moyenne : team, team_api_id, points,
+        played, expected_points, mean_position, p_title, p_top_n, p_relegation
+        et position_probabilities.
+    """
+    model = build_model(matches, as_of)
+    n_teams = len(model.team_ids)
+    workers = max(1, min(workers or os.cpu_count() or 1, -(-n_simulations // batch_size)))
+    shares = [n_simulations // workers + (i < n_simulations % workers) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+
+    if workers == 1:
+        counts = simulate_batches(model, n_simulations, seeds[0], batch_size)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = sum(pool.map(simulate_batches, [model] * workers, shares, seeds, [batch_size] * workers))
+
+    probabilities = counts / n_simulations
+    positions = np.arange(1, n_teams + 1)
+    # Points attendus : points acquis + espérance sur les matchs restants (modèle de Poisson)
+    expected_points = model.points + expected_remaining_points(model)
+
+    rows = []
+    for i in range(n_teams):
+        rows.append({
+            'team': model.team_names[i],
+            'team_api_id': int(model.team_ids[i]),
+            'points': int(model.points[i]),
+            'played': int(model.played[i]),
+            'expected_points': float(expected_points[i]),
+            'mean_position': float(probabilities[i] @ positions),
+            'p_title': float(probabilities[i, 0]),
+            'p_top_n': float(probabilities[i, :top_n].sum()),
+            'p_relegation': float(probabilities[i, n_teams - relegated:].sum()) if relegated else 0.0,
+            'position_probabilities': probabilities[i].tolist(),
+        })
+    rows.sort(key=lambda row: row['mean_position'])
+    return rows
+
+
+def expected_remaining_points(model: SeasonModel, max_goals: int = 15) -> np.ndarray:
+    """Espérance exacte des points sur les matchs restants (scores tronqués à max_goals)"""
+    goals = np.arange(max_goals + 1)
+    log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+
+    def pmf(rate):
+        return np.exp(goals * np.log(rate[:, None]) - rate[:, None] - log_factorial)
+
+    joint = pmf(model.home_rate)[:, :, None] * pmf(model.away_rate)[:, None, :]
+    p_home = np.tril(joint, -1).sum(axis=(1, 2))
+    p_away = np.triu(joint, 1).sum(axis=(1, 2))
+    p_draw = np.trace(joint, axis1=1, axis2=2)
+    n_teams = len(model.team_ids)
+    return (np.bincount(model.home_idx, weights=3 * p_home + p_draw, minlength=n_teams)
+            + np.bincount(model.away_idx, weights=3 * p_away + p_draw, minlength=n_teams))
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Simulation Monte Carlo de la fin d'une saison")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--championship", default="England Premier League", help="Nom du championnat")
+    parser.add_argument("--season", default="2008/2009", help="Saison")
+    parser.add_argument("--date", default="2009-01-01", help="Situation de départ : matchs joués jusqu'à cette date")
+    parser.add_argument("--simulations", type=int, default=1_000_000, help="Nombre de fins de saison simulées")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Saisons simulées par lot vectorisé")
+    parser.add_argument("--seed", type=int, default=6253, help="Graine du générateur aléatoire")
+    parser.add_argument("--top-n", type=int, default=4, help="Nombre de places qualificatives")
+    parser.add_argument("--relegated", type=int, default=3, help="Nombre de places de relégation")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    from generate_html_pages import HTMLPageGenerator
+    generator = HTMLPageGenerator(args.db, args.championship, args.season, '', read_only=True, incremental=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.connect_db()
+        league_id, _ = generator.get_league_and_country_ids()
+        matches = generator.get_matches(league_id)
+        generator.close_db()
+
+    print("=" * 60)
+    print(f"SIMULATION MONTE CARLO - {args.championship} {args.season}")
+    print("=" * 60)
+    start = time.perf_counter()
+    rows = simulate_season(matches, args.date, args.simulations, args.workers, args.seed,
+                           args.batch_size, args.top_n, args.relegated)
+    elapsed = time.perf_counter() - start
+
+    remaining = len(build_model(matches, args.date).home_idx)
+    print(f"\nSituation au {args.date} : {len(matches) - remaining} matchs joués, {remaining} à simuler")
+    print(f"✓ {args.simulations} saisons simulées en {elapsed:.2f} s\n")
+    print(f"{'Équipe':<28} {'Pts':>4} {'Pts att.':>8} {'Pos moy.':>8} {'Titre':>7} "
+          f"{'Top ' + str(args.top_n):>7} {'Relég.':>7}")
+    for row in rows:
+        print(f"{row['team']:<28} {row['points']:>4} {row['expected_points']:>8.1f} {row['mean_position']:>8.2f} "
+              f"{row['p_title'] * 100:>6.1f}% {row['p_top_n'] * 100:>6.1f}% {row['p_relegation'] * 100:>6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
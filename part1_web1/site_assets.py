@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Ressources partagées du site : feuille de style unique et pages précompressées
+Auteur: T. E. G. - Web Sémantique
+
+Au lieu d'intégrer la feuille de style dans chaque page, le générateur écrit
+une seule feuille nommée d'après l'empreinte de son contenu (style.<hash>.css) :
+elle peut être mise en cache sans limite de durée par les navigateurs et les
+pages ne contiennent plus qu'un lien. Chaque page écrite reçoit aussi une
+variante .gz (compression déterministe) et le manifeste assets.json recense,
+pour chaque fichier, sa taille, sa taille compressée et son empreinte.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import textwrap
+from typing import Dict, Iterable
+
+ASSET_MANIFEST_NAME = 'assets.json'
+
+STYLESHEET = """body {
+    font-family: Arial, sans-serif;
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+    background-color: #f5f5f5;
+}
+h1 {
+    color: #2c3e50;
+    border-bottom: 3px solid #3498db;
+    padding-bottom: 10px;
+}
+h2 {
+    color: #34495e;
+    margin-top: 30px;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+    background-color: white;
+    margin: 20px 0;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+th, td {
+    padding: 12px;
+    text-align: left;
+    border-bottom: 1px solid #ddd;
+}
+th {
+    background-color: #3498db;
+    color: white;
+    font-weight: bold;
+}
+tr:hover {
+    background-color: #f5f5f5;
+}
+.nav {
+    background-color: #34495e;
+    padding: 15px;
+    margin-bottom: 20px;
+    border-radius: 5px;
+}
+.nav a {
+    color: white;
+    text-decoration: none;
+    padding: 10px 15px;
+    margin-right: 10px;
+    display: inline-block;
+}
+.nav a:hover {
+    background-color: #2c3e50;
+    border-radius: 3px;
+}
+.stat-box {
+    background-color: white;
+    padding: 20px;
+    margin: 10px 0;
+    border-radius: 5px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+.match-result {
+    padding: 10px;
+    margin: 5px 0;
+    background-color: white;
+    border-left: 4px solid #3498db;
+}
+.score {
+    font-weight: bold;
+    font-size: 1.2em;
+    color: #e74c3c;
+}
+"""
+
+STYLESHEET_HASH = hashlib.sha256(STYLESHEET.encode('utf-8')).hexdigest()[:12]
+STYLESHEET_NAME = f"style.{STYLESHEET_HASH}.css"
+
+
+def inline_style_block() -> str:
+    """Bloc <style> intégré à la page (mode sans feuille partagée)"""
+    return "    <style>\n" + textwrap.indent(STYLESHEET, ' ' * 8) + "    </style>\n"
+
+
+def stylesheet_link() -> str:
+    """Lien vers la feuille de style partagée"""
+    return f'    <link rel="stylesheet" href="{STYLESHEET_NAME}">\n'
+
+
+def write_stylesheet(output_dir: str) -> bool:
+    """Écrit la feuille de style partagée (et sa variante .gz) si elle n'existe pas encore"""
+    path = os.path.join(output_dir, STYLESHEET_NAME)
+    if os.path.exists(path):
+        return False
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(STYLESHEET)
+    compress_file(path)
+    return True
+
+
+def compress_file(path: str) -> int:
+    """Écrit la variante .gz d'un fichier (mtime nul : sortie reproductible) et retourne sa taille"""
+    with open(path, 'rb') as f:
+        data = gzip.compress(f.read(), compresslevel=9, mtime=0)
+    with open(path + '.gz', 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def asset_entry(path: str) -> Dict:
+    """Taille, taille compressée et empreinte d'un fichier du site"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    gz_path = path + '.gz'
+    return {
+        'bytes': len(data),
+        'gzip_bytes': os.path.getsize(gz_path) if os.path.exists(gz_path) else None,
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+
+
+class AssetManifest:
+    """Manifeste des fichiers publiés (assets.json) : tailles et empreintes"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, ASSET_MANIFEST_NAME)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.files: Dict[str, Dict] = json.load(f).get('files', {})
+        except (OSError, ValueError):
+            self.files = {}
+
+    def compress(self, filenames: Iterable[str]):
+        """Compresse les fichiers réécrits et met à jour leurs entrées"""
+        for filename in filenames:
+            path = os.path.join(self.output_dir, filename)
+            compress_file(path)
+            self.files[filename] = asset_entry(path)
+
+    def totals(self) -> Dict:
+        """Tailles cumulées du site, brutes et compressées"""
+        raw = sum(entry['bytes'] for entry in self.files.values())
+        compressed = sum(entry['gzip_bytes'] or entry['bytes'] for entry in self.files.values())
+        return {'files': len(self.files), 'bytes': raw, 'gzip_bytes': compressed}
+
+    def save(self, filenames: Iterable[str]):
+        """Enregistre le manifeste, limité aux fichiers encore publiés"""
+        filenames = list(filenames)
+        # Fichiers publiés sans entrée (manifeste absent ou supprimé) : compressés maintenant
+        missing = [name for name in filenames
+                   if name not in self.files and os.path.exists(os.path.join(self.output_dir, name))]
+        self.compress(missing)
+        keep = set(filenames)
+        self.files = {name: entry for name, entry in sorted(self.files.items()) if name in keep}
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'totals': self.totals(), 'files': self.files}, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Site regroupé dans une seule archive indexée (bundle .zip)
+Auteur: T. E. G. - Web Sémantique
+
+Au lieu d'écrire des milliers de petits fichiers HTML, le générateur peut
+écrire tout le site dans une archive zip. Le répertoire central du zip sert
+de table d'offsets : une page est relue par son nom (accès direct) sans
+décompresser le reste de l'archive. L'archive est écrite dans un fichier
+temporaire puis renommée, et ses entrées ont une date fixe : deux générations
+identiques produisent le même fichier.
+"""
+
+import os
+import zipfile
+from typing import Iterable, List
+
+BUNDLE_SUFFIX = '.zip'
+
+# Date fixe des entrées (la plus ancienne date représentable dans un zip)
+ENTRY_DATE = (1980, 1, 1, 0, 0, 0)
+
+
+def is_bundle(path: str) -> bool:
+    """Vrai si le chemin désigne une archive de site (et non un dossier)"""
+    return path.endswith(BUNDLE_SUFFIX) and not os.path.isdir(path)
+
+
+def _entry(name: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=ENTRY_DATE)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    return info
+
+
+class SiteBundleWriter:
+    """Écrit les pages d'un site dans une archive zip (à utiliser avec with)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.archive = zipfile.ZipFile(self.tmp_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.names: List[str] = []
+
+    def write(self, name: str, text: str):
+        """Ajoute une page complète"""
+        self.archive.writestr(_entry(name), text.encode('utf-8'))
+        self.names.append(name)
+
+    def write_chunks(self, name: str, chunks: Iterable[str]):
+        """Ajoute une page produite par morceaux, compressés au fil de l'écriture"""
+        with self.archive.open(_entry(name), 'w') as f:
+            for chunk in chunks:
+                f.write(chunk.encode('utf-8'))
+        self.names.append(name)
+
+    def close(self):
+        self.archive.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.archive.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class SiteBundle:
+    """Lecture des pages d'une archive de site par leur nom"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, 'r')
+
+    def names(self, suffix: str = '') -> List[str]:
+        """Noms des fichiers de l'archive (éventuellement filtrés par extension)"""
+        return [name for name in self.archive.namelist() if name.endswith(suffix)]
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            self.archive.getinfo(name)
+        except KeyError:
+            return False
+        return True
+
+    def read(self, name: str) -> str:
+        """Contenu d'une page (KeyError si elle n'existe pas)"""
+        return self.archive.read(name).decode('utf-8')
+
+    def close(self):
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
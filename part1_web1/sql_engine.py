@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Moteur SQL du classement et des statistiques de saison
+Auteur: T. E. G. - Web Sémantique
+
+Alternative à calculate_standings / calculate_statistics : les agrégations sont
+exécutées par SQLite (GROUP BY, fonctions de fenêtrage, UNION ALL des points de
+vue domicile et extérieur) au lieu de ramener tous les matchs en Python.
+Les résultats ont le même format que ceux de HTMLPageGenerator.
+
+La génération ne modifie jamais la base : les index couvrants se créent
+explicitement avec la commande ci-dessous.
+Usage: python sql_engine.py --db database.sqlite
+"""
+
+import argparse
+import os
+import sqlite3
+from typing import Dict, List, Tuple
+
+# Index couvrants : la requête de saison ne lit que l'index, sans accéder à la table
+COVERING_INDEXES = {
+    'idx_match_league_season_date': (
+        'Match',
+        'league_id, season, date, id, home_team_api_id, away_team_api_id, home_team_goal, away_team_goal',
+    ),
+    'idx_team_api_id_names': ('Team', 'team_api_id, team_long_name, team_short_name'),
+}
+
+# Matchs de la saison numérotés dans l'ordre chronologique, puis une ligne par
+# équipe et par match (UNION ALL des points de vue domicile et extérieur).
+# L'ordre d'apparition (2*seq domicile, 2*seq+1 extérieur) reproduit l'ordre
+# d'insertion du dict de calculate_standings pour départager les ex aequo.
+SEASON_CTE = """
+WITH season_matches AS (
+    SELECT id, date, home_team_api_id, away_team_api_id, home_team_goal, away_team_goal,
+           ROW_NUMBER() OVER (ORDER BY date, id) AS seq
+    FROM Match
+    WHERE league_id = :league_id AND season = :season
+      -- comme la jointure de get_matches : on ignore les matchs dont une équipe est inconnue
+      AND home_team_api_id IN (SELECT team_api_id FROM Team)
+      AND away_team_api_id IN (SELECT team_api_id FROM Team)
+),
+perspectives AS (
+    SELECT home_team_api_id AS team_api_id, home_team_goal AS gf, away_team_goal AS ga, 2 * seq AS appearance
+    FROM season_matches
+    UNION ALL
+    SELECT away_team_api_id, away_team_goal, home_team_goal, 2 * seq + 1
+    FROM season_matches
+),
+totals AS (
+    SELECT team_api_id,
+           COUNT(*) AS played,
+           SUM(gf > ga) AS won,
+           SUM(gf = ga) AS drawn,
+           SUM(gf < ga) AS lost,
+           SUM(gf) AS goals_for,
+           SUM(ga) AS goals_against,
+           MIN(appearance) AS first_seen
+    FROM perspectives
+    GROUP BY team_api_id
+)
+"""
+
+STANDINGS_QUERY = SEASON_CTE + """
+SELECT t.team_long_name AS team,
+       tt.team_api_id,
+       tt.played, tt.won, tt.drawn, tt.lost,
+       tt.goals_for, tt.goals_against,
+       tt.goals_for - tt.goals_against AS goal_difference,
+       3 * tt.won + tt.drawn AS points,
+       ROW_NUMBER() OVER (
+           ORDER BY 3 * tt.won + tt.drawn DESC,
+                    tt.goals_for - tt.goals_against DESC,
+                    tt.goals_for DESC,
+                    tt.first_seen
+       ) AS position
+FROM totals tt
+JOIN Team t ON t.team_api_id = tt.team_api_id
+ORDER BY position
+"""
+
+STATISTICS_QUERY = SEASON_CTE + """
+SELECT
+    (SELECT COUNT(*) FROM season_matches) AS total_matches,
+    (SELECT SUM(home_team_goal + away_team_goal) FROM season_matches) AS total_goals,
+    (SELECT team_api_id FROM totals ORDER BY goals_for DESC, first_seen LIMIT 1) AS top_scorer_id,
+    (SELECT MAX(goals_for) FROM totals) AS top_scorer_goals,
+    (SELECT team_api_id FROM totals ORDER BY goals_against DESC, first_seen LIMIT 1) AS top_conceded_id,
+    (SELECT MAX(goals_against) FROM totals) AS top_conceded_goals,
+    (SELECT id FROM season_matches
+     ORDER BY ABS(home_team_goal - away_team_goal) DESC, seq LIMIT 1) AS biggest_win_id,
+    (SELECT id FROM season_matches
+     ORDER BY home_team_goal + away_team_goal DESC, seq LIMIT 1) AS highest_scoring_id
+"""
+
+# Mêmes colonnes que HTMLPageGenerator.get_matches
+MATCH_QUERY = """
+SELECT
+    m.id,
+    m.date,
+    m.season,
+    m.stage,
+    ht.team_long_name as home_team,
+    ht.team_short_name as home_team_short,
+    at.team_long_name as away_team,
+    at.team_short_name as away_team_short,
+    m.home_team_goal,
+    m.away_team_goal,
+    m.home_team_api_id,
+    m.away_team_api_id
+FROM Match m
+JOIN Team ht ON m.home_team_api_id = ht.team_api_id
+JOIN Team at ON m.away_team_api_id = at.team_api_id
+WHERE m.id = ?
+"""
+
+
+class SQLSeasonEngine:
+    """Classement et statistiques d'une saison calculés directement par SQLite"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def ensure_indexes(self) -> List[str]:
+        """Crée les index couvrants manquants puis met à jour les statistiques (ANALYZE)"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        created = []
+        for name, (table, columns) in COVERING_INDEXES.items():
+            if name not in existing:
+                cursor.execute(f"CREATE INDEX {name} ON {table}({columns})")
+                created.append(name)
+
+        if created:
+            cursor.execute("ANALYZE")
+            self.conn.commit()
+            print(f"✓ Index créés : {', '.join(created)} (ANALYZE exécuté)")
+        return created
+
+    def calculate_standings(self, league_id: int, season: str) -> List[Dict]:
+        """Classement de la saison (même format que HTMLPageGenerator.calculate_standings)"""
+        cursor = self.conn.cursor()
+        cursor.execute(STANDINGS_QUERY, {'league_id': league_id, 'season': season})
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def calculate_statistics(self, league_id: int, season: str) -> Dict:
+        """Statistiques de la saison (même format que HTMLPageGenerator.calculate_statistics)"""
+        cursor = self.conn.cursor()
+        cursor.execute(STATISTICS_QUERY, {'league_id': league_id, 'season': season})
+        (total_matches, total_goals, top_scorer_id, top_scorer_goals, top_conceded_id,
+         top_conceded_goals, biggest_win_id, highest_scoring_id) = cursor.fetchone()
+
+        if not total_matches:
+            raise ValueError(f"Aucun match pour la ligue {league_id} et la saison {season}")
+
+        return {
+            'total_matches': total_matches,
+            'total_goals': total_goals,
+            'avg_goals_per_match': round(total_goals / total_matches, 2),
+            'top_scorer_team': (self._team_name(top_scorer_id), top_scorer_goals),
+            'top_conceded_team': (self._team_name(top_conceded_id), top_conceded_goals),
+            'biggest_win': self._match(biggest_win_id),
+            'highest_scoring': self._match(highest_scoring_id),
+        }
+
+    def calculate_season(self, league_id: int, season: str) -> Tuple[List[Dict], Dict]:
+        """Classement et statistiques de la saison"""
+        return self.calculate_standings(league_id, season), self.calculate_statistics(league_id, season)
+
+    def _team_name(self, team_api_id: int) -> str:
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT team_long_name FROM Team WHERE team_api_id = ?", (team_api_id,))
+        return cursor.fetchone()[0]
+
+    def _match(self, match_id: int) -> Dict:
+        cursor = self.conn.cursor()
+        cursor.execute(MATCH_QUERY, (match_id,))
+        columns = [description[0] for description in cursor.description]
+        return dict(zip(columns, cursor.fetchone()))
+
+
+def main():
+    """Fonction principale : crée les index couvrants du moteur SQL"""
+    parser = argparse.ArgumentParser(description="Création des index couvrants du moteur SQL (modifie la base)")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    conn = sqlite3.connect(args.db)
+    if not SQLSeasonEngine(conn).ensure_indexes():
+        print(f"✓ Index déjà présents dans {args.db}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
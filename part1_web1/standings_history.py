@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Historique du classement : classement à une date donnée et trajectoire d'une équipe
+Auteur: T. E. G. - Web Sémantique
+
+Les matchs sont regroupés par clé (date ou journée) puis les résultats sont
+cumulés par sommes préfixes : chaque instantané contient, pour chaque équipe,
+les totaux de tous les matchs dont la clé est inférieure ou égale. Les
+positions de tous les instantanés sont calculées une seule fois (lexsort 2D),
+avec les mêmes critères que calculate_standings.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from season_kernel import index_teams, match_arrays, team_names
+
+COLUMNS = ('played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against')
+
+
+def normalize_date(value: Union[str, date, datetime]) -> str:
+    """Date au format de la colonne Match.date ; une date seule inclut toute la journée"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d') + ' 23:59:59'
+    if len(value) == 10:
+        return value + ' 23:59:59'
+    return value
+
+
+class StandingsHistory:
+    """Classements successifs d'une saison, un instantané par valeur de clé"""
+
+    def __init__(self, matches: Sequence[Dict], key: str = 'date'):
+        """
+        Args:
+            matches: Matchs de la saison (liste de dicts ou MatchTable)
+            key: Champ qui ordonne les instantanés ('date' ou 'stage')
+        """
+        self.key = key
+        home_ids, away_ids, home_goals, away_goals = match_arrays(matches)
+        team_ids, first_seen, home_idx, away_idx = index_teams(home_ids, away_ids)
+        self.team_ids = team_ids
+        self.team_names = team_names(matches, first_seen)
+        self._team_index = {team_id: i for i, team_id in enumerate(team_ids.tolist())}
+        n_teams = len(team_ids)
+
+        # Instantanés : valeurs distinctes de la clé, triées
+        keys = np.array([match[key] for match in matches])
+        self.snapshots, snapshot_of_match = np.unique(keys, return_inverse=True)
+        n_snapshots = len(self.snapshots)
+
+        # Variations par instantané et par équipe, puis sommes préfixes
+        home_win = home_goals > away_goals
+        away_win = home_goals < away_goals
+        draw = ~(home_win | away_win)
+        deltas = {column: np.zeros((n_snapshots, n_teams), dtype=np.int64) for column in COLUMNS}
+        for index, goals_for, goals_against, win, loss in (
+                (home_idx, home_goals, away_goals, home_win, away_win),
+                (away_idx, away_goals, home_goals, away_win, home_win)):
+            np.add.at(deltas['played'], (snapshot_of_match, index), 1)
+            np.add.at(deltas['won'], (snapshot_of_match, index), win)
+            np.add.at(deltas['drawn'], (snapshot_of_match, index), draw)
+            np.add.at(deltas['lost'], (snapshot_of_match, index), loss)
+            np.add.at(deltas['goals_for'], (snapshot_of_match, index), goals_for)
+            np.add.at(deltas['goals_against'], (snapshot_of_match, index), goals_against)
+        self.cumulative = {column: np.cumsum(values, axis=0) for column, values in deltas.items()}
+        self.cumulative['goal_difference'] = self.cumulative['goals_for'] - self.cumulative['goals_against']
+        self.cumulative['points'] = 3 * self.cumulative['won'] + self.cumulative['drawn']
+
+        # Classement de chaque instantané : points, différence, buts marqués, puis
+        # ordre d'apparition ; les équipes n'ayant pas encore joué sont placées à la fin
+        not_played = self.cumulative['played'] == 0
+        appearance = np.broadcast_to(np.arange(n_teams), (n_snapshots, n_teams))
+        self.rankings = np.lexsort((appearance,
+                                    -self.cumulative['goals_for'],
+                                    -self.cumulative['goal_difference'],
+                                    -self.cumulative['points'],
+                                    not_played), axis=-1)
+        self.positions = np.empty_like(self.rankings)
+        np.put_along_axis(self.positions, self.rankings,
+                          np.broadcast_to(np.arange(1, n_teams + 1), (n_snapshots, n_teams)), axis=-1)
+        self.positions[not_played] = 0
+
+    def snapshot_index(self, value) -> int:
+        """Indice du dernier instantané dont la clé est <= value (-1 si aucun)"""
+        if self.key == 'date':
+            value = normalize_date(value)
+        return int(np.searchsorted(self.snapshots, value, side='right')) - 1
+
+    def standings_at(self, snapshot: int) -> List[Dict]:
+        """Classement d'un instantané (même format que calculate_standings)"""
+        if snapshot < 0:
+            return []
+        played = self.cumulative['played'][snapshot]
+        values = {column: values[snapshot].tolist() for column, values in self.cumulative.items()}
+        team_ids = self.team_ids.tolist()
+
+        standings = []
+        for position, i in enumerate(self.rankings[snapshot].tolist(), 1):
+            if not played[i]:
+                break
+            row = {'team': self.team_names[i], 'team_api_id': team_ids[i]}
+            for column in COLUMNS + ('goal_difference', 'points'):
+                row[column] = values[column][i]
+            row['position'] = position
+            standings.append(row)
+        return standings
+
+    def standings_as_of(self, value) -> List[Dict]:
+        """Classement à une date (ou après une journée) donnée"""
+        return self.standings_at(self.snapshot_index(value))
+
+    def trajectory(self, team_api_id: int) -> List[Tuple[object, int, int]]:
+        """Trajectoire d'une équipe : (clé, position, points) pour chaque instantané où elle a joué"""
+        i = self._team_index.get(team_api_id)
+        if i is None:
+            return []
+        played = np.diff(self.cumulative['played'][:, i], prepend=0) > 0
+        snapshots = np.flatnonzero(played)
+        return list(zip(self.snapshots[snapshots].tolist(),
+                        self.positions[snapshots, i].tolist(),
+                        self.cumulative['points'][snapshots, i].tolist()))
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Séries (victoires, invincibilité, matchs sans marquer) et forme du moment
+Auteur: T. E. G. - Web Sémantique
+Usage: python streaks.py [--db database.sqlite] [--top 10]
+
+Chaque match donne deux lignes (une par équipe) ; les lignes sont triées par
+(saison, équipe) en gardant l'ordre chronologique, puis les séries sont
+obtenues par encodage par plages (run-length) vectorisé : un début de plage
+est repéré par comparaison avec la ligne précédente, les plages sont
+numérotées par somme cumulée et leurs longueurs comptées par bincount.
+Aucune boucle Python par équipe : toutes les équipes de toutes les saisons de
+la base sont traitées en un seul passage.
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from db_access import SQLiteDataAccess
+from season_kernel import ALL_MATCHES_QUERY, match_arrays
+
+# Nombre de matchs affichés dans la forme du moment
+FORM_LENGTH = 5
+
+# Résultat du point de vue de l'équipe : 1 victoire, 0 nul, -1 défaite
+RESULT_LETTERS = {1: 'V', 0: 'N', -1: 'D'}
+RESULT_LABELS = {1: 'victoire', 0: 'nul', -1: 'défaite'}
+
+
+class StreakTable(NamedTuple):
+    """Séries de chaque couple (groupe, équipe), sous forme de tableaux alignés"""
+    groups: np.ndarray             # groupe (saison) de la ligne
+    team_ids: np.ndarray           # team_api_id
+    played: np.ndarray             # matchs joués
+    longest_win: np.ndarray        # plus longue série de victoires
+    longest_unbeaten: np.ndarray   # plus longue série sans défaite
+    longest_scoreless: np.ndarray  # plus longue série de matchs sans marquer
+    current_result: np.ndarray     # résultat de la série en cours (1, 0, -1)
+    current_length: np.ndarray     # longueur de la série en cours
+    form: np.ndarray               # derniers résultats (n × FORM_LENGTH, 2 = pas de match)
+
+
+def run_lengths(flag: np.ndarray, segment_start: np.ndarray, segment_id: np.ndarray, n_segments: int):
+    """
+    Plus longue plage de True par segment, et longueur de chaque plage
+
+    Returns:
+        (plus longue plage par segment, numéro de plage de chaque ligne (0 hors plage),
+        longueur de chaque plage indexée par son numéro)
+    """
+    previous = np.concatenate([[False], flag[:-1]])
+    run_start = flag & (~previous | segment_start)
+    run_id = np.cumsum(run_start)
+    run_id[~flag] = 0
+    lengths = np.bincount(run_id, minlength=1)
+    lengths[0] = 0
+    longest = np.zeros(n_segments, dtype=np.int64)
+    np.maximum.at(longest, segment_id[run_start], lengths[1:])
+    return longest, run_id, lengths
+
+
+def compute_streaks(groups: np.ndarray, home_ids: np.ndarray, away_ids: np.ndarray,
+                    home_goals: np.ndarray, away_goals: np.ndarray, form_length: int = FORM_LENGTH) -> StreakTable:
+    """
+    Séries de toutes les équipes de tous les groupes en un passage
+
+    Args:
+        groups: Groupe de chaque match (par exemple un numéro de saison)
+        home_ids, away_ids, home_goals, away_goals: Matchs dans l'ordre chronologique
+    """
+    n_matches = len(home_ids)
+    teams = np.concatenate([home_ids, away_ids])
+    row_groups = np.concatenate([groups, groups])
+    goals_for = np.concatenate([home_goals, away_goals])
+    goals_against = np.concatenate([away_goals, home_goals])
+    chronology = np.concatenate([np.arange(n_matches), np.arange(n_matches)])
+
+    # Lignes triées par (groupe, équipe), puis dans l'ordre chronologique
+    order = np.lexsort((chronology, teams, row_groups))
+    teams, row_groups = teams[order], row_groups[order]
+    goals_for, goals_against = goals_for[order], goals_against[order]
+    result = np.sign(goals_for - goals_against)
+
+    n_rows = len(order)
+    segment_start = np.ones(n_rows, dtype=bool)
+    segment_start[1:] = (teams[1:] != teams[:-1]) | (row_groups[1:] != row_groups[:-1])
+    segment_id = np.cumsum(segment_start) - 1
+    first = np.flatnonzero(segment_start)
+    last = np.append(first[1:] - 1, n_rows - 1)
+    n_segments = len(first)
+
+    longest_win, _, _ = run_lengths(result == 1, segment_start, segment_id, n_segments)
+    longest_unbeaten, _, _ = run_lengths(result >= 0, segment_start, segment_id, n_segments)
+    longest_scoreless, _, _ = run_lengths(goals_for == 0, segment_start, segment_id, n_segments)
+
+    # Série en cours : plage de résultats identiques qui se termine au dernier match
+    same = np.zeros(n_rows, dtype=bool)
+    same[1:] = result[1:] == result[:-1]
+    run_id = np.cumsum(segment_start | ~same)
+    current_length = np.bincount(run_id)[run_id[last]]
+
+    # Forme : derniers résultats du segment (2 = pas de match, segment trop court)
+    window = last[:, None] + np.arange(-form_length + 1, 1)
+    form = np.where(window >= first[:, None], result[np.maximum(window, 0)], 2)
+
+    return StreakTable(row_groups[first], teams[first], last - first + 1, longest_win, longest_unbeaten,
+                       longest_scoreless, result[last], current_length, form)
+
+
+def streak_rows(table: StreakTable) -> List[Dict]:
+    """Une ligne lisible (dict) par couple (groupe, équipe)"""
+    rows = []
+    for i in range(len(table.team_ids)):
+        current = int(table.current_result[i])
+        rows.append({
+            'group': int(table.groups[i]),
+            'team_api_id': int(table.team_ids[i]),
+            'played': int(table.played[i]),
+            'longest_win': int(table.longest_win[i]),
+            'longest_unbeaten': int(table.longest_unbeaten[i]),
+            'longest_scoreless': int(table.longest_scoreless[i]),
+            'current_result': current,
+            'current_length': int(table.current_length[i]),
+            'current': f"{table.current_length[i]} × {RESULT_LABELS[current]}",
+            'form': ''.join(RESULT_LETTERS[code] for code in table.form[i].tolist() if code != 2),
+        })
+    return rows
+
+
+def season_streaks(matches: Sequence[Dict], standings: List[Dict]) -> Dict[int, Dict]:
+    """
+    Séries de chaque équipe d'une saison
+
+    Returns:
+        team_api_id -> séries de l'équipe (avec son nom), dans l'ordre du classement
+    """
+    home_ids, away_ids, home_goals, away_goals = match_arrays(matches)
+    table = compute_streaks(np.zeros(len(home_ids), dtype=np.int64), home_ids, away_ids, home_goals, away_goals)
+    by_team = {row['team_api_id']: row for row in streak_rows(table)}
+    streaks = {}
+    for team in standings:
+        row = by_team[team['team_api_id']]
+        row['team'] = team['team']
+        streaks[team['team_api_id']] = row
+    return streaks
+
+
+def all_streaks(data_access: SQLiteDataAccess) -> List[Dict]:
+    """Séries de toutes les équipes de toutes les saisons de la base (un seul passage)"""
+    keys: Dict[tuple, int] = {}
+    columns = [[], [], [], [], []]
+    for row in data_access.iter_query(ALL_MATCHES_QUERY):
+        columns[0].append(keys.setdefault((row['championship'], row['season']), len(keys)))
+        columns[1].append(row['home_team_api_id'])
+        columns[2].append(row['away_team_api_id'])
+        columns[3].append(row['home_team_goal'])
+        columns[4].append(row['away_team_goal'])
+    if not keys:
+        return []
+    table = compute_streaks(*(np.array(column, dtype=np.int64) for column in columns))
+    labels = list(keys)
+    rows = streak_rows(table)
+    for row in rows:
+        row['championship'], row['season'] = labels[row.pop('group')]
+    return rows
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Séries de toutes les équipes de toutes les saisons")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--top", type=int, default=10, help="Nombre de séries affichées par catégorie")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    start = time.perf_counter()
+    rows = all_streaks(data_access)
+    elapsed = time.perf_counter() - start
+    names = {row['team_api_id']: row['team_long_name']
+             for row in data_access.iter_query("SELECT team_api_id, team_long_name FROM Team")}
+    data_access.close()
+
+    print("=" * 60)
+    print("SÉRIES - TOUTES LES ÉQUIPES, TOUTES LES SAISONS")
+    print("=" * 60)
+    print(f"\n✓ {len(rows)} couples (équipe, saison) traités en {elapsed * 1000:.0f} ms (lecture comprise)")
+    for key, title in (('longest_win', 'Victoires consécutives'), ('longest_unbeaten', 'Sans défaite'),
+                       ('longest_scoreless', 'Sans marquer')):
+        print(f"\n{title}")
+        for row in sorted(rows, key=lambda row: -row[key])[:args.top]:
+            print(f"  {row[key]:>3}  {names.get(row['team_api_id'], row['team_api_id']):<28} "
+                  f"{row['championship']} {row['season']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Modèle de forces attaque/défense (Poisson, correction de Dixon-Coles)
+Auteur: T. E. G. - Web Sémantique
+Usage: python strength_model.py [--db database.sqlite] [--workers 4]
+
+Pour un championnat et une saison, le nombre de buts de chaque équipe suit
+une loi de Poisson de paramètre
+
+    domicile  : exp(mu + avantage + attaque[dom] - défense[ext])
+    extérieur : exp(mu + attaque[ext] - défense[dom])
+
+Les paramètres maximisent la log-vraisemblance (pénalisée par une petite
+pénalité ridge qui centre attaques et défenses sur 0). Vraisemblance,
+gradient et hessienne sont calculés de façon vectorisée sur tous les matchs
+(matrice de plan), et l'optimum est atteint par la méthode de Newton en
+quelques itérations. Le paramètre rho de Dixon-Coles (dépendance des scores
+faibles 0-0, 1-0, 0-1, 1-1) est ensuite estimé à forces fixées.
+
+Le traitement par lots ajuste toutes les saisons de tous les championnats de
+la base, réparties sur un pool de processus.
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from db_access import SQLiteDataAccess
+from season_kernel import ALL_MATCHES_QUERY, index_teams, match_arrays, team_names
+
+# Pénalité ridge sur attaques et défenses (identifiabilité, petites saisons)
+RIDGE = 1e-3
+
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-9
+
+
+class StrengthFit(NamedTuple):
+    """Paramètres ajustés d'une saison (échelle logarithmique)"""
+    team_ids: np.ndarray          # team_api_id par équipe (ordre d'apparition)
+    attack: np.ndarray            # attaque de chaque équipe (somme nulle)
+    defence: np.ndarray           # défense de chaque équipe (somme nulle, élevée = solide)
+    intercept: float              # mu : log du nombre de buts moyen à l'extérieur
+    home_advantage: float         # avantage du terrain
+    rho: float                    # dépendance des scores faibles (Dixon-Coles)
+    log_likelihood: float         # log-vraisemblance de Poisson à l'optimum
+    iterations: int               # itérations de Newton
+
+
+def design_matrix(home_idx: np.ndarray, away_idx: np.ndarray, n_teams: int) -> np.ndarray:
+    """
+    Matrice de plan : une ligne par score (buts à domicile, puis buts à l'extérieur)
+
+    Colonnes : mu, avantage du terrain, attaques (n_teams), défenses (n_teams).
+    """
+    n_matches = len(home_idx)
+    rows = np.arange(n_matches)
+    design = np.zeros((2 * n_matches, 2 + 2 * n_teams))
+    design[:, 0] = 1.0
+    design[rows, 1] = 1.0
+    design[rows, 2 + home_idx] = 1.0
+    design[rows, 2 + n_teams + away_idx] = -1.0
+    design[n_matches + rows, 2 + away_idx] = 1.0
+    design[n_matches + rows, 2 + n_teams + home_idx] = -1.0
+    return design
+
+
+def log_factorials(goals: np.ndarray) -> np.ndarray:
+    table = np.array([math.lgamma(k + 1) for k in range(int(goals.max(initial=0)) + 1)])
+    return table[goals]
+
+
+def fit_poisson(home_idx: np.ndarray, away_idx: np.ndarray, home_goals: np.ndarray, away_goals: np.ndarray,
+                n_teams: int, ridge: float = RIDGE) -> Tuple[np.ndarray, float, int]:
+    """
+    Maximum de vraisemblance pénalisée par la méthode de Newton
+
+    Returns:
+        (paramètres [mu, avantage, attaques, défenses], log-vraisemblance, itérations)
+    """
+    design = design_matrix(home_idx, away_idx, n_teams)
+    goals = np.concatenate([home_goals, away_goals]).astype(np.float64)
+    constant = log_factorials(np.concatenate([home_goals, away_goals])).sum()
+    penalty = np.full(design.shape[1], ridge)
+    penalty[:2] = 0.0
+
+    def objective(theta):
+        eta = design @ theta
+        return goals @ eta - np.exp(eta).sum() - penalty @ theta ** 2
+
+    theta = np.zeros(design.shape[1])
+    theta[0] = math.log(max(goals.mean(), 1e-3))
+    value = objective(theta)
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        rate = np.exp(design @ theta)
+        gradient = design.T @ (goals - rate) - 2 * penalty * theta
+        hessian = (design.T * rate) @ design + np.diag(2 * penalty)
+        step = np.linalg.solve(hessian, gradient)
+        # Pas de Newton, réduit de moitié tant que l'objectif ne progresse pas
+        scale = 1.0
+        while True:
+            candidate = theta + scale * step
+            candidate_value = objective(candidate)
+            if candidate_value >= value or scale < 1e-6:
+                break
+            scale /= 2
+        theta, value = candidate, candidate_value
+        if np.abs(scale * step).max() < TOLERANCE:
+            break
+    eta = design @ theta
+    log_likelihood = float(goals @ eta - np.exp(eta).sum() - constant)
+    return theta, log_likelihood, iteration
+
+
+def fit_rho(home_rate: np.ndarray, away_rate: np.ndarray, home_goals: np.ndarray, away_goals: np.ndarray) -> float:
+    """
+    Paramètre rho de Dixon-Coles à forces fixées (Newton sur une variable)
+
+    Le facteur tau(rho) des scores 0-0, 0-1, 1-0 et 1-1 doit rester positif
+    pour tous les matchs, ce qui borne rho.
+    """
+    low = (home_goals <= 1) & (away_goals <= 1)
+    if not low.any():
+        return 0.0
+    lower = max(-1 / home_rate.max(), -1 / away_rate.max())
+    upper = min(1 / (home_rate * away_rate).max(), 1.0)
+    # Dérivée de tau par rapport à rho pour chaque match à score faible
+    h, a = home_rate[low], away_rate[low]
+    x, y = home_goals[low], away_goals[low]
+    slope = np.select([(x == 0) & (y == 0), (x == 0) & (y == 1), (x == 1) & (y == 0)],
+                      [-h * a, h, a], default=-1.0)
+
+    rho = 0.0
+    for _ in range(MAX_ITERATIONS):
+        tau = 1 + rho * slope
+        gradient = (slope / tau).sum()
+        curvature = -((slope / tau) ** 2).sum()
+        step = -gradient / curvature
+        # Reste strictement dans l'intervalle admissible
+        new_rho = min(max(rho + step, rho + 0.99 * (lower - rho)), rho + 0.99 * (upper - rho))
+        if abs(new_rho - rho) < TOLERANCE:
+            rho = new_rho
+            break
+        rho = new_rho
+    return float(rho)
+
+
+def fit_arrays(home_ids: np.ndarray, away_ids: np.ndarray, home_goals: np.ndarray, away_goals: np.ndarray,
+               ridge: float = RIDGE) -> StrengthFit:
+    """Ajuste le modèle sur les tableaux d'une saison"""
+    team_ids, _, home_idx, away_idx = index_teams(home_ids, away_ids)
+    n_teams = len(team_ids)
+    theta, log_likelihood, iterations = fit_poisson(home_idx, away_idx, home_goals, away_goals, n_teams, ridge)
+    intercept, home_advantage = theta[0], theta[1]
+    attack, defence = theta[2:2 + n_teams], theta[2 + n_teams:]
+    home_rate = np.exp(intercept + home_advantage + attack[home_idx] - defence[away_idx])
+    away_rate = np.exp(intercept + attack[away_idx] - defence[home_idx])
+    rho = fit_rho(home_rate, away_rate, home_goals, away_goals)
+    return StrengthFit(team_ids, attack, defence, float(intercept), float(home_advantage), rho,
+                       log_likelihood, iterations)
+
+
+def fit_strengths(matches: Sequence[Dict]) -> Dict:
+    """
+    Forces attaque/défense d'une saison, prêtes pour l'affichage
+
+    Returns:
+        Dictionnaire : home_goals_rate et away_goals_rate (buts attendus entre
+        deux équipes moyennes), home_advantage (multiplicateur), rho et
+        teams (triées par force globale) avec attack (multiplicateur des buts
+        marqués), defence (multiplicateur des buts encaissés, plus petit =
+        meilleur) et rating (attaque + défense, échelle logarithmique).
+    """
+    home_ids, away_ids, home_goals, away_goals = match_arrays(matches)
+    fit = fit_arrays(home_ids, away_ids, home_goals, away_goals)
+    _, first_seen, _, _ = index_teams(home_ids, away_ids)
+    names = team_names(matches, first_seen)
+    teams = [{
+        'team': names[i],
+        'team_api_id': int(fit.team_ids[i]),
+        'attack': float(np.exp(fit.attack[i])),
+        'defence': float(np.exp(-fit.defence[i])),
+        'rating': float(fit.attack[i] + fit.defence[i]),
+    } for i in range(len(fit.team_ids))]
+    teams.sort(key=lambda team: -team['rating'])
+    return {
+        'home_goals_rate': math.exp(fit.intercept + fit.home_advantage),
+        'away_goals_rate': math.exp(fit.intercept),
+        'home_advantage': math.exp(fit.home_advantage),
+        'rho': fit.rho,
+        'log_likelihood': fit.log_likelihood,
+        'teams': teams,
+    }
+
+
+def _fit_group(arrays: Tuple[np.ndarray, ...]) -> StrengthFit:
+    return fit_arrays(*arrays)
+
+
+def league_season_arrays(data_access: SQLiteDataAccess) -> Dict[Tuple[str, str], Tuple[np.ndarray, ...]]:
+    """Matchs joués de toute la base, regroupés par (championnat, saison), sous forme de tableaux"""
+    groups: Dict[Tuple[str, str], List[List[int]]] = {}
+    for row in data_access.iter_query(ALL_MATCHES_QUERY):
+        columns = groups.setdefault((row['championship'], row['season']), [[], [], [], []])
+        columns[0].append(row['home_team_api_id'])
+        columns[1].append(row['away_team_api_id'])
+        columns[2].append(row['home_team_goal'])
+        columns[3].append(row['away_team_goal'])
+    return {key: tuple(np.array(column, dtype=np.int64) for column in columns)
+            for key, columns in groups.items()}
+
+
+def fit_all(data_access: SQLiteDataAccess, workers: Optional[int] = None) -> Dict[Tuple[str, str], StrengthFit]:
+    """Ajuste toutes les saisons de tous les championnats, en parallèle sur un pool de processus"""
+    groups = league_season_arrays(data_access)
+    keys = list(groups)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(keys)))
+    if workers == 1:
+        fits = [_fit_group(groups[key]) for key in keys]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fits = list(pool.map(_fit_group, [groups[key] for key in keys],
+                                 chunksize=max(1, len(keys) // (4 * workers))))
+    return dict(zip(keys, fits))
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Forces attaque/défense de toutes les saisons (Poisson, Dixon-Coles)")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus (par défaut : nombre de cœurs)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    start = time.perf_counter()
+    fits = fit_all(data_access, args.workers)
+    elapsed = time.perf_counter() - start
+    data_access.close()
+
+    print("=" * 60)
+    print("MODÈLE DE FORCES - TOUS LES CHAMPIONNATS")
+    print("=" * 60)
+    print(f"\n✓ {len(fits)} saisons ajustées en {elapsed:.2f} s\n")
+    print(f"{'Championnat':<28} {'Saison':<10} {'Équipes':>7} {'Dom. ×':>7} {'rho':>7} {'Iter.':>5}")
+    for (championship, season), fit in sorted(fits.items()):
+        print(f"{championship:<28} {season:<10} {len(fit.team_ids):>7} {math.exp(fit.home_advantage):>7.3f} "
+              f"{fit.rho:>7.3f} {fit.iterations:>5}")
+
+
+if __name__ == "__main__":
+    main()
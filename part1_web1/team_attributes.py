@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Profils tactiques des équipes (Team_Attributes) rattachés à chaque match
+Auteur: T. E. G. - Web Sémantique
+Usage: python team_attributes.py [--db database.sqlite] [--cache database.sqlite.team_attributes.npz]
+
+Team_Attributes contient des relevés datés du style de jeu de chaque équipe
+(vitesse de construction, pressing, largeur défensive...). Pour chaque match
+et chacune des deux équipes, le relevé en vigueur est le dernier relevé de
+l'équipe daté au plus tard du jour du match (jointure « as-of »).
+
+La jointure est une fusion triée vectorisée : relevés et matchs (deux lignes
+par match) sont triés ensemble par (équipe, date), les relevés avant les
+matchs du même jour ; le dernier relevé rencontré est propagé par un maximum
+cumulé (np.maximum.accumulate). Un match antérieur au premier relevé de
+l'équipe reçoit ce premier relevé (les relevés ne couvrent pas les
+premières saisons de la base) ; il est signalé comme anticipé.
+
+Le résultat, calculé une fois sur tout l'historique, est mis en cache (.npz)
+avec l'empreinte de la base (chemin, taille, date) et n'est recalculé que si
+elle change.
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from db_access import SQLiteDataAccess
+from page_manifest import fingerprint
+
+# Attributs numériques (échelle 20-80) et libellés affichés
+NUMERIC_ATTRIBUTES = {
+    'buildUpPlaySpeed': 'Vitesse',
+    'buildUpPlayDribbling': 'Dribbles',
+    'buildUpPlayPassing': 'Passes',
+    'chanceCreationPassing': 'Passes décisives',
+    'chanceCreationCrossing': 'Centres',
+    'chanceCreationShooting': 'Tirs',
+    'defencePressure': 'Pressing',
+    'defenceAggression': 'Agressivité',
+    'defenceTeamWidth': 'Largeur défensive',
+}
+
+# Attributs qualitatifs (classes)
+CLASS_ATTRIBUTES = (
+    'buildUpPlaySpeedClass', 'buildUpPlayDribblingClass', 'buildUpPlayPassingClass',
+    'buildUpPlayPositioningClass', 'chanceCreationPassingClass', 'chanceCreationCrossingClass',
+    'chanceCreationShootingClass', 'chanceCreationPositioningClass', 'defencePressureClass',
+    'defenceAggressionClass', 'defenceTeamWidthClass', 'defenceDefenderLineClass',
+)
+
+SNAPSHOT_QUERY = f"""
+SELECT team_api_id, date, {', '.join(NUMERIC_ATTRIBUTES)}, {', '.join(CLASS_ATTRIBUTES)}
+FROM Team_Attributes
+ORDER BY team_api_id, date, id
+"""
+
+MATCH_QUERY = """
+SELECT id, date, home_team_api_id, away_team_api_id
+FROM Match
+ORDER BY id
+"""
+
+
+def default_cache_path(db_path: str) -> str:
+    """Cache placé à côté de la base"""
+    return db_path + '.team_attributes.npz'
+
+
+def source_fingerprint(db_path: str) -> str:
+    stat = os.stat(db_path)
+    return fingerprint(os.path.abspath(db_path), stat.st_size, stat.st_mtime_ns, tuple(NUMERIC_ATTRIBUTES),
+                       CLASS_ATTRIBUTES)
+
+
+def day_numbers(dates: np.ndarray) -> np.ndarray:
+    """Dates 'AAAA-MM-JJ ...' -> numéros de jour (int64)"""
+    return np.array(dates.astype('U10'), dtype='datetime64[D]').astype(np.int64)
+
+
+def as_of_join(snapshot_teams: np.ndarray, snapshot_days: np.ndarray,
+               teams: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Relevé en vigueur pour chaque couple (équipe, jour)
+
+    Args:
+        snapshot_teams, snapshot_days: Relevés triés par (équipe, jour)
+        teams, days: Couples recherchés (dans un ordre quelconque)
+
+    Returns:
+        Indice du relevé de chaque couple ; à défaut de relevé antérieur, le
+        premier relevé de l'équipe ; -1 si l'équipe n'en a aucun
+    """
+    n_snapshots = len(snapshot_teams)
+    if not n_snapshots:
+        return np.full(len(teams), -1, dtype=np.int64)
+    all_teams = np.concatenate([snapshot_teams, teams])
+    all_days = np.concatenate([snapshot_days, days])
+    # Relevés (0) avant les matchs (1) du même jour : un relevé s'applique dès sa date
+    kinds = np.concatenate([np.zeros(n_snapshots, dtype=np.int8), np.ones(len(teams), dtype=np.int8)])
+    order = np.lexsort((kinds, all_days, all_teams))
+
+    # Dernier relevé rencontré dans l'ordre de fusion : les indices des relevés sont croissants
+    carried = np.where(order < n_snapshots, order, -1)
+    carried = np.maximum.accumulate(carried)
+    found = np.empty(len(teams), dtype=np.int64)
+    found[order[order >= n_snapshots] - n_snapshots] = carried[order >= n_snapshots]
+
+    # Le relevé propagé doit appartenir à la même équipe
+    valid = found >= 0
+    valid[valid] = snapshot_teams[found[valid]] == teams[valid]
+
+    # Sinon : premier relevé de l'équipe, s'il existe
+    first_teams, first_index = np.unique(snapshot_teams, return_index=True)
+    position = np.minimum(np.searchsorted(first_teams, teams), len(first_teams) - 1)
+    fallback = np.where(first_teams[position] == teams, first_index[position], -1)
+    return np.where(valid, found, fallback)
+
+
+def build_cache(data_access: SQLiteDataAccess, cache_path: str) -> int:
+    """Calcule la jointure sur tout l'historique et l'enregistre ; retourne le nombre de matchs"""
+    snapshots = [tuple(row) for row in data_access.iter_query(SNAPSHOT_QUERY)]
+    n_numeric = len(NUMERIC_ATTRIBUTES)
+    snapshot_teams = np.array([row[0] for row in snapshots], dtype=np.int64)
+    snapshot_dates = np.array([row[1] for row in snapshots], dtype='U19')
+    values = np.array([row[2:2 + n_numeric] for row in snapshots], dtype=np.float64).reshape(-1, n_numeric)
+    classes = np.array([[value or '' for value in row[2 + n_numeric:]] for row in snapshots],
+                       dtype='U32').reshape(-1, len(CLASS_ATTRIBUTES))
+
+    matches = [tuple(row) for row in data_access.iter_query(MATCH_QUERY)]
+    match_ids = np.array([row[0] for row in matches], dtype=np.int64)
+    match_days = day_numbers(np.array([row[1] for row in matches], dtype='U19'))
+    home_ids = np.array([row[2] for row in matches], dtype=np.int64)
+    away_ids = np.array([row[3] for row in matches], dtype=np.int64)
+
+    found = as_of_join(snapshot_teams, day_numbers(snapshot_dates),
+                       np.concatenate([home_ids, away_ids]), np.concatenate([match_days, match_days]))
+    n_matches = len(match_ids)
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path,
+             source=np.array(source_fingerprint(data_access.db_path)),
+             snapshot_teams=snapshot_teams,
+             snapshot_dates=snapshot_dates,
+             values=values,
+             classes=classes,
+             match_ids=match_ids,
+             match_days=match_days,
+             home_ids=home_ids,
+             away_ids=away_ids,
+             home_snapshot=found[:n_matches],
+             away_snapshot=found[n_matches:])
+    os.replace(tmp_path, cache_path)
+    return n_matches
+
+
+def cache_is_current(cache_path: str, db_path: str) -> bool:
+    try:
+        with np.load(cache_path) as data:
+            return str(data['source']) == source_fingerprint(db_path)
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+class TeamAttributes:
+    """Relevés tactiques et relevé en vigueur de chaque équipe à chaque match"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        with np.load(cache_path) as data:
+            self.snapshot_teams = data['snapshot_teams']
+            self.snapshot_dates = data['snapshot_dates']
+            self.values = data['values']
+            self.classes = data['classes']
+            self.match_ids = data['match_ids']
+            self.match_days = data['match_days']
+            self.home_ids = data['home_ids']
+            self.away_ids = data['away_ids']
+            self.home_snapshot = data['home_snapshot']
+            self.away_snapshot = data['away_snapshot']
+        self.snapshot_days = day_numbers(self.snapshot_dates)
+
+    @classmethod
+    def open(cls, data_access: SQLiteDataAccess, cache_path: Optional[str] = None) -> 'TeamAttributes':
+        """Ouvre le cache de la base, après l'avoir (re)calculé si nécessaire"""
+        cache_path = cache_path or default_cache_path(data_access.db_path)
+        if not cache_is_current(cache_path, data_access.db_path):
+            build_cache(data_access, cache_path)
+        return cls(cache_path)
+
+    def __len__(self):
+        return len(self.snapshot_teams)
+
+    def snapshot(self, index: int) -> Dict:
+        """Relevé sous forme de dict (attributs numériques None si absents)"""
+        profile = {'team_api_id': int(self.snapshot_teams[index]), 'date': str(self.snapshot_dates[index])}
+        for name, value in zip(NUMERIC_ATTRIBUTES, self.values[index].tolist()):
+            profile[name] = None if np.isnan(value) else int(value)
+        for name, value in zip(CLASS_ATTRIBUTES, self.classes[index].tolist()):
+            profile[name] = value or None
+        return profile
+
+    def match_snapshots(self, match_ids: Sequence[int], team_ids: Sequence[int]):
+        """
+        Relevé en vigueur de l'équipe donnée pour chaque match
+
+        Returns:
+            (indices des relevés, -1 si aucun ; vrai si le match précède le relevé rattaché)
+        """
+        match_ids = np.asarray(match_ids, dtype=np.int64)
+        team_ids = np.asarray(team_ids, dtype=np.int64)
+        if not len(self.match_ids) or not len(self.snapshot_teams):
+            return np.full(len(match_ids), -1, dtype=np.int64), np.zeros(len(match_ids), dtype=bool)
+        position = np.minimum(np.searchsorted(self.match_ids, match_ids), len(self.match_ids) - 1)
+        known = self.match_ids[position] == match_ids
+        found = np.where(self.home_ids[position] == team_ids, self.home_snapshot[position],
+                         np.where(self.away_ids[position] == team_ids, self.away_snapshot[position], -1))
+        found = np.where(known, found, -1)
+        anticipated = (found >= 0) & (self.match_days[position] < self.snapshot_days[np.maximum(found, 0)])
+        return found, anticipated
+
+
+def team_timeline(attributes: TeamAttributes, team_api_id: int, team_matches: Sequence[Dict]) -> List[Dict]:
+    """
+    Profils tactiques successifs d'une équipe pendant ses matchs, avec les résultats obtenus
+
+    Returns:
+        Une période par suite de matchs consécutifs joués sous le même relevé :
+        relevé, anticipé ou non, dates du premier et du dernier match, bilan (V, N, D, points)
+    """
+    if not team_matches:
+        return []
+    match_ids = [match['id'] for match in team_matches]
+    snapshots, anticipated = attributes.match_snapshots(match_ids, [team_api_id] * len(match_ids))
+    periods = []
+    for match, snapshot, early in zip(team_matches, snapshots.tolist(), anticipated.tolist()):
+        if snapshot < 0:
+            continue
+        # Nouvelle période à chaque changement de relevé (ou fin des matchs antérieurs au relevé)
+        if not periods or (periods[-1]['snapshot'], periods[-1]['anticipated']) != (snapshot, early):
+            periods.append({'snapshot': snapshot, 'profile': attributes.snapshot(snapshot), 'anticipated': early,
+                            'first_date': match['date'], 'last_date': match['date'],
+                            'won': 0, 'drawn': 0, 'lost': 0})
+        period = periods[-1]
+        period['last_date'] = match['date']
+        home = match['home_team_api_id'] == team_api_id
+        goals_for, goals_against = ((match['home_team_goal'], match['away_team_goal']) if home
+                                    else (match['away_team_goal'], match['home_team_goal']))
+        period['won' if goals_for > goals_against else 'drawn' if goals_for == goals_against else 'lost'] += 1
+    for period in periods:
+        period['played'] = period['won'] + period['drawn'] + period['lost']
+        period['points'] = 3 * period['won'] + period['drawn']
+        del period['snapshot']
+    return periods
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Relevé Team_Attributes en vigueur à chaque match")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--cache", default=None, help="Fichier cache (par défaut : <db>.team_attributes.npz)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    cache_path = args.cache or default_cache_path(args.db)
+
+    print("=" * 60)
+    print("PROFILS TACTIQUES - JOINTURE AS-OF")
+    print("=" * 60)
+    start = time.perf_counter()
+    count = build_cache(data_access, cache_path)
+    print(f"\n✓ {count} matchs rattachés à leurs relevés en {time.perf_counter() - start:.2f} s ({cache_path})")
+
+    attributes = TeamAttributes(cache_path)
+    for side in ('home_snapshot', 'away_snapshot'):
+        found = getattr(attributes, side)
+        print(f"  {side:<14} relevé trouvé pour {np.count_nonzero(found >= 0)} / {len(found)} matchs")
+    start = time.perf_counter()
+    TeamAttributes.open(data_access, cache_path)
+    print(f"✓ Réouverture depuis le cache : {(time.perf_counter() - start) * 1000:.1f} ms")
+    data_access.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Groupes de styles de jeu des équipes, toutes saisons et tous championnats
+Auteur: T. E. G. - Web Sémantique
+Usage: python team_styles.py [--db database.sqlite] [--k 6]
+
+Chaque couple (équipe, saison) est décrit par la moyenne, sur ses matchs de
+la saison, des attributs tactiques du relevé Team_Attributes en vigueur
+(jointure as-of de team_attributes.py). Les attributs sont centrés-réduits
+(valeurs manquantes remplacées par la moyenne) puis regroupés par k-means
+vectorisé : initialisation k-means++, itérations de Lloyd (distances par
+produit matriciel, centres par bincount). Au-delà de MINI_BATCH_ROWS
+couples, l'algorithme passe en k-means par mini-lots.
+
+Affectations et centres sont mis en cache (.npz) avec une signature du
+contenu de Team_Attributes et de la liste des matchs : le calcul n'est
+relancé que si l'une d'elles change.
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from db_access import SQLiteDataAccess
+from page_manifest import fingerprint
+from team_attributes import NUMERIC_ATTRIBUTES, TeamAttributes
+
+DEFAULT_K = 6
+DEFAULT_SEED = 0
+MAX_ITERATIONS = 100
+
+# Au-delà, k-means par mini-lots (taille BATCH_SIZE)
+MINI_BATCH_ROWS = 50_000
+BATCH_SIZE = 4096
+
+# Écart (en écarts-types) à partir duquel un attribut caractérise un groupe
+TRAIT_THRESHOLD = 0.5
+
+SEASON_QUERY = """
+SELECT m.id, m.season, COALESCE(l.name, '') AS championship
+FROM Match m
+LEFT JOIN League l ON m.league_id = l.id
+ORDER BY m.id
+"""
+
+TEAM_NAMES_QUERY = "SELECT team_api_id, team_long_name FROM Team"
+
+
+def default_cache_path(db_path: str) -> str:
+    """Cache placé à côté de la base"""
+    return db_path + '.styles.npz'
+
+
+def source_signature(data_access: SQLiteDataAccess, k: int, seed: int) -> str:
+    """Signature du contenu de Team_Attributes et de la liste des matchs (indépendante de la date du fichier)"""
+    digest = hashlib.sha256()
+    for row in data_access.iter_query(f"SELECT id, team_api_id, date, {', '.join(NUMERIC_ATTRIBUTES)} "
+                                      "FROM Team_Attributes ORDER BY id"):
+        digest.update(repr(tuple(row)).encode('utf-8'))
+    matches = data_access.query_one("SELECT COUNT(*) AS n, MAX(id) AS last_id FROM Match")
+    return fingerprint(digest.hexdigest(), matches['n'], matches['last_id'], k, seed, tuple(NUMERIC_ATTRIBUTES))
+
+
+def squared_distances(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Distances euclidiennes au carré (points × centres) par produit matriciel"""
+    distances = (points ** 2).sum(axis=1)[:, None] - 2 * points @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+    return np.maximum(distances, 0.0)
+
+
+def kmeans_plus_plus(points: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """Centres initiaux k-means++ (tirage proportionnel à la distance au plus proche centre)"""
+    centroids = [points[rng.integers(len(points))]]
+    closest = squared_distances(points, centroids[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(points), p=closest / total) if total > 0 else rng.integers(len(points))
+        centroids.append(points[index])
+        closest = np.minimum(closest, squared_distances(points, points[index][None, :])[:, 0])
+    return np.array(centroids)
+
+
+def cluster_sums(points: np.ndarray, labels: np.ndarray, k: int):
+    """(sommes des points par groupe, effectifs) par bincount, colonne par colonne"""
+    counts = np.bincount(labels, minlength=k)
+    sums = np.stack([np.bincount(labels, weights=points[:, j], minlength=k) for j in range(points.shape[1])],
+                    axis=1)
+    return sums, counts
+
+
+def kmeans(points: np.ndarray, k: int, seed: int = DEFAULT_SEED, max_iterations: int = MAX_ITERATIONS):
+    """
+    k-means vectorisé (Lloyd, ou mini-lots pour les grands jeux de données)
+
+    Returns:
+        (centres, groupe de chaque point, inertie, nombre d'itérations)
+    """
+    k = min(k, len(points))
+    rng = np.random.default_rng(seed)
+    centroids = kmeans_plus_plus(points, k, rng)
+    if len(points) > MINI_BATCH_ROWS:
+        return minibatch_kmeans(points, centroids, rng, max_iterations)
+
+    labels = np.full(len(points), -1)
+    for iteration in range(1, max_iterations + 1):
+        distances = squared_distances(points, centroids)
+        new_labels = distances.argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sums, counts = cluster_sums(points, labels, k)
+        empty = counts == 0
+        centroids = np.where(empty[:, None], centroids, sums / np.maximum(counts, 1)[:, None])
+        if empty.any():
+            # Groupe vide : recentré sur les points les plus éloignés de leur centre
+            farthest = np.argsort(-distances[np.arange(len(points)), labels])[:empty.sum()]
+            centroids[empty] = points[farthest]
+    inertia = float(squared_distances(points, centroids)[np.arange(len(points)), labels].sum())
+    return centroids, labels, inertia, iteration
+
+
+def minibatch_kmeans(points: np.ndarray, centroids: np.ndarray, rng: np.random.Generator, max_iterations: int):
+    """k-means par mini-lots : chaque centre avance vers la moyenne du lot avec un pas 1 / (points vus)"""
+    k = len(centroids)
+    seen = np.zeros(k)
+    for _ in range(max_iterations):
+        batch = points[rng.integers(len(points), size=BATCH_SIZE)]
+        sums, counts = cluster_sums(batch, squared_distances(batch, centroids).argmin(axis=1), k)
+        seen += counts
+        moved = counts > 0
+        rate = counts[moved] / seen[moved]
+        centroids[moved] += rate[:, None] * (sums[moved] / counts[moved][:, None] - centroids[moved])
+    labels = squared_distances(points, centroids).argmin(axis=1)
+    inertia = float(squared_distances(points, centroids)[np.arange(len(points)), labels].sum())
+    return centroids, labels, inertia, max_iterations
+
+
+def team_season_features(data_access: SQLiteDataAccess, attributes: TeamAttributes):
+    """
+    Attributs moyens de chaque couple (équipe, saison) sur ses matchs
+
+    Returns:
+        (team_ids, saisons, championnats, matrice brute avec NaN si attribut jamais renseigné)
+    """
+    rows = [tuple(row) for row in data_access.iter_query(SEASON_QUERY)]
+    seasons = np.array([row[1] for row in rows])
+    championships = np.array([row[2] for row in rows])
+    # Même ordre (id croissant) que le cache de la jointure as-of
+    if not np.array_equal(np.array([row[0] for row in rows], dtype=np.int64), attributes.match_ids):
+        raise ValueError("Le cache de la jointure as-of ne correspond pas à la table Match")
+
+    season_labels, season_codes = np.unique(seasons, return_inverse=True)
+    teams = np.concatenate([attributes.home_ids, attributes.away_ids])
+    codes = np.concatenate([season_codes, season_codes])
+    snapshots = np.concatenate([attributes.home_snapshot, attributes.away_snapshot])
+    side_championships = np.concatenate([championships, championships])
+    keep = snapshots >= 0
+    teams, codes, snapshots, side_championships = teams[keep], codes[keep], snapshots[keep], side_championships[keep]
+
+    keys = codes * (int(teams.max()) + 1 if len(teams) else 1) + teams
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    values = attributes.values[snapshots]
+    known = ~np.isnan(values)
+    n_keys = len(first)
+    sums = np.stack([np.bincount(inverse, weights=np.where(known[:, j], values[:, j], 0.0), minlength=n_keys)
+                     for j in range(values.shape[1])], axis=1)
+    counts = np.stack([np.bincount(inverse, weights=known[:, j], minlength=n_keys)
+                       for j in range(values.shape[1])], axis=1)
+    with np.errstate(invalid='ignore'):
+        features = sums / counts
+    return teams[first], season_labels[codes[first]], side_championships[first], features
+
+
+def standardize(features: np.ndarray):
+    """(matrice centrée-réduite, moyennes, écarts-types) ; une valeur manquante vaut la moyenne (0)"""
+    mean = np.nan_to_num(np.nanmean(features, axis=0)) if len(features) else np.zeros(features.shape[1])
+    std = np.nan_to_num(np.nanstd(features, axis=0)) if len(features) else np.ones(features.shape[1])
+    std = np.where(std > 0, std, 1.0)
+    return np.nan_to_num((features - mean) / std), mean, std
+
+
+def cluster_traits(centroid: np.ndarray) -> str:
+    """Description d'un groupe : attributs les plus éloignés de la moyenne (écart en écarts-types)"""
+    labels = list(NUMERIC_ATTRIBUTES.values())
+    order = np.argsort(-np.abs(centroid), kind='stable')
+    traits = [f"{labels[j]} {centroid[j]:+.1f}" for j in order[:3] if abs(centroid[j]) >= TRAIT_THRESHOLD]
+    return ', '.join(traits) or 'Profil moyen'
+
+
+def build_cache(data_access: SQLiteDataAccess, cache_path: str, k: int = DEFAULT_K,
+                seed: int = DEFAULT_SEED, signature: Optional[str] = None) -> int:
+    """Regroupe tous les couples (équipe, saison) et enregistre le résultat ; retourne leur nombre"""
+    attributes = TeamAttributes.open(data_access)
+    team_ids, seasons, championships, features = team_season_features(data_access, attributes)
+    points, mean, std = standardize(features)
+    if len(points):
+        centroids, labels, inertia, iterations = kmeans(points, k, seed)
+    else:
+        centroids, labels, inertia, iterations = np.zeros((0, points.shape[1])), np.zeros(0, np.int64), 0.0, 0
+    names = dict(tuple(row) for row in data_access.iter_query(TEAM_NAMES_QUERY))
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path,
+             signature=np.array(signature or source_signature(data_access, k, seed)),
+             team_ids=team_ids,
+             team_names=np.array([names.get(team_api_id, str(team_api_id)) for team_api_id in team_ids.tolist()]),
+             seasons=seasons,
+             championships=championships,
+             features=features,
+             points=points,
+             mean=mean,
+             std=std,
+             centroids=centroids,
+             labels=labels,
+             inertia=np.array(inertia),
+             iterations=np.array(iterations))
+    os.replace(tmp_path, cache_path)
+    return len(team_ids)
+
+
+def cached_signature(cache_path: str) -> Optional[str]:
+    try:
+        with np.load(cache_path) as data:
+            return str(data['signature'])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class TeamStyles:
+    """Groupes de styles et recherche des couples (équipe, saison) au style le plus proche"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        with np.load(cache_path) as data:
+            for name in ('team_ids', 'team_names', 'seasons', 'championships', 'features', 'points',
+                         'centroids', 'labels'):
+                setattr(self, name, data[name])
+            self.inertia = float(data['inertia'])
+            self.iterations = int(data['iterations'])
+        self.sizes = np.bincount(self.labels, minlength=len(self.centroids))
+        self.traits = [cluster_traits(centroid) for centroid in self.centroids]
+        self.rows = {(int(team_api_id), str(season)): i
+                     for i, (team_api_id, season) in enumerate(zip(self.team_ids.tolist(), self.seasons.tolist()))}
+
+    @classmethod
+    def open(cls, data_access: SQLiteDataAccess, cache_path: Optional[str] = None, k: int = DEFAULT_K,
+             seed: int = DEFAULT_SEED) -> 'TeamStyles':
+        """Ouvre le cache, après avoir relancé le regroupement si Team_Attributes ou les matchs ont changé"""
+        cache_path = cache_path or default_cache_path(data_access.db_path)
+        signature = source_signature(data_access, k, seed)
+        if cached_signature(cache_path) != signature:
+            build_cache(data_access, cache_path, k, seed, signature)
+        return cls(cache_path)
+
+    def __len__(self):
+        return len(self.team_ids)
+
+    def style(self, team_api_id: int, season: str) -> Optional[Dict]:
+        """Groupe d'un couple (équipe, saison) ; None s'il n'a aucun relevé"""
+        row = self.rows.get((team_api_id, season))
+        if row is None:
+            return None
+        cluster = int(self.labels[row])
+        return {'cluster': cluster + 1, 'traits': self.traits[cluster], 'size': int(self.sizes[cluster])}
+
+    def similar(self, team_api_id: int, season: str, n: int = 5) -> List[Dict]:
+        """Couples (autre équipe, saison) au style le plus proche, toutes saisons et tous championnats"""
+        row = self.rows.get((team_api_id, season))
+        if row is None:
+            return []
+        distances = np.sqrt(squared_distances(self.points, self.points[row][None, :])[:, 0])
+        distances[self.team_ids == team_api_id] = np.inf
+        n = min(n, int(np.isfinite(distances).sum()))
+        if n <= 0:
+            return []
+        nearest = np.argpartition(distances, n - 1)[:n]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        return [{'team_api_id': int(self.team_ids[i]), 'team': str(self.team_names[i]),
+                 'season': str(self.seasons[i]), 'championship': str(self.championships[i]),
+                 'cluster': int(self.labels[i]) + 1, 'distance': float(distances[i])}
+                for i in nearest.tolist()]
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Groupes de styles de jeu (k-means sur Team_Attributes)")
+    parser.add_argument("--db", default="database.sqlite", help="Chemin vers database.sqlite")
+    parser.add_argument("--cache", default=None, help="Fichier cache (par défaut : <db>.styles.npz)")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Nombre de groupes")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Graine de l'initialisation k-means++")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Erreur : Le fichier {args.db} n'existe pas.")
+        print("Veuillez placer database.sqlite dans le même dossier que ce script.")
+        return
+
+    data_access = SQLiteDataAccess(args.db, read_only=True)
+    cache_path = args.cache or default_cache_path(args.db)
+
+    print("=" * 60)
+    print("GROUPES DE STYLES DE JEU")
+    print("=" * 60)
+    start = time.perf_counter()
+    count = build_cache(data_access, cache_path, args.k, args.seed)
+    print(f"\n✓ {count} couples (équipe, saison) regroupés en {time.perf_counter() - start:.2f} s ({cache_path})")
+    start = time.perf_counter()
+    styles = TeamStyles.open(data_access, cache_path, args.k, args.seed)
+    print(f"✓ Réouverture (signature inchangée, pas de recalcul) : {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(f"✓ Inertie {styles.inertia:.1f} après {styles.iterations} itérations\n")
+    for cluster, (size, traits) in enumerate(zip(styles.sizes.tolist(), styles.traits), 1):
+        print(f"  Groupe {cluster} ({size:>4} couples) : {traits}")
+    data_access.close()
+
+
+if __name__ == "__main__":
+    main()
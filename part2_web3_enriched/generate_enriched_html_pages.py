@@ -6,6 +6,8 @@ Supporte RDFa et JSON-LD
 """
 
 import os
+import shutil
+import zipfile
 from bs4 import BeautifulSoup
 import json
 from typing import Dict, List
@@ -18,22 +20,49 @@ class HTMLEnricher:
         Initialise l'enrichisseur
         
         Args:
-            input_dir: Dossier contenant les pages HTML statiques
-            output_dir: Dossier de sortie pour les pages enrichies
+            input_dir: Dossier contenant les pages HTML statiques (ou archive .zip du site)
+            output_dir: Dossier de sortie pour les pages enrichies (ou archive .zip)
             format: Format d'enrichissement ('rdfa' ou 'jsonld')
         """
         self.input_dir = input_dir
         self.output_dir = output_dir
         self.format = format.lower()
+        self.input_bundle = None
+        self.output_bundle = None
         
         if self.format not in ['rdfa', 'jsonld']:
             raise ValueError("Format doit être 'rdfa' ou 'jsonld'")
     
     def create_output_directory(self):
-        """Crée le dossier de sortie"""
+        """Crée le dossier de sortie (ou l'archive de sortie)"""
+        if self.output_dir.endswith('.zip'):
+            self.output_bundle = zipfile.ZipFile(self.output_dir, 'w', compression=zipfile.ZIP_DEFLATED)
+            print(f"✓ Archive de sortie créée : {self.output_dir}")
+            return
         os.makedirs(self.output_dir, exist_ok=True)
         print(f"✓ Dossier de sortie créé : {self.output_dir}")
     
+    def list_input_files(self, extension: str) -> List[str]:
+        """Fichiers d'entrée ayant l'extension donnée (dossier ou archive)"""
+        if self.input_bundle:
+            return [name for name in self.input_bundle.namelist() if name.endswith(extension)]
+        return [f for f in os.listdir(self.input_dir) if f.endswith(extension)]
+    
+    def read_page(self, input_path: str) -> str:
+        """Lit une page d'entrée ; dans une archive, la page est lue directement par son nom"""
+        if self.input_bundle:
+            return self.input_bundle.read(os.path.relpath(input_path, self.input_dir)).decode('utf-8')
+        with open(input_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def write_page(self, output_path: str, html: str):
+        """Écrit une page enrichie dans le dossier ou l'archive de sortie"""
+        if self.output_bundle:
+            self.output_bundle.writestr(os.path.relpath(output_path, self.output_dir), html.encode('utf-8'))
+            return
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+    
     def update_links(self, soup):
         """
         Met à jour tous les liens href pour pointer vers les pages enrichies
@@ -77,9 +106,11 @@ class HTMLEnricher:
         print(f"Format : {self.format.upper()}")
         print("="*60 + "\n")
         
+        if self.input_dir.endswith('.zip'):
+            self.input_bundle = zipfile.ZipFile(self.input_dir, 'r')
         self.create_output_directory()
         
-        html_files = [f for f in os.listdir(self.input_dir) if f.endswith('.html')]
+        html_files = self.list_input_files('.html')
         
         for filename in html_files:
             input_path = os.path.join(self.input_dir, filename)
@@ -99,17 +130,29 @@ class HTMLEnricher:
                 self.enrich_index_page(input_path, output_path)
             else:
                 # Copier avec mise à jour des liens
-                with open(input_path, 'r', encoding='utf-8') as f:
-                    soup = BeautifulSoup(f, 'html.parser')
+                soup = BeautifulSoup(self.read_page(input_path), 'html.parser')
                 
                 # Mettre à jour les liens même sans enrichissement
                 self.update_links(soup)
                 
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(str(soup))
+                self.write_page(output_path, str(soup))
             
             print(f"  ✓ Créé : {os.path.basename(output_path)}")
         
+        # Feuilles de style partagées référencées par les pages (style.<hash>.css)
+        for filename in self.list_input_files('.css'):
+            if self.input_bundle or self.output_bundle:
+                self.write_page(os.path.join(self.output_dir, filename),
+                                self.read_page(os.path.join(self.input_dir, filename)))
+            else:
+                shutil.copyfile(os.path.join(self.input_dir, filename), os.path.join(self.output_dir, filename))
+            print(f"  ✓ Copié : {filename}")
+        
+        for bundle in (self.input_bundle, self.output_bundle):
+            if bundle:
+                bundle.close()
+        self.input_bundle = self.output_bundle = None
+        
         print(f"\n{'='*60}")
         print("✓ ENRICHISSEMENT TERMINÉ")
         print(f"{'='*60}")
@@ -117,8 +160,7 @@ class HTMLEnricher:
     
     def enrich_classement_page(self, input_path: str, output_path: str):
         """Enrichit la page de classement avec métadonnées sur les équipes"""
-        with open(input_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'html.parser')
+        soup = BeautifulSoup(self.read_page(input_path), 'html.parser')
         
         # Ajouter le vocabulaire Schema.org dans le <head> si RDFa
         if self.format == 'rdfa':
@@ -179,13 +221,11 @@ class HTMLEnricher:
         self.update_links(soup)
         
         # Sauvegarder
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        self.write_page(output_path, str(soup))
     
     def enrich_calendrier_page(self, input_path: str, output_path: str):
         """Enrichit la page calendrier avec métadonnées sur les matchs"""
-        with open(input_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'html.parser')
+        soup = BeautifulSoup(self.read_page(input_path), 'html.parser')
         
         if self.format == 'rdfa':
             html_tag = soup.find('html')
@@ -227,13 +267,11 @@ class HTMLEnricher:
         # Mettre à jour les liens pour pointer vers les pages enrichies
         self.update_links(soup)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        self.write_page(output_path, str(soup))
     
     def enrich_statistiques_page(self, input_path: str, output_path: str):
         """Enrichit la page statistiques"""
-        with open(input_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'html.parser')
+        soup = BeautifulSoup(self.read_page(input_path), 'html.parser')
         
         if self.format == 'rdfa':
             html_tag = soup.find('html')
@@ -267,13 +305,11 @@ class HTMLEnricher:
         # Mettre à jour les liens pour pointer vers les pages enrichies
         self.update_links(soup)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        self.write_page(output_path, str(soup))
     
     def enrich_equipe_page(self, input_path: str, output_path: str):
         """Enrichit les pages d'équipes"""
-        with open(input_path, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'html.parser')
+        soup = BeautifulSoup(self.read_page(input_path), 'html.parser')
         
         if self.format == 'rdfa':
             html_tag = soup.find('html')
@@ -324,8 +360,7 @@ class HTMLEnricher:
         # Mettre à jour les liens pour pointer vers les pages enrichies
         self.update_links(soup)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        self.write_page(output_path, str(soup))
     
     def enrich_index_page(self, input_path: str, output_path: str):
         """Enrichit la page d'index"""
@@ -469,6 +504,8 @@ def main():
     print("="*60)
     
     # Vérifier que le dossier d'entrée existe
+    # INPUT_DIR peut aussi être une archive (ex : "web_1.0_output.zip") ; les sorties
+    # peuvent de même être des archives (ex : "web_3.0_rdfa_output.zip")
     if not os.path.exists(INPUT_DIR):
         print(f"\n Erreur : Le dossier {INPUT_DIR} n'existe pas.")
         print("Veuillez d'abord générer les pages HTML avec generate_html_pages.py")
@@ -1,9 +1,23 @@
 import os
+import zipfile
 from bs4 import BeautifulSoup
 
 # Dossier contenant les fichiers enrichis
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ENRICHED_DIR = os.path.join(BASE_DIR, "site_html_enriched")
+# Variante : tout le site enrichi dans une seule archive (utilisée si elle existe)
+ENRICHED_BUNDLE = ENRICHED_DIR + ".zip"
+
+
+# ---------------------------------------------------------
+# Charger une page enrichie par son nom (accès direct dans l'archive)
+# ---------------------------------------------------------
+def load_page(name):
+    if os.path.exists(ENRICHED_BUNDLE):
+        with zipfile.ZipFile(ENRICHED_BUNDLE) as bundle:
+            return BeautifulSoup(bundle.read(name).decode("utf-8"), "html.parser")
+    with open(os.path.join(ENRICHED_DIR, name), "r", encoding="utf-8") as f:
+        return BeautifulSoup(f.read(), "html.parser")
 
 
 # ---------------------------------------------------------
@@ -11,6 +25,13 @@ ENRICHED_DIR = os.path.join(BASE_DIR, "site_html_enriched")
 # ---------------------------------------------------------
 def load_all_pages():
     soups = []
+    if os.path.exists(ENRICHED_BUNDLE):
+        with zipfile.ZipFile(ENRICHED_BUNDLE) as bundle:
+            for name in bundle.namelist():
+                if name.endswith(".html"):
+                    soups.append(BeautifulSoup(bundle.read(name).decode("utf-8"), "html.parser"))
+        return soups
+
     for root, _, files in os.walk(ENRICHED_DIR):
         for name in files:
             if name.endswith(".html"):